@@ -0,0 +1,431 @@
+"""
+Benchmarks:
+
+Timing and memory comparisons between alternative implementations of the same
+data structures/algorithms. Run as a script:
+
+python3 benchmark.py [wordListFile ...]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from helpers import fileToWordList
+from trie import listToTrie, wordInTrie
+from compactTrie import CompactTrie, listToCompactTrie
+from dawg import listToDawg, dawgStats
+from patternIndex import PatternIndex, blank
+from matrixIndex import MatrixIndex, matrixInfoWrapper, AVAILABLE
+from preprocessWordList import createInfoWrapper, beamOrder
+from grid import gridToWordClassList
+from propagation import Domains
+from crosswordSolver import solveGen, restartSolve, countSolutions, SolveStats
+from parallelSolver import parallelSolveGen
+from bestFill import bestFills
+from workStealing import stealingSolveGen
+
+#---------------------------------------------------------------------------#
+
+# Default word lists to benchmark against
+dictNames = ["wordLists/dict1k.txt", "wordLists/dict5k.txt"]
+
+# Grids to benchmark solvers against
+sampleGrids = {
+	"4x4 open": ["    ", "    ", "    ", "    "],
+	"5x5 corners": ["#   #", "     ", "     ", "     ", "#   #"],
+	"5x5 open": ["     ", "     ", "     ", "     ", "     "],
+	"7x7": ["   #   ", "   #   ", "       ", "## # ##", "       ", "   #   ", "   #   "],
+}
+
+# 15x15 grid with 78 words, to order (too large to solve with the sample dictionaries)
+largeGrid = ["    #     #    ", "    #     #    ", "    #     #    ", "   #    #      ", "###   #   #    ",
+			 "      #    #   ", "    #    #     ", "   #       #   ", "     #    #    ", "   #    #      ",
+			 "    #   #   ###", "      #    #   ", "    #     #    ", "    #     #    ", "    #     #    "]
+
+#---------------------------------------------------------------------------#
+
+# Seconds taken by the best of repeat calls of f(*args)
+# (any -> any) * any list * int -> float
+def bestTime(f, args, repeat=3):
+	best = None
+	for x in range(repeat):
+		start = time.perf_counter()
+		f(*args)
+		elapsed = time.perf_counter()-start
+		if best is None or elapsed < best:
+			best = elapsed
+	return best
+
+# Bytes allocated by f(*args) which are still alive once f returns (the size of its result)
+# (any -> any) * any list -> int
+def allocatedBytes(f, args):
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	result = f(*args)
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del result
+	return after-before
+
+# Look up every word in the trie
+# str list * trie -> None
+def lookupAll(wordList, root):
+	for word in wordList:
+		wordInTrie(word, root)
+
+#---------------------------------------------------------------------------#
+
+# Node trie vs compact trie: build time, memory, lookup time
+# str -> (str : (float, int, float)) dict
+def compareTries(dictName):
+	wordList = fileToWordList(dictName)
+	results = {}
+	for name, builder in [("Node trie", listToTrie), ("Compact trie", listToCompactTrie)]:
+		root = builder(wordList)
+		results[name] = (bestTime(builder, [wordList]),
+						 allocatedBytes(builder, [wordList]),
+						 bestTime(lookupAll, [wordList, root]))
+	return results
+
+# Node trie vs minimized DAWG: node count and memory
+# str -> (str : (int, int)) dict
+def compareDawg(dictName):
+	wordList = fileToWordList(dictName)
+	before, after = dawgStats(wordList, listToDawg(wordList))
+	return {"Node trie": (before, allocatedBytes(listToTrie, [wordList])),
+			"DAWG": (after, allocatedBytes(listToDawg, [wordList]))}
+
+# Patterns made from the words of a list by blanking out letters at random
+# str list * int * float -> str list
+def randomPatterns(wordList, number, blankRate=0.6, seed=0):
+	rand = random.Random(seed)
+	patterns = []
+	for word in rand.sample(wordList, min(number, len(wordList))):
+		patterns.append("".join("-" if rand.random() < blankRate else c for c in word))
+	return patterns
+
+# Counting the matches of wildcard patterns: trie walk vs positional bitset index
+# str -> (str : float) dict
+def comparePatternQueries(dictName):
+	wordList = fileToWordList(dictName)
+	patterns = randomPatterns(wordList, 500)
+	tries = {}
+	for word in wordList:
+		tries.setdefault(len(word), CompactTrie()).insert(word)
+	index = PatternIndex(wordList)
+	for pattern in patterns:
+		index.count(pattern) 	# Build the tables up front
+	walk = lambda: [tries[len(p)].countMatches(p) for p in patterns]
+	bitsets = lambda: [index.count(p) for p in patterns]
+	return {"Trie walk": bestTime(walk, []), "Bitset index": bestTime(bitsets, [])}
+
+# Words of a Node trie matching pattern from position pos on, walked the way
+# devVersions/crosswordSolverV2.match walks it (a given letter follows its child, a blank
+# every child)
+# Node * str * int -> str list
+def trieCandidates(node, pattern, pos=0):
+	if pos == len(pattern):
+		return [node.whichWord()]
+	if not blank(pattern[pos]):
+		child = node[pattern[pos]]
+		return trieCandidates(child, pattern, pos+1) if child else []
+	return [word for child in node if child for word in trieCandidates(child, pattern, pos+1)]
+
+# Listing the candidates of wildcard patterns: Node trie walk (crosswordSolverV2.match) vs
+# bitset index vs numpy matrix index (None without numpy)
+# str -> (str : float option) dict
+def compareCandidateEngines(dictName):
+	wordList = fileToWordList(dictName)
+	patterns = randomPatterns(wordList, 500)
+	tries = {length : listToTrie([word for word in wordList if len(word) == length]) for length in {len(p) for p in patterns}}
+	walk = lambda: [trieCandidates(tries[len(p)], p) for p in patterns]
+	results = {"Trie walk (V2)": bestTime(walk, [])}
+	for name, index in [("Bitset index", PatternIndex(wordList)), ("Matrix index", MatrixIndex(wordList) if AVAILABLE else None)]:
+		if index is None:
+			results[name] = None
+			continue
+		for pattern in patterns:
+			index.candidates(pattern) 	# Build the tables up front
+		results[name] = bestTime(lambda: [index.candidates(p) for p in patterns], [])
+	return results
+
+# First solution of each sample grid through the bitset and the matrix index, without
+# propagation (every node queries the index) and with the default (AC-3: the index's
+# masks and crossing tables). Each index is new to the grid. Repeats are allowed (the
+# sample grids have few fills without). Empty without numpy.
+# str -> (str * str * int * float * float) list
+def compareEngines(dictName):
+	if not AVAILABLE:
+		return []
+	results = []
+	for name, rows in sampleGrids.items():
+		for consistency in [None, "ac3"]:
+			options = {"consistency" : consistency, "distinct" : False, "maxSeconds" : 20}
+			bitsets, stats = timedSolve(toGrid(rows), createInfoWrapper(dictName), 1, options)
+			matrix, stats = timedSolve(toGrid(rows), matrixInfoWrapper(createInfoWrapper(dictName)), 1, options)
+			results.append((name, str(consistency), stats.nodes, bitsets, matrix))
+	return results
+
+# Revising the candidates of pattern pairs against each other on a shared square (as
+# propagation does): list filtering (letters of one list, then the other list filtered by
+# them) vs bitset domains (ANDs with the index's (position, letter) masks)
+# str -> (str : float) dict
+def compareDomainPruning(dictName, pairs=500, seed=0):
+	wordList = fileToWordList(dictName)
+	index = PatternIndex(wordList)
+	rand = random.Random(seed)
+	patterns = randomPatterns(wordList, 2*pairs, blankRate=0.8, seed=seed)
+	arcs = []
+	for pattern, other in zip(patterns[::2], patterns[1::2]):
+		arcs.append((len(pattern), rand.randrange(len(pattern)), len(other), rand.randrange(len(other)),
+					 index.candidates(pattern), index.candidates(other), index.candidateIds(pattern), index.candidateIds(other)))
+	def lists():
+		for length, x, otherLength, y, domain, others, bits, otherBits in arcs:
+			letters = {candidate[y] for candidate in others}
+			[candidate for candidate in domain if candidate[x] in letters]
+	def bitsets():
+		for length, x, otherLength, y, domain, others, bits, otherBits in arcs:
+			masks, otherMasks = index.masks(length)[x], index.masks(otherLength)[y]
+			support = 0
+			for letter in range(26):
+				if otherBits & otherMasks[letter]:
+					support |= masks[letter]
+			bits & support
+	return {"Lists": bestTime(lists, []), "Bitsets": bestTime(bitsets, [])}
+
+# Setting up a grid's domains and making them arc consistent: the first time the index
+# sees the grid's crossings (crossing tables built) vs every later time (tables reused)
+# str -> (str * float * float) list
+def compareCrossingTables(dictName):
+	wordList = fileToWordList(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		index = PatternIndex(wordList)
+		words = gridToWordClassList(toGrid(rows))
+		for length in {word.length() for word in words}:
+			index.masks(length) 	# Build the pattern tables up front
+		establish = lambda: Domains(words, index).establish()
+		start = time.perf_counter()
+		establish()
+		results.append((name, time.perf_counter()-start, bestTime(establish, [])))
+	return results
+
+# Char list list version of a sampleGrids entry
+# str list -> char list list
+def toGrid(rows):
+	return [list(row) for row in rows]
+
+# Run a solve to completion (or limit). Returns (seconds, stats).
+# char list list * infoWrapper * int option * (str : any) dict -> float * SolveStats
+def timedSolve(grid, iW, limit=1, options={}):
+	stats = SolveStats()
+	start = time.perf_counter()
+	for solution in solveGen(gridToWordClassList(grid), iW, limit=limit, stats=stats, **options):
+		pass
+	return (time.perf_counter()-start, stats)
+
+# Solve every sample grid under each variant of solveGen options: nodes explored and time
+# str * (str : (str : any) dict) dict * int option -> (str * str * int * float) list
+def compareOptions(dictName, variants, limit=1):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		for variant, options in variants.items():
+			seconds, stats = timedSolve(toGrid(rows), iW, limit, options)
+			results.append((name, variant, stats.nodes, seconds))
+	return results
+
+# First solution with static (list order, as in devVersions) vs dynamic (fewest candidates
+# first) word ordering
+def compareOrdering(dictName):
+	return compareOptions(dictName, {"static" : {"order" : "static", "consistency" : None},
+									 "dynamic" : {"order" : "dynamic", "consistency" : None}})
+
+# First solution with the words in list order vs a greedy order vs a beam search order (see
+# preprocessWordList.beamOrder) vs dynamic ordering, without propagation. Orders past
+# maxSeconds are cut off (nodes and time then are lower bounds).
+def compareSlotOrders(dictName, maxSeconds=20):
+	return compareOptions(dictName, {order : {"order" : order, "consistency" : None, "maxSeconds" : maxSeconds}
+									 for order in ["static", "greedy", "beam", "dynamic"]})
+
+# Time to order a 78 word 15x15 grid by beam search, per beam width
+# str -> (int * float) list
+def compareBeamWidths(dictName, widths=[1, 4, 8, 16]):
+	iW = createInfoWrapper(dictName)
+	wordList = gridToWordClassList(toGrid(largeGrid))
+	return [(width, bestTime(beamOrder, [wordList, iW._avDict, width])) for width in widths]
+
+# All solutions without propagation, with forward checking, with arc consistency
+def compareConsistency(dictName):
+	return compareOptions(dictName, {"none" : {"consistency" : None},
+									 "forward" : {"consistency" : "forward"},
+									 "ac3" : {"consistency" : "ac3"}}, limit=None)
+
+# Undo state of a plain search (all solutions, no propagation, repeats allowed): nodes
+# (each of which used to allocate its own list of changes), letters written onto the
+# search's single trail, the most letters on it at once, and time
+# str -> (str * int * int * int * float) list
+def compareTrail(dictName):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		seconds, stats = timedSolve(toGrid(rows), iW, None, {"consistency" : None, "distinct" : False, "nogoods" : 0})
+		results.append((name, stats.nodes, stats.cellWrites, stats.trailPeak, seconds))
+	return results
+
+# All solutions with chronological backtracking vs conflict-directed backjumping:
+# nodes, backjumps, levels skipped, time
+# str -> (str * str * int * int * int * float) list
+def compareBackjumping(dictName):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		for backjump in [False, True]:
+			seconds, stats = timedSolve(toGrid(rows), iW, None, {"consistency" : "forward", "backjump" : backjump})
+			results.append((name, "backjump" if backjump else "backtrack", stats.nodes, stats.backjumps, stats.skipped, seconds))
+	return results
+
+# All solutions without and with a nogood cache (forward checking): nodes, cache hits,
+# cache misses, time
+# str -> (str * str * int * int * int * float) list
+def compareNogoods(dictName):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		for nogoods in [0, 1 << 14]:
+			seconds, stats = timedSolve(toGrid(rows), iW, None, {"consistency" : "forward", "nogoods" : nogoods})
+			results.append((name, nogoods, stats.nodes, stats.nogoodHits, stats.nogoodMisses, seconds))
+	return results
+
+# All fills without repeated words: enumerating every fill and filtering those with
+# repeats out vs enforcing distinct words in the search. Solutions, nodes and time of each.
+# str -> (str * int * int * float * int * float) list
+def compareDistinct(dictName):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		stats = SolveStats()
+		start = time.perf_counter()
+		kept = sum(1 for solution in solveGen(gridToWordClassList(toGrid(rows)), iW, stats=stats, distinct=False)
+				   if len(set(solution)) == len(solution))
+		filtering = time.perf_counter()-start
+		seconds, distinct = timedSolve(toGrid(rows), iW, None)
+		results.append((name, kept, stats.nodes, filtering, distinct.nodes, seconds))
+	return results
+
+# Best scoring fill of every sample grid, with words scored by their position in the word
+# list (most frequent first) and repeats allowed: enumerating and ranking every fill vs
+# branch and bound. Nodes and time of each (enumeration is skipped past maxEnumerate fills).
+# str * int -> (str * float * int * float * int * float) list
+def compareBestFill(dictName, maxEnumerate=10**5):
+	iW = createInfoWrapper(dictName)
+	words = [line.split()[0] for line in open(dictName) if line.split()]
+	scores = {word : len(words)-i for i, word in enumerate(words)}
+	results = []
+	for name, rows in sampleGrids.items():
+		stats = SolveStats()
+		start = time.perf_counter()
+		for fill in solveGen(gridToWordClassList(toGrid(rows)), iW, limit=maxEnumerate, stats=stats, distinct=False):
+			sum(scores.get(word, 0) for word in fill)
+		ranking = time.perf_counter()-start if stats.solutions < maxEnumerate else "-"
+		bounded = SolveStats()
+		start = time.perf_counter()
+		best = bestFills(gridToWordClassList(toGrid(rows)), iW, 1, scores, stats=bounded, distinct=False)
+		results.append((name, best[0][0] if best else "-", stats.nodes, ranking, bounded.nodes, time.perf_counter()-start))
+	return results
+
+# Number of solutions of every sample grid: enumerating them vs counting (memoized,
+# decomposed) search. Enumeration is skipped past maxEnumerate solutions.
+# str * int -> (str * int * float * float option) list
+def compareCounting(dictName, maxEnumerate=10**5):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		start = time.perf_counter()
+		total = countSolutions(gridToWordClassList(toGrid(rows)), iW)
+		counting = time.perf_counter()-start
+		enumerating = "-"
+		if total <= maxEnumerate:
+			enumerating = timedSolve(toGrid(rows), iW, None)[0]
+		results.append((name, total, counting, enumerating))
+	return results
+
+# All solutions of every sample grid in one process vs a pool of processes split up front
+# vs work stealing workers (one process per core)
+# str -> (str * int * float * float * float) list
+def compareParallel(dictName, depth=2):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		sequential, stats = timedSolve(toGrid(rows), iW, None)
+		times = []
+		for parallel in [lambda: parallelSolveGen(toGrid(rows), dictName, depth=depth),
+						 lambda: stealingSolveGen(toGrid(rows), dictName)]:
+			start = time.perf_counter()
+			for solution in parallel():
+				pass
+			times.append(time.perf_counter()-start)
+		results.append((name, stats.solutions, sequential, *times))
+	return results
+
+# Nodes to the first solution: alphabetical order vs random orders (seeds) vs randomized
+# restarts (median, worst), without propagation
+# str * int -> (str * int * int * int * int * int) list
+def compareRestarts(dictName, seeds=20):
+	iW = createInfoWrapper(dictName)
+	results = []
+	for name, rows in sampleGrids.items():
+		fixed = timedSolve(toGrid(rows), iW, 1, {"consistency" : None})[1].nodes
+		shuffled, restarted = [], []
+		for seed in range(seeds):
+			shuffled.append(timedSolve(toGrid(rows), iW, 1, {"consistency" : None, "seed" : seed})[1].nodes)
+			stats = SolveStats()
+			restartSolve(gridToWordClassList(toGrid(rows)), iW, seed, stats=stats, consistency=None)
+			restarted.append(stats.nodes)
+		shuffled.sort()
+		restarted.sort()
+		results.append((name, fixed, shuffled[seeds//2], shuffled[-1], restarted[seeds//2], restarted[-1]))
+	return results
+
+def printTable(title, header, rows):
+	print(title)
+	print("".join(f"{h:>16}" for h in header))
+	for row in rows:
+		print("".join(f"{c:>16.4f}" if isinstance(c, float) else f"{c:>16}" for c in row))
+	print()
+
+#---------------------------------------------------------------------------#
+
+def main(names):
+	for dictName in names:
+		results = compareTries(dictName)
+		rows = [(name, build, size, lookup) for name, (build, size, lookup) in results.items()]
+		printTable(f"Tries: {dictName}", ["", "build (s)", "memory (B)", "lookup (s)"], rows)
+		rows = [(name, nodes, size) for name, (nodes, size) in compareDawg(dictName).items()]
+		printTable(f"DAWG: {dictName}", ["", "nodes", "memory (B)"], rows)
+		rows = list(comparePatternQueries(dictName).items())
+		printTable(f"500 pattern counts: {dictName}", ["", "time (s)"], rows)
+		rows = [(name, "-" if seconds is None else seconds) for name, seconds in compareCandidateEngines(dictName).items()]
+		printTable(f"500 pattern candidate lists: {dictName}", ["", "time (s)"], rows)
+		printTable(f"Candidate engines (first solution): {dictName}", ["grid", "consistency", "nodes", "bitset (s)", "matrix (s)"], compareEngines(dictName))
+		printTable(f"Word ordering (first solution): {dictName}", ["grid", "order", "nodes", "time (s)"], compareOrdering(dictName))
+		printTable(f"Slot ordering (first solution): {dictName}", ["grid", "order", "nodes", "time (s)"], compareSlotOrders(dictName))
+		printTable(f"Beam ordering, 15x15 grid: {dictName}", ["width", "time (s)"], compareBeamWidths(dictName))
+		printTable(f"500 domain revisions: {dictName}", ["", "time (s)"], list(compareDomainPruning(dictName).items()))
+		printTable(f"Crossing tables (AC-3 setup): {dictName}", ["grid", "first (s)", "cached (s)"], compareCrossingTables(dictName))
+		printTable(f"Propagation (all solutions): {dictName}", ["grid", "consistency", "nodes", "time (s)"], compareConsistency(dictName))
+		printTable(f"Trail (all solutions, no propagation): {dictName}", ["grid", "nodes", "cell writes", "trail peak", "time (s)"], compareTrail(dictName))
+		printTable(f"Backjumping (all solutions, forward checking): {dictName}", ["grid", "", "nodes", "backjumps", "skipped", "time (s)"], compareBackjumping(dictName))
+		printTable(f"Nogood cache (all solutions, forward checking): {dictName}", ["grid", "cache size", "nodes", "hits", "misses", "time (s)"], compareNogoods(dictName))
+		printTable(f"Distinct words (all solutions): {dictName}", ["grid", "solutions", "filter nodes", "filter (s)",
+																   "distinct nodes", "distinct (s)"], compareDistinct(dictName))
+		printTable(f"Best fill (frequency scores): {dictName}", ["grid", "best score", "rank nodes", "rank (s)",
+																 "bound nodes", "bound (s)"], compareBestFill(dictName))
+		printTable(f"Counting solutions: {dictName}", ["grid", "solutions", "count (s)", "enumerate (s)"], compareCounting(dictName))
+		printTable(f"First solution (nodes): {dictName}", ["grid", "alphabetical", "random median", "random worst",
+																	"restarts median", "restarts worst"], compareRestarts(dictName))
+		printTable(f"Parallel search (all solutions): {dictName}", ["grid", "solutions", "1 process (s)", "pool (s)", "stealing (s)"], compareParallel(dictName))
+
+if __name__ == "__main__":
+	main(sys.argv[1:] or dictNames)
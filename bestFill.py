@@ -0,0 +1,141 @@
+"""
+Best fill:
+
+Finds the k highest scoring fills of a crossword, without enumerating the others. A
+fill's score is the sum of the scores of its words: word lists may give a score after
+each word (a second column, see helpers.fileToWordScores), and words without one score
+Constants.defaultWordScore. Scores are kept per word length in arrays indexed by word
+id (see preprocessWordList.scoresById), which index bundles map straight from the file.
+
+Branch and bound: each word's candidates are tried best first, and a subtree is cut off
+as soon as the words placed so far, plus the best score each word left to fill could
+still add (the best candidate left in its domain), can't beat the k-th best fill found
+so far. Good fills found early make the bound cut off more of the search.
+
+bestFills(wordList, iW, k, scores, order, consistency, distinct, stats, maxSeconds, maxNodes, cancel) => list of (score, fill), best first
+
+A fill is a str list in the same order as wordList.
+"""
+
+import heapq
+import itertools
+import math
+import time
+from constants import Constants
+from helpers import LRUCache, bitsToIds
+from preprocessWordList import scoresById
+from crosswordSolver import Search, SolveStats, BudgetExceeded, makeBudget, defaultInfoWrapper
+
+#---------------------------------------------------------------------------#
+
+# Search keeping the k best fills it finds. Backjumping and nogoods are off: a subtree
+# cut off by the bound isn't unsolvable, and the bound depends on every word placed.
+class BestSearch(Search):
+
+	# scores : (int : float sequence) dict, word scores by length and id (see
+	# preprocessWordList.scoresById), k : number of fills to keep
+	def __init__(self, wordList, index, scores, k=1, order="dynamic", stats=None, consistency="ac3", budget=None,
+				 distinct=True):
+		Search.__init__(self, wordList, index, order, stats, consistency, False, 0, budget=budget, distinct=distinct)
+		self._scores = scores
+		self._k = k
+		self._total = 0 			# Score of the words placed
+		self._kept = [] 			# Heap of (score, -order found, fill): the k best fills found
+		self._bounds = LRUCache(1 << 14) 	# pattern -> best score of its candidates (without domains)
+
+	# The k best fills, best first
+	# -> (float * str list) list
+	def run(self):
+		found = itertools.count()
+		for solution in self.solutions():
+			entry = (self._total, -next(found), list(solution))
+			if len(self._kept) < self._k:
+				heapq.heappush(self._kept, entry)
+			else:
+				heapq.heappushpop(self._kept, entry)
+		return self.fills()
+
+	# The best fills found so far (all of them once run has finished), best first
+	# -> (float * str list) list
+	def fills(self):
+		return [(score, fill) for score, order, fill in sorted(self._kept, reverse=True)]
+
+	# Score of the word of a length with a given id
+	# int * int -> float
+	def _idScore(self, length, i):
+		table = self._scores.get(length)
+		score = math.nan if table is None else table[i]
+		return Constants.defaultWordScore if math.isnan(score) else score
+
+	# str -> float
+	def _score(self, candidate):
+		i = self._index.wordId(candidate)
+		return Constants.defaultWordScore if i is None else self._idScore(len(candidate), i)
+
+	# Score a fill has to beat to be kept
+	# -> float
+	def _threshold(self):
+		return self._kept[0][0] if len(self._kept) == self._k else float("-inf")
+
+	# Best score word could add: that of its best candidate left
+	# wordClass -> float
+	def _bound(self, word):
+		length = word.length()
+		if self._domains:
+			return max((self._idScore(length, i) for i in bitsToIds(self._domains.bits(word))), default=float("-inf"))
+		pattern = self._cells.pattern(word)
+		bound = self._bounds.get(pattern)
+		if bound is None:
+			ids = bitsToIds(self._index.candidateIds(pattern))
+			bound = max((self._idScore(length, i) for i in ids), default=float("-inf"))
+			self._bounds.put(pattern, bound)
+		return bound
+
+	# Candidates best first, until the rest can't beat the threshold. Keeps _total up to
+	# date with the candidate being tried.
+	def _each(self, word, candidates, level):
+		levels = self._levels
+		rest = sum(self._bound(other) for other in self._words if id(other) not in levels)
+		for candidate in sorted(candidates, key=self._score, reverse=True):
+			score = self._score(candidate)
+			# Candidates come best first: none of the others can do better either
+			if self._total+score+rest <= self._threshold():
+				self.stats.bounded += 1
+				return
+			self._total += score
+			try:
+				yield candidate
+			finally:
+				self._total -= score
+
+#---------------------------------------------------------------------------#
+
+# Logic:
+# 1) Search the whole crossword with BestSearch (regions aren't split: the best fills of
+#    the whole grid aren't simply made of the best fills of each region once k > 1)
+# 2) Stop when the search is done, or the budget (maxSeconds, maxNodes, cancel) runs out:
+#    the best fills found by then are returned, and stats.status says which
+
+# k: number of fills wanted, scores: (str : float) dict (None: the scores of iW's word
+# list), order: "dynamic" or "static", consistency: None, "forward" or "ac3", distinct: no
+# word used twice (see crosswordSolver.Search), stats: SolveStats to fill in
+# wordClass list * infoWrapper * int * (str : float) dict option * str * str option * bool * SolveStats
+#	* float option * int option * CancelToken option -> (float * str list) list
+def bestFills(wordList, iW=None, k=1, scores=None, order="dynamic", consistency="ac3", distinct=True, stats=None,
+			  maxSeconds=None, maxNodes=None, cancel=None):
+	iW = iW or defaultInfoWrapper()
+	scores = iW._scores if scores is None else scoresById(iW._patternIndex, scores)
+	stats = stats or SolveStats()
+	start = time.perf_counter()
+	budget = makeBudget(maxSeconds, maxNodes, cancel)
+	search = BestSearch(wordList, iW._patternIndex, scores, k, order, stats, consistency, budget, distinct)
+	try:
+		search.run()
+		stats.status = "complete"
+	except BudgetExceeded as exceeded:
+		stats.status = exceeded.reason
+	finally:
+		stats.seconds = time.perf_counter()-start
+	fills = search.fills()
+	stats.solutions = len(fills)
+	return fills
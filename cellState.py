@@ -0,0 +1,88 @@
+"""
+Cell state:
+
+The letters of a crossword's white squares, each stored exactly once: one flat
+bytearray with a byte per square, and every word a view onto it (the offsets of its
+squares, in order). Placing a word writes each of its letters once, into the square
+the words crossing there share, so crossing words agree by construction and nothing
+is ever copied from one word to another.
+
+Built from gridToWordClassList output: Word._pointers/_indices say which squares words
+share, and Word._chars the letters given. The Words themselves are never modified.
+Only words in the list share squares (a word crossing one outside it keeps the letter
+of that square as given).
+
+Letters are stored as latin-1 bytes (Constants.defaultEmptyChar for a blank).
+
+state = CellState(wordList)
+state.pattern(word) => the word's letters and blanks, like word.string()
+state.place(word, candidate, trail), state.unplace(trail, mark) => fill in / blank again
+"""
+
+from constants import Constants
+
+#---------------------------------------------------------------------------#
+
+_BLANK = ord(Constants.defaultEmptyChar)
+
+class CellState:
+
+	# wordList : wordClass list
+	def __init__(self, wordList):
+		inside = {id(word) for word in wordList}
+		cellOf = {} 		# (id(word), index) -> offset, for the squares already numbered
+		letters = []
+		self._slots = {} 	# id(word) -> offsets of its squares (index x-1 for Word index x)
+		for word in wordList:
+			offsets = []
+			for x in range(1, word.length()+1):
+				offset = cellOf.get((id(word), x))
+				if offset is None:
+					offset = len(letters)
+					letters.append(_BLANK)
+					other = word._pointers[x]
+					if other and id(other) in inside:
+						cellOf[(id(other), word._indices[x])] = offset
+				char = word._chars[x]
+				if char != Constants.defaultEmptyChar:
+					letters[offset] = ord(char)
+				offsets.append(offset)
+			self._slots[id(word)] = tuple(offsets)
+		self.cells = bytearray(letters)
+
+	# Offsets of the squares of word
+	# wordClass -> int tuple
+	def slot(self, word):
+		return self._slots[id(word)]
+
+	# Letters and blanks of word (same as Word.string() would give)
+	# wordClass -> str
+	def pattern(self, word):
+		return bytes(map(self.cells.__getitem__, self._slots[id(word)])).decode("latin-1")
+
+	# Letter x (1 indexed, like Word._chars) of word
+	# wordClass * int -> char
+	def letter(self, word, x):
+		return chr(self.cells[self._slots[id(word)][x-1]])
+
+	# Whether square x (1 indexed) of word is blank
+	# wordClass * int -> bool
+	def blank(self, word, x):
+		return self.cells[self._slots[id(word)][x-1]] == _BLANK
+
+	# Write candidate into the blank squares of word, recording the offset of each on
+	# trail (a list shared by the whole search) so that unplace can blank them again
+	# wordClass * str * int list -> None
+	def place(self, word, candidate, trail):
+		cells = self.cells
+		for offset, char in zip(self._slots[id(word)], candidate.encode("latin-1")):
+			if cells[offset] == _BLANK:
+				cells[offset] = char
+				trail.append(offset)
+
+	# Blank the squares recorded on trail since mark (its length before the places to undo)
+	# int list * int -> None
+	def unplace(self, trail, mark=0):
+		cells = self.cells
+		while len(trail) > mark:
+			cells[trail.pop()] = _BLANK
@@ -0,0 +1,255 @@
+"""
+Compact trie:
+
+Array-backed alternative to the Node trie. Instead of one Python object per letter,
+the whole structure is stored in a handful of flat typed arrays, one slot per node:
+
+- children: 26 entries per node, index of the child node (0 = no child. The root is
+  node 0 and can never be a child, so 0 is free to mean "empty")
+- parents, letters, depths, heights: enough to answer whichWord() and maxLength()
+- terminal: 1 if the node ends a word
+- wordIds: id of the word ending at the node (order of insertion), -1 otherwise
+
+CompactNode is a light view onto one slot of a CompactTrie. It supports the same
+read-only API as Node ([char], iteration over 26 children, .word, whichWord(),
+maxLength()), so it can be passed wherever the solvers and trie.py functions expect
+the root of a trie.
+"""
+
+from array import array
+from constants import Constants
+
+# Number of children per node (a-z)
+ALPHABET = 26
+# Reused to extend the child table by one node
+_EMPTY_ROW = array('i', [0]*ALPHABET)
+# Names of the arrays making up a trie (see buffers/fromBuffers)
+BUFFERS = ["children", "parents", "letters", "depths", "heights", "terminal", "wordIds"]
+
+class CompactTrie:
+
+	# words : str list (optional) words to insert straight away
+	def __init__(self, words=()):
+		self._children = array('i', _EMPTY_ROW)	# Child table, ALPHABET entries per node
+		self._parents = array('i', [-1])			# Parent of each node (-1 for the root)
+		self._letters = bytearray(1)				# Letter of each node (0 for the root)
+		self._depths = array('i', [0])				# Depth of each node (root = 0)
+		self._heights = array('i', [0])			# Longest path existing underneath each node
+		self._terminal = bytearray(1)				# 1 if a word ends at the node
+		self._wordIds = array('i', [-1])			# Id of the word ending at the node
+		self._numWords = 0
+		self._views = []							# Cache of CompactNode views (filled on demand)
+		for word in words:
+			self.insert(word)
+
+	# Create a (read only) trie on top of existing buffers, e.g. memoryviews of a mapped
+	# file (see indexBundle). Integer buffers must support indexing like array('i').
+	# (str : buffer) dict * int -> CompactTrie
+	@classmethod
+	def fromBuffers(cls, buffers, numWords):
+		trie = cls.__new__(cls)
+		for name in BUFFERS:
+			setattr(trie, "_"+name, buffers[name])
+		trie._numWords = numWords
+		trie._views = []
+		return trie
+
+	# The arrays making up the trie, by name
+	# -> (str : array) dict
+	def buffers(self):
+		return {name : getattr(self, "_"+name) for name in BUFFERS}
+
+	def __len__(self):
+		return self._numWords
+
+	def __contains__(self, word):
+		index = self.find(word)
+		return index != -1 and bool(self._terminal[index])
+
+	# Calculates an index from a corresponding char (e.g. 'a' = 0)
+	@staticmethod
+	def _charToInt(letter):
+		return ord(letter.lower())-97
+
+	# Append a new node below parent. Returns its index.
+	# int * str -> int
+	def _newNode(self, parent, letter):
+		index = len(self._parents)
+		self._children.extend(_EMPTY_ROW)
+		self._parents.append(parent)
+		self._letters.append(ord(letter))
+		self._depths.append(self._depths[parent]+1)
+		self._heights.append(0)
+		self._terminal.append(0)
+		self._wordIds.append(-1)
+		self._children[parent*ALPHABET+self._charToInt(letter)] = index
+		return index
+
+	# Insert one word. Returns the word's id (existing id if already present).
+	# str -> int
+	def insert(self, word):
+		children, heights = self._children, self._heights
+		length = len(word)
+		node = 0
+		if heights[0] < length:
+			heights[0] = length
+		for depth, char in enumerate(word, 1):
+			i = self._charToInt(char)
+			if not 0 <= i < ALPHABET:
+				raise IndexError(f"Cannot insert {word!r}: only the letters a-z are supported")
+			child = children[node*ALPHABET+i]
+			if child == 0:
+				child = self._newNode(node, char.lower())
+			node = child
+			# Every node on the path has at least the rest of this word underneath it
+			if heights[node] < length-depth:
+				heights[node] = length-depth
+		if not self._terminal[node]:
+			self._terminal[node] = 1
+			self._wordIds[node] = self._numWords
+			self._numWords += 1
+		return self._wordIds[node]
+
+	# Index of the node reached by following word from the root, -1 if it doesn't exist
+	# (also when word has a character outside a-z)
+	# str -> int
+	def find(self, word):
+		children = self._children
+		node = 0
+		for char in word:
+			i = self._charToInt(char)
+			if not 0 <= i < ALPHABET:
+				return -1
+			node = children[node*ALPHABET+i]
+			if node == 0:
+				return -1
+		return node
+
+	# Number of words matching a pattern, e.g. "a--b-" (blanks may be "-" or
+	# Constants.defaultEmptyChar; any other character outside a-z matches nothing)
+	# str -> int
+	def countMatches(self, pattern):
+		children, terminal = self._children, self._terminal
+		blanks = (Constants.defaultPatternChar, Constants.defaultEmptyChar)
+		length = len(pattern)
+		count = 0
+		stack = [(0, 0)]
+		while stack:
+			node, depth = stack.pop()
+			if depth == length:
+				count += terminal[node]
+				continue
+			char = pattern[depth]
+			base = node*ALPHABET
+			if char in blanks:
+				for child in children[base:base+ALPHABET]:
+					if child:
+						stack.append((child, depth+1))
+			else:
+				i = self._charToInt(char)
+				if not 0 <= i < ALPHABET:
+					return 0
+				child = children[base+i]
+				if child:
+					stack.append((child, depth+1))
+		return count
+
+	# Index of child i (0-25) of node, 0 if there is none
+	# int * int -> int
+	def child(self, node, i):
+		return self._children[node*ALPHABET+i]
+
+	# Word spelled out by the path from the root to node
+	# int -> str
+	def wordAt(self, node):
+		letters = []
+		while node > 0:
+			letters.append(chr(self._letters[node]))
+			node = self._parents[node]
+		return "".join(reversed(letters))
+
+	# View onto a node, usable like a Node. Views are created once per node and
+	# reused, so repeated traversals don't allocate.
+	# int -> CompactNode
+	def node(self, index):
+		views = self._views
+		if len(views) <= index:
+			views.extend([None]*(len(self._parents)-len(views)))
+		view = views[index]
+		if view is None:
+			view = views[index] = CompactNode(self, index)
+		return view
+
+	def root(self):
+		return self.node(0)
+
+	# Number of nodes (each representing one letter) + 1 (for the root)
+	def nodeCount(self):
+		return len(self._parents)
+
+	# Bytes used by the arrays holding the structure
+	def sizeInBytes(self):
+		arrays = [self._children, self._parents, self._depths, self._heights, self._wordIds]
+		total = sum(a.itemsize*len(a) for a in arrays)
+		return total + len(self._letters) + len(self._terminal)
+
+class CompactNode:
+
+	__slots__ = ("_trie", "_index")
+
+	def __init__(self, trie, index):
+		self._trie = trie
+		self._index = index
+
+	def __repr__(self):
+		letter = chr(self._trie._letters[self._index]) if self._index else ""
+		return f"({letter},{self.word})"
+
+	def __iter__(self):
+		trie = self._trie
+		base = self._index*ALPHABET
+		for child in trie._children[base:base+ALPHABET]:
+			yield trie.node(child) if child else None
+
+	# Returns None on failure (mirrors Node). IndexError outside 0-25 (a-z).
+	def __getitem__(self, i):
+		if i.__class__ is str:
+			i = ord(i.lower())-97
+		elif not isinstance(i, int):
+			raise TypeError("Node indices must be int or char")
+		if not 0 <= i < ALPHABET:
+			raise IndexError(f"Node index {i} out of range: only the letters a-z are supported")
+		trie = self._trie
+		child = trie._children[self._index*ALPHABET+i]
+		if child:
+			views = trie._views
+			if child < len(views) and views[child] is not None:
+				return views[child]
+			return trie.node(child)
+		return None
+
+	@property
+	def word(self):
+		return bool(self._trie._terminal[self._index])
+
+	# Id of the word represented by the node (-1 if it isn't a word)
+	def wordId(self):
+		return self._trie._wordIds[self._index]
+
+	# Return word represented by node.
+	def whichWord(self):
+		return self._trie.wordAt(self._index)
+
+	# Return max word length on node's path
+	def maxLength(self):
+		return self._trie._depths[self._index]+self._trie._heights[self._index]
+
+	# The CompactTrie the node belongs to
+	def trie(self):
+		return self._trie
+
+# Creates a compact trie with every word in a given word list. Returns root of the trie
+# (drop in replacement for trie.listToTrie).
+# str list -> CompactNode
+def listToCompactTrie(wordList):
+	return CompactTrie(wordList).root()
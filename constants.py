@@ -6,4 +6,10 @@ class Constants:
 	# Used to represent an empty white cell
 	defaultEmptyChar = " "
 	# Used to represent a blocked black cell
-	defaultBlockedChar = "#" 
\ No newline at end of file
+	defaultBlockedChar = "#"
+	# Used to represent a blank in word patterns (see preprocessWordList.extractAllPatterns)
+	defaultPatternChar = "-"
+	# Seconds a solve started from the GUI may take before it is stopped
+	maxSolveSeconds = 30
+	# Score of the words a scored word list gives no score (see helpers.fileToWordScores)
+	defaultWordScore = 0
@@ -0,0 +1,847 @@
+"""
+Crossword solver:
+
+Canonical solve entry point. Solutions are generated lazily, one at a time, as the
+search finds them: asking for the first 50 solutions, or only the 1000th, never
+materializes the others, and memory use doesn't grow with the number of solutions
+enumerated.
+
+Regions of the grid which share no words (components of the crossing graph) are
+searched independently and their solutions combined, so the time taken is the sum of
+the regions' costs rather than their product. Every combination reuses the solutions
+of the regions after the first: up to cacheSolutions of each are kept, and a region
+with more is searched again for each combination instead, so memory stays bounded
+there too.
+
+solveGen(wordList, iW, limit, offset, order, stats, consistency, backjump, nogoods, eviction,
+		 maxSeconds, maxNodes, cancel, seed, beamWidth, distinct, exclude, cacheSolutions) => generator of solutions
+solve(wordList, iW, limit, offset, **options) => (list of WordIds, list of solutions)
+SolutionCursor(wordList, iW, maxSeconds, window, **options).get(i) => solution i, paging through them in bounded memory
+restartSolve(wordList, iW, seed, schedule, unit, factor, maxRestarts, stats, maxSeconds, cancel, **options) => first solution
+countSolutions(wordList, iW, order, consistency, nogoods, eviction, stats, maxSeconds, maxNodes, cancel, distinct) => number of solutions
+
+No dictionary word fills two words of a solution, unless distinct=False (for puzzles
+which allow repeats).
+
+A solve can be bounded in time (maxSeconds), in nodes (maxNodes), or stopped from
+elsewhere (cancel: a CancelToken). When it runs out, it stops as if it had finished,
+and its SolveStats tell why (status) and how far it got (best: the fullest partial
+fill reached).
+
+A solution is a str list in the same order as wordList (solution[i] fills wordList[i]).
+"""
+
+import itertools
+import random
+from collections import deque
+import time
+from constants import Constants
+from helpers import bitsToIds, popCount, luby, LRUCache, FIFOCache, ReplayList
+from devVersions.readyWordClassList import extractIds
+from indexBundle import loadInfoWrapper
+from propagation import Domains
+from preprocessWordList import beamOrder
+from cellState import CellState
+
+#---------------------------------------------------------------------------#
+
+# Set which dictionary is used when no infoWrapper is passed
+dictName = "wordLists/dict1k.txt"
+
+#---------------------------------------------------------------------------#
+
+_defaultInfoWrapper = None
+
+# infoWrapper of dictName (loaded from its index bundle once per process)
+# -> infoWrapper
+def defaultInfoWrapper():
+	global _defaultInfoWrapper
+	if _defaultInfoWrapper is None:
+		_defaultInfoWrapper = loadInfoWrapper(dictName)
+	return _defaultInfoWrapper
+
+#---------------------------------------------------------------------------#
+
+# Statistics about a search, filled in as it runs (pass one to solveGen to read them)
+class SolveStats:
+
+	def __init__(self):
+		self.nodes = 0 			# Candidate words placed
+		self.tried = 0 			# Candidate words tried (placed, or ruled out by propagation or distinct)
+		self.solutions = 0 		# Complete solutions found (of the whole grid)
+		self.prunes = 0 		# Candidates removed from domains by propagation
+		self.backjumps = 0 		# Failures which jumped back over more than one level
+		self.skipped = 0 		# Levels jumped over (their remaining candidates never tried)
+		self.nogoodHits = 0 	# Subproblems cut off because they were already proven unsolvable
+		self.nogoodMisses = 0 	# Subproblems looked up and not found
+		self.nogoodEvictions = 0 	# Nogoods dropped from the full cache
+		self.memoHits = 0 		# Subproblems whose number of solutions was already known (counting)
+		self.memoMisses = 0 	# Subproblems counted from scratch
+		self.steals = 0 		# Tasks split off a busy worker for an idle one (workStealing)
+		self.restarts = 0 		# Searches given up and started again (restartSolve)
+		self.bounded = 0 		# Subtrees cut off because they couldn't score well enough (bestFill)
+		self.cellWrites = 0 	# Letters written by the words placed (each recorded on the trail)
+		self.trailPeak = 0 		# Most letters on the trail at once: all the undo state ever kept
+		self.status = None 		# "complete", or why the solve stopped early: "nodes", "time", "cancelled"
+		self.seconds = 0 		# Time taken
+		self.filled = 0 		# Words filled in best
+		self.best = None 		# Fullest fill reached (str option list, in wordList order)
+
+	def __repr__(self):
+		return ", ".join(f"{name}: {value}" for name, value in vars(self).items())
+
+# Set from another thread (e.g. a GUI's stop button) to stop a solve
+class CancelToken:
+
+	def __init__(self):
+		self._cancelled = False
+
+	def cancel(self):
+		self._cancelled = True
+
+	def cancelled(self):
+		return self._cancelled
+
+# Raised inside a search when its Budget runs out
+class BudgetExceeded(Exception):
+
+	def __init__(self, reason):
+		Exception.__init__(self, reason)
+		self.reason = reason
+
+# Limits on a solve. Searches check it as they try candidates, whether they are placed or
+# ruled out. The number of candidates between checks is scaled to the time they take, so
+# there is a check about every interval seconds however costly a candidate is (one AC-3
+# assignment on a large word list can take milliseconds), and the hot loop mostly pays
+# for an int comparison.
+class Budget:
+
+	# Most candidates between two checks
+	MAX_STRIDE = 1 << 12
+
+	def __init__(self, maxSeconds=None, maxNodes=None, cancel=None, interval=0.005):
+		self.deadline = None if maxSeconds is None else time.perf_counter()+maxSeconds
+		self.maxNodes = maxNodes
+		self.cancel = cancel
+		self.interval = interval
+		self._stride = 1 		# Candidates between checks
+		self._checked = time.perf_counter() 	# Time of the last check
+
+	# Why the solve must stop ("nodes", "time" or "cancelled"), None if it may go on
+	# int -> str option
+	def exceeded(self, nodes):
+		if self.maxNodes is not None and nodes >= self.maxNodes:
+			return "nodes"
+		if self.cancel is not None and self.cancel.cancelled():
+			return "cancelled"
+		if self.deadline is not None and time.perf_counter() >= self.deadline:
+			return "time"
+		return None
+
+	# Candidates tried at which to check again, given the candidates tried and the nodes
+	# placed so far. A node is placed per candidate at most, so maxNodes is never passed.
+	# int * int -> int
+	def nextCheck(self, tried, nodes):
+		now = time.perf_counter()
+		elapsed, self._checked = now-self._checked, now
+		if elapsed > self.interval:
+			self._stride = max(1, int(self._stride*self.interval/elapsed))
+		elif elapsed < self.interval/2:
+			self._stride = min(self._stride*2, self.MAX_STRIDE)
+		stride = self._stride
+		if self.maxNodes is not None:
+			stride = max(1, min(stride, self.maxNodes-nodes))
+		return tried+stride
+
+# Budget for the given limits, None if there are none
+# float option * int option * CancelToken option -> Budget option
+def makeBudget(maxSeconds=None, maxNodes=None, cancel=None):
+	if maxSeconds is None and maxNodes is None and cancel is None:
+		return None
+	return Budget(maxSeconds, maxNodes, cancel)
+
+#---------------------------------------------------------------------------#
+
+# Write candidate into word, and into the words crossing it, wherever the letter is
+# still blank. Every letter written is recorded on trail as (Word._chars list, index), so
+# that unplace can blank it again. Returns trail (a new one if none is given).
+# (Search doesn't write into Words: it fills the squares of a CellState instead.)
+# wordClass * str * (char list * int) list -> (char list * int) list
+def place(word, candidate, trail=None):
+	if trail is None:
+		trail = []
+	blank = Constants.defaultEmptyChar
+	chars, pointers, indices = word._chars, word._pointers, word._indices
+	for x in range(1, word._length+1):
+		if chars[x] == blank:
+			letter = candidate[x-1]
+			chars[x] = letter
+			trail.append((chars, x))
+			other = pointers[x]
+			if other:
+				other._chars[indices[x]] = letter
+				trail.append((other._chars, indices[x]))
+	return trail
+
+# Blank the letters recorded on trail since mark (its length before the places to undo)
+# (char list * int) list * int -> None
+def unplace(trail, mark=0):
+	blank = Constants.defaultEmptyChar
+	while len(trail) > mark:
+		chars, x = trail.pop()
+		chars[x] = blank
+
+#---------------------------------------------------------------------------#
+
+# Depth first search over the words of a crossword, yielding solutions as they are found.
+# order: "static" = fill the words in list order (like the devVersions solvers)
+#        "dynamic" = fill next the word with the fewest candidates given the letters placed
+#                    so far (ties: the word with the most crossings, Word._constrained)
+# consistency: None = only check that every word can still be completed
+#              "forward" = keep candidate domains, pruned by forward checking (see propagation)
+#              "ac3" = keep candidate domains arc consistent
+# backjump: on failure, return straight to the most recent word involved in the conflict
+#           (conflict-directed backjumping) instead of the previous one
+#
+# Levels: the word assigned at depth i of the search is level i. A conflict set is a bitmask
+# of levels (bit i = level i) whose assignments together rule out every candidate of some
+# word. _solve returns the conflict set of its subtree; a level which is not in it can't
+# have caused the failure, so its other candidates are skipped. Once a solution has been
+# found below a level, its conflict set is every earlier level (plain backtracking).
+#
+# nogoods: number of unsolvable subproblems to remember (0 = don't), eviction: "lru" or
+# "fifo" once that many are stored. A subproblem is the patterns (CellState.pattern) of the
+# words still unassigned: whichever words were placed to reach it, it has the same
+# solutions, so one proven unsolvable is cut off on sight the next time it comes up.
+# Counting (count) remembers the number of solutions of up to as many subproblems.
+#
+# budget: Budget to stop the search by (BudgetExceeded is raised out of it). The fullest
+# fill reached is kept in best (filled words).
+# rng: random.Random to shuffle each word's candidates and break ties between words with
+# it (None: candidates in alphabetical order, ties by crossings then list order)
+# distinct: never fill two words with the same candidate. With domains, a placed word is
+# removed from the domains of the words of its length; without, it is skipped when it
+# comes up again (blaming the level which used it). The words used (of the lengths left
+# to fill) are part of a subproblem, and of its nogood key.
+# exclude: words none of wordList may be filled with (e.g. those the rest of the grid
+# already uses). They are left out of the domains (or of the candidates, without
+# domains) from the start, so they are pruned like any other word ruled out.
+class Search:
+
+	def __init__(self, wordList, index, order="dynamic", stats=None, consistency="ac3", backjump=True,
+				 nogoods=1 << 14, eviction="lru", budget=None, rng=None, distinct=True, exclude=()):
+		self._words = wordList
+		self._index = index
+		self._order = order
+		self.stats = stats or SolveStats()
+		self.found = 0 			# Solutions found by this search
+		self._solution = [None]*len(wordList) 		# solution[rank] = word, shared by the whole search
+		self._rank = {id(word) : i for i, word in enumerate(wordList)}
+		self._excluded = {} 	# length -> bitset of the ids of the words excluded
+		for candidate in exclude:
+			i = index.wordId(candidate)
+			if i is not None:
+				self._excluded[len(candidate)] = self._excluded.get(len(candidate), 0) | 1 << i
+		self._domains = Domains(wordList, index, self.stats, distinct, self._excluded) if consistency else None
+		self._full = consistency == "ac3"
+		self._backjump = backjump
+		self._levels = {} 		# id(word) -> level, for the words assigned
+		self._cells = CellState(wordList) 	# Letters of the squares (the Words are left as given)
+		self._trail = [] 		# Offsets of the squares written by the words assigned (see CellState.place)
+		self._stop = None 		# Depth at which partial fills count as solutions (see prefixes)
+		self._budget = budget
+		self._nextCheck = budget.nextCheck(self.stats.tried, self.stats.nodes) if budget else float("inf")
+		self.best = [None]*len(wordList)
+		self.filled = 0
+		self._rng = rng
+		self._distinct = distinct
+		self._used = {} 		# Candidate -> level, for the words assigned (distinct only)
+		self._nogoods = self._counts = None
+		if nogoods:
+			cache = {"lru" : LRUCache, "fifo" : FIFOCache}[eviction]
+			self._nogoods, self._counts = cache(nogoods), cache(nogoods)
+
+	# Generate solutions (the same list object each time: the caller copies it)
+	def solutions(self):
+		domains = self._domains
+		if domains:
+			mark = domains.mark()
+			if not (domains.establish() if self._full else all(map(domains.bits, self._words))):
+				domains.undo(mark)
+				return
+		yield from self._solve(self._words[::-1]) 	# Stack: first word on top
+
+	# Generate the partial fills the search reaches after placing depth words, as
+	# (position in wordList, word) lists. Every solution extends exactly one of them.
+	# int -> (int * str) list generator
+	def prefixes(self, depth):
+		self._stop = depth
+		try:
+			for solution in self.solutions():
+				yield [(i, solution[i]) for i, word in enumerate(self._words) if id(word) in self._levels]
+		finally:
+			self._stop = None
+
+	# unassigned: words remaining to be matched
+	# Returns the conflict set of the subtree (see above)
+	def _solve(self, unassigned):
+		level = len(self._words)-len(unassigned)
+
+		# Base case: Success. No more words to match (or deep enough, see prefixes)
+		if not unassigned or level == self._stop:
+			self.found += 1
+			yield self._solution
+			return (1 << level)-1
+
+		nogoods = self._nogoods
+		if nogoods is not None:
+			key = self._nogoodKey(unassigned)
+			if nogoods.get(key):
+				self.stats.nogoodHits += 1
+				return self._crossingConflicts(unassigned) | self._usedConflicts(unassigned)
+			self.stats.nogoodMisses += 1
+			found = self.found
+
+		pick, candidates = self._select(unassigned)
+		# Some word can no longer be completed
+		if pick is None:
+			return self._conflicts(candidates)
+		if self._rng:
+			candidates = list(candidates)
+			self._rng.shuffle(candidates)
+		word = unassigned.pop(pick)
+		try:
+			conflicts = yield from self._match(word, candidates, unassigned, level)
+		finally:
+			# Return list to original state (also when the caller stops early)
+			unassigned.insert(pick, word)
+		# Searched to the end without a solution (not stopped early): remember it
+		if nogoods is not None and self.found == found:
+			nogoods.put(key, True)
+			self.stats.nogoodEvictions = nogoods.evictions
+		return conflicts
+
+	# Nogood cache key of the subproblem of filling unassigned (with distinct, the words
+	# already used which it could otherwise use too)
+	# wordClass list -> (int * str) tuple
+	def _nogoodKey(self, unassigned):
+		rank = self._rank
+		pattern = self._cells.pattern
+		key = tuple((rank[id(word)], pattern(word)) for word in unassigned)
+		if self._used:
+			lengths = {word.length() for word in unassigned}
+			key += (frozenset(used for used in self._used if len(used) in lengths),)
+		return key
+
+	# Levels of the words used which unassigned could otherwise use (distinct)
+	# wordClass list -> int
+	def _usedConflicts(self, unassigned):
+		conflicts = 0
+		if self._used:
+			lengths = {word.length() for word in unassigned}
+			for used, level in self._used.items():
+				if len(used) in lengths:
+					conflicts |= 1 << level
+		return conflicts
+
+	# Levels of the assigned words crossing unassigned: they wrote every letter the
+	# subproblem starts with, so they explain why it has no solution
+	# wordClass list -> int
+	def _crossingConflicts(self, unassigned):
+		levels = self._levels
+		conflicts = 0
+		for word in unassigned:
+			for other in word._pointers:
+				if other and id(other) in levels:
+					conflicts |= 1 << levels[id(other)]
+		return conflicts
+
+	# Levels responsible for the candidates word has lost: with domains, those which pruned
+	# its domain; without, the assigned words crossing it (they wrote its letters)
+	# wordClass -> int
+	def _conflicts(self, word):
+		if self._domains:
+			return self._domains.conflicts(word)
+		return self._crossingConflicts([word])
+
+	# Choose the next word to fill in. Returns its position in unassigned and its
+	# candidates (str iterable), or (None, word) if word has no candidates left.
+	# wordClass list -> int option * (str iterable + wordClass)
+	def _select(self, unassigned):
+		if self._domains:
+			return self._selectFromDomains(unassigned)
+		index = self._index
+		pattern = self._cells.pattern
+		excluded = self._excluded
+		if self._order == "static":
+			for word in unassigned:
+				if pattern(word) not in index:
+					return (None, word)
+			pick = len(unassigned)-1
+			word = unassigned[pick]
+			bits = index.candidateIds(pattern(word)) & ~excluded.get(word.length(), 0)
+		else:
+			pick, bits, bestKey = None, 0, None
+			rng = self._rng
+			for i, word in enumerate(unassigned):
+				candidates = index.candidateIds(pattern(word))
+				if excluded:
+					candidates &= ~excluded.get(word.length(), 0)
+				if not candidates:
+					return (None, word)
+				key = (popCount(candidates), -word._constrained, rng.random() if rng else 0)
+				if bestKey is None or key < bestKey:
+					pick, bits, bestKey = i, candidates, key
+		words = index.words(unassigned[pick].length())
+		return (pick, (words[i] for i in bitsToIds(bits)))
+
+	# Same as _select, but candidates are the (already pruned) domains
+	def _selectFromDomains(self, unassigned):
+		size = self._domains.size
+		rng = self._rng
+		if self._order == "static":
+			pick = len(unassigned)-1
+		elif rng:
+			pick = min(range(len(unassigned)), key=lambda i: (size(unassigned[i]), -unassigned[i]._constrained, rng.random()))
+		else:
+			pick = min(range(len(unassigned)), key=lambda i: (size(unassigned[i]), -unassigned[i]._constrained))
+		return (pick, self._domains.domain(unassigned[pick]))
+
+	# Try each candidate in turn for word (assigned at level). Returns the conflict set.
+	def _match(self, word, candidates, unassigned, level):
+		domains = self._domains
+		rank = self._rank[id(word)]
+		bit = 1 << level
+		# Candidates already ruled out by earlier levels
+		conflicts = self._conflicts(word)
+		used = self._used if self._distinct else None
+		trail, state = self._trail, self._cells
+		stats = self.stats
+		self._levels[id(word)] = level
+		try:
+			for candidate in self._each(word, candidates, level):
+				stats.tried += 1
+				if stats.tried >= self._nextCheck:
+					self._checkBudget()
+				# Already filled in elsewhere
+				if used is not None and candidate in used:
+					conflicts |= 1 << used[candidate]
+					continue
+				if domains:
+					mark = domains.mark()
+					# Some crossing word would have no candidates left
+					if not domains.assign(word, candidate, self._full, level):
+						conflicts |= domains.conflicts(domains.wiped)
+						domains.undo(mark)
+						continue
+				cells = len(trail)
+				state.place(word, candidate, trail)
+				self._wrote(cells)
+				if used is not None:
+					used[candidate] = level
+				self._solution[rank] = candidate
+				if level >= self.filled:
+					self._keepBest(level+1)
+				try:
+					below = yield from self._solve(unassigned)
+				finally:
+					state.unplace(trail, cells)
+					if used is not None:
+						del used[candidate]
+					if domains:
+						domains.undo(mark)
+				# The failure below doesn't depend on this word: no other candidate can help
+				if self._backjump and not below & bit:
+					self.stats.skipped += 1
+					return below
+				conflicts |= below
+		finally:
+			del self._levels[id(word)]
+		conflicts &= ~bit
+		if self._backjump and conflicts.bit_length() < level:
+			self.stats.backjumps += 1
+		return conflicts
+
+	# Count a node placed, which wrote the letters on the trail past cells
+	# int -> None
+	def _wrote(self, cells):
+		stats = self.stats
+		stats.nodes += 1
+		size = len(self._trail)
+		stats.cellWrites += size-cells
+		if size > stats.trailPeak:
+			stats.trailPeak = size
+
+	# Record the current partial fill (filled words) as the best so far
+	def _keepBest(self, filled):
+		levels, solution = self._levels, self._solution
+		self.best = [solution[i] if id(word) in levels else None for i, word in enumerate(self._words)]
+		self.filled = filled
+
+	# Raise BudgetExceeded if the budget has run out
+	def _checkBudget(self):
+		nodes = self.stats.nodes
+		reason = self._budget.exceeded(nodes)
+		if reason:
+			raise BudgetExceeded(reason)
+		self._nextCheck = self._budget.nextCheck(self.stats.tried, nodes)
+
+	# Candidates of word to try, in order (hook for subclasses, e.g. workStealing)
+	# wordClass * str iterable * int -> str iterable
+	def _each(self, word, candidates, level):
+		return candidates
+
+	# Number of solutions, counted without building any: subproblems are split into
+	# independent components as words get placed, and their counts are remembered
+	# -> int
+	def count(self):
+		domains = self._domains
+		if domains:
+			mark = domains.mark()
+			if not (domains.establish() if self._full else all(map(domains.bits, self._words))):
+				domains.undo(mark)
+				return 0
+		try:
+			return self._count(self._words[::-1], 0)
+		finally:
+			if domains:
+				domains.undo(mark)
+
+	# Number of ways of filling unassigned (depth words placed so far)
+	# wordClass list * int -> int
+	def _count(self, unassigned, depth):
+		if not unassigned:
+			return 1
+		# Words placed so far may have cut the remaining ones into independent groups
+		groups = components(unassigned, self._distinct, self._cells)
+		if len(groups) > 1:
+			total = 1
+			for group in groups:
+				total *= self._count(group, depth)
+				if not total:
+					break
+			return total
+
+		counts = self._counts
+		if counts is not None:
+			key = self._nogoodKey(unassigned)
+			total = counts.get(key)
+			if total is not None:
+				self.stats.memoHits += 1
+				return total
+			self.stats.memoMisses += 1
+
+		total = 0
+		pick, candidates = self._select(unassigned)
+		if pick is not None:
+			domains = self._domains
+			used = self._used if self._distinct else None
+			trail, state = self._trail, self._cells
+			stats = self.stats
+			word = unassigned.pop(pick)
+			for candidate in candidates:
+				stats.tried += 1
+				if stats.tried >= self._nextCheck:
+					self._checkBudget()
+				if used is not None and candidate in used:
+					continue
+				if domains:
+					mark = domains.mark()
+					if not domains.assign(word, candidate, self._full, depth):
+						domains.undo(mark)
+						continue
+				cells = len(trail)
+				state.place(word, candidate, trail)
+				self._wrote(cells)
+				if used is not None:
+					used[candidate] = depth
+				try:
+					total += self._count(unassigned, depth+1)
+				finally:
+					state.unplace(trail, cells)
+					if used is not None:
+						del used[candidate]
+					if domains:
+						domains.undo(mark)
+			unassigned.insert(pick, word)
+		if counts is not None:
+			counts.put(key, total)
+		return total
+
+#---------------------------------------------------------------------------#
+
+# Split the words of a crossword into groups which don't constrain each other (connected
+# components of the crossing graph, following Word._pointers). Two words are only linked
+# while both are in wordList and the square they share is blank (in cells, a CellState, if
+# given: otherwise in the Words). With distinct, words of the same length are linked too
+# (they can't be filled with the same word). Groups are ordered by their first word in
+# wordList, and keep wordList's order.
+# wordClass list * bool * CellState option -> wordClass list list
+def components(wordList, distinct=False, cells=None):
+	group = {id(word) : None for word in wordList}
+	sameLength = {}
+	if distinct:
+		for word in wordList:
+			sameLength.setdefault(word.length(), []).append(word)
+	groups = []
+	for word in wordList:
+		if group[id(word)] is not None:
+			continue
+		group[id(word)] = len(groups)
+		stack = [word]
+		while stack:
+			current = stack.pop()
+			chars = current._chars
+			for x, other in enumerate(current._pointers):
+				if other and group.get(id(other), 0) is None and (cells.blank(current, x) if cells else chars[x] == Constants.defaultEmptyChar):
+					group[id(other)] = len(groups)
+					stack.append(other)
+			for other in sameLength.get(current.length(), []):
+				if group[id(other)] is None:
+					group[id(other)] = len(groups)
+					stack.append(other)
+		groups.append([])
+	for word in wordList:
+		groups[group[id(word)]].append(word)
+	return groups
+
+# Solutions of the whole crossword from those of its components: every combination of one
+# solution per component (first component outermost). parts[0] is iterated once, the other
+# parts once per solution of the parts before them. positions[i] says where the words of
+# component i go in solution. Yields solution itself, filled in.
+# (str sequence) iterable list * int list list * str list -> str list generator
+def combine(parts, positions, solution, i=0):
+	if i == len(parts):
+		yield solution
+		return
+	for part in parts[i]:
+		for position, word in zip(positions[i], part):
+			solution[position] = word
+		yield from combine(parts, positions, solution, i+1)
+
+#---------------------------------------------------------------------------#
+
+# Solutions of a search, as tuples (for combining)
+# Search -> str tuple generator
+def tupleSolutions(search):
+	solutions = search.solutions()
+	try:
+		for solution in solutions:
+			yield tuple(solution)
+	finally:
+		solutions.close()
+
+# Logic:
+# 1) Split the crossword into components, and search each in the given order (see Search)
+# 2) Combine the components' solutions (the first is enumerated as it is searched, the
+#    others are kept as they are found, since every combination reuses them, up to
+#    cacheSolutions of each: a component with more is searched again for each pass)
+# 3) Generate solutions, skipping offset of them and stopping after limit, or once the
+#    budget (maxSeconds, maxNodes, cancel) runs out
+
+# order: "dynamic" or "static", consistency: None, "forward" or "ac3", backjump: bool,
+# nogoods: int, eviction: "lru" or "fifo" (see Search)
+# order may also be "greedy" or "beam": fill the words in a fixed order chosen up front from
+# the dictionary's avDict (see preprocessWordList.beamOrder, beamWidth wide)
+# maxSeconds, maxNodes, cancel: budget (see Budget)
+# seed: randomize the order candidates are tried in (see Search), None: alphabetical
+# distinct: no word used twice (False: repeats allowed)
+# exclude: words none of wordList may be filled with (see Search)
+# cacheSolutions: solutions kept per component after the first (see above)
+# stats: SolveStats to fill in
+# wordClass list * infoWrapper * int option * int * str * SolveStats * str option * bool * int * str
+#	* float option * int option * CancelToken option * int option * int * bool * str iterable * int
+#	-> str list generator
+def solveGen(wordList, iW=None, limit=None, offset=0, order="dynamic", stats=None, consistency="ac3", backjump=True,
+			 nogoods=1 << 14, eviction="lru", maxSeconds=None, maxNodes=None, cancel=None, seed=None, beamWidth=8,
+			 distinct=True, exclude=(), cacheSolutions=1 << 12):
+	iW = iW or defaultInfoWrapper()
+	stats = stats or SolveStats()
+	start = time.perf_counter()
+	budget = makeBudget(maxSeconds, maxNodes, cancel)
+	rng = None if seed is None else random.Random(seed)
+	position = {id(word) : i for i, word in enumerate(wordList)}
+	groups = components(wordList, distinct)
+	if order in ("greedy", "beam"):
+		groups = [beamOrder(group, iW._avDict, 1 if order == "greedy" else beamWidth) for group in groups]
+		order = "static"
+	exclude = set(exclude)
+	searches = [Search(group, iW._patternIndex, order, stats, consistency, backjump, nogoods, eviction, budget, rng, distinct,
+					   exclude) for group in groups]
+	parts = ([search.solutions() for search in searches[:1]]
+			 +[ReplayList(lambda search=search: tupleSolutions(search), cacheSolutions) for search in searches[1:]])
+	positions = [[position[id(word)] for word in group] for group in groups]
+	try:
+		# A component without solutions leaves nothing to combine
+		if all(parts[1:]):
+			stop = None if limit is None else offset+limit
+			for solution in itertools.islice(combine(parts, positions, [None]*len(wordList)), offset, stop):
+				stats.solutions += 1
+				yield list(solution)
+		stats.status = "complete"
+	except BudgetExceeded as exceeded:
+		stats.status = exceeded.reason
+	finally:
+		for part in parts:
+			part.close()
+		# Fullest fill of each component, together
+		stats.best = [None]*len(wordList)
+		for search, group in zip(searches, positions):
+			for i, word in zip(group, search.best):
+				stats.best[i] = word
+		stats.filled = sum(search.filled for search in searches)
+		stats.seconds = time.perf_counter()-start
+
+# Success: wordClass list * infoWrapper -> WordId list * str list list
+# solve(wordList) => (ids of the words, list containing a list of all solution lists)
+# e.g. ([(1, "Across"), (1, "Down")], [["hi", "hat"], ["he", "hat"]]). Failure returns an empty list of solutions
+# options: any other solveGen arguments, by name
+def solve(wordList, iW=None, limit=None, offset=0, **options):
+	return (extractIds(wordList), list(solveGen(wordList, iW, limit, offset, **options)))
+
+# Solutions of a crossword by number, for paging through them (e.g. the GUI's prev/next/
+# goto): one solveGen is kept open between calls, so going forward each solution is
+# searched for once and in order. Only the last window solutions it passed are kept for
+# going back: a solution before them is reached by a new solveGen started there (offset),
+# so memory stays bounded however far the paging goes. Every search is bounded by
+# maxSeconds: a generator opened earlier which runs out of time is replaced by a new one
+# (resuming where it stopped) before giving up.
+# A solution already known (first, e.g. one repaired by a SolverSession and drawn) can be
+# made solution 0 without searching: the others follow in solveGen's order, without it.
+class SolutionCursor:
+
+	# window : number of solutions kept for going back, first : str list option
+	# options : any other solveGen arguments, by name
+	def __init__(self, wordList, iW=None, maxSeconds=None, window=64, first=None, **options):
+		self._words = wordList
+		self._iW = iW
+		self._maxSeconds = maxSeconds
+		self._options = options
+		self._kept = deque(maxlen=window) 	# The last solutions passed, the last being number _next-1
+		self._next = 0 			# Number of the solution the open generator yields next
+		self.stats = None 		# SolveStats of the current (or last) generator
+		self._generator = None
+		self._first = None if first is None else list(first)
+		self._position = 0 		# Position in solveGen's order of the solution the generator yields next
+		self._firstAt = None 	# Position of first in solveGen's order, once passed
+		self._clear = 0 		# Positions before this one are known not to be first's
+
+	# Solution number index (0 indexed), None if there is none or it can't be found in time
+	# (see stats.status)
+	# int -> str list option
+	def get(self, index):
+		if index == 0 and self._first is not None:
+			return self._first
+		start = self._next-len(self._kept)
+		if start <= index < self._next:
+			return self._kept[index-start]
+		fresh = False
+		if self._generator is None or index < start:
+			self._open(index)
+			fresh = True
+		while self._next <= index:
+			solution = next(self._generator, None)
+			if solution is None:
+				self._generator = None
+				if fresh or self.stats.status == "complete":
+					return None
+				self._open(self._next)
+				fresh = True
+				continue
+			position = self._position
+			self._position += 1
+			if self._first is not None:
+				if self._firstAt is None:
+					if solution == self._first:
+						self._firstAt = position
+					else:
+						self._clear = max(self._clear, position+1)
+				if position == self._firstAt:
+					continue
+			self._kept.append(solution)
+			self._next += 1
+		return self._kept[-1]
+
+	# Open a new generator starting at solution number index, or before it (the solutions
+	# kept stay if it follows on from them). With first, solution n is solveGen's n-1, or
+	# its n if first came before: until that is known, the generator starts at the first
+	# position which could be first's.
+	# int -> None
+	def _open(self, index):
+		self.close()
+		position = index
+		if self._first is not None:
+			position = index-1
+			if self._firstAt is not None:
+				position += position >= self._firstAt
+			elif position > self._clear:
+				position, index = self._clear, self._clear+1
+		if index != self._next:
+			self._kept.clear()
+			self._next = index
+		self._position = position
+		self.stats = SolveStats()
+		self._generator = solveGen(self._words, self._iW, offset=position, stats=self.stats,
+								   maxSeconds=self._maxSeconds, **self._options)
+
+	# Stop the open search, if any
+	def close(self):
+		if self._generator is not None:
+			self._generator.close()
+			self._generator = None
+
+# First solution mode with randomized restarts. A search which gets unlucky early on can
+# take orders of magnitude longer than one which doesn't: rather than sticking with one
+# order, run randomized searches (seeds seed, seed+1, ...), each stopped after a growing
+# number of nodes: unit times the terms of the Luby sequence (schedule="luby") or
+# unit*factor**i (schedule="geometric"). Returns the first solution found, None if there
+# is none (or the restarts/budget ran out: see stats.status). stats.restarts says how
+# many restarts it took.
+# options: any other solveGen arguments, by name
+# wordClass list * infoWrapper * int * str * int * float * int option * SolveStats * float option
+#	* CancelToken option -> str list option
+def restartSolve(wordList, iW=None, seed=0, schedule="luby", unit=64, factor=2, maxRestarts=None, stats=None,
+				 maxSeconds=None, cancel=None, **options):
+	stats = stats or SolveStats()
+	start = time.perf_counter()
+	restart = 0
+	while True:
+		run = SolveStats()
+		nodes = unit*(luby(restart) if schedule == "luby" else factor**restart)
+		remaining = None if maxSeconds is None else max(0, maxSeconds-(time.perf_counter()-start))
+		solutions = list(solveGen(wordList, iW, limit=1, stats=run, maxSeconds=remaining, maxNodes=nodes,
+								  cancel=cancel, seed=seed+restart, **options))
+		for name in ["nodes", "tried", "prunes", "backjumps", "skipped", "nogoodHits", "nogoodMisses", "cellWrites"]:
+			setattr(stats, name, getattr(stats, name)+getattr(run, name))
+		if run.filled > stats.filled:
+			stats.best, stats.filled = run.best, run.filled
+		stats.status = run.status
+		stats.seconds = time.perf_counter()-start
+		# Solved, or proven unsolvable, or out of time
+		if run.status != "nodes" or (maxRestarts is not None and restart == maxRestarts):
+			stats.solutions = len(solutions)
+			return solutions[0] if solutions else None
+		restart += 1
+		stats.restarts += 1
+
+# Number of solutions, without enumerating them (see Search.count): the solution lists are
+# never built, and memory stays bounded by nogoods however many solutions there are.
+# None if the budget (maxSeconds, maxNodes, cancel) runs out first.
+# wordClass list * infoWrapper * str * str option * int * str * SolveStats * float option * int option
+#	* CancelToken option * bool -> int option
+def countSolutions(wordList, iW=None, order="dynamic", consistency="ac3", nogoods=1 << 14, eviction="lru", stats=None,
+				   maxSeconds=None, maxNodes=None, cancel=None, distinct=True):
+	iW = iW or defaultInfoWrapper()
+	stats = stats or SolveStats()
+	start = time.perf_counter()
+	budget = makeBudget(maxSeconds, maxNodes, cancel)
+	try:
+		total = Search(wordList, iW._patternIndex, order, stats, consistency, False, nogoods, eviction, budget,
+					   distinct=distinct).count()
+		stats.status = "complete"
+		return total
+	except BudgetExceeded as exceeded:
+		stats.status = exceeded.reason
+		return None
+	finally:
+		stats.seconds = time.perf_counter()-start
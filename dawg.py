@@ -0,0 +1,130 @@
+"""
+DAWG:
+
+Minimized directed acyclic word graph (a trie in which identical subtrees, e.g. the
+common suffixes "ing", "tion", "ed", are stored only once). Built incrementally from
+the sorted word list (Daciuk et al.), so the full trie never exists in memory.
+
+DawgNode has the same [char] indexing, iteration and word flag as Node. Because
+nodes are shared between words, a node has no single parent: it has no
+whichWord()/depth, and callers must keep track of the path themselves (see dawgToList).
+"""
+
+class DawgNode:
+
+	__slots__ = ("_pointers", "word")
+
+	def __init__(self, word=False):
+		self.word = word 						# Bool (Yes or no)
+		self._pointers = [None]*26 			# Pointers to other child nodes
+
+	def __repr__(self):
+		return f"({self.word})"
+
+	def __iter__(self):
+		return iter(self._pointers)
+
+	# Returns None on failure
+	def __getitem__(self, i):
+		if isinstance(i, int):
+			return self._pointers[i]
+		elif isinstance(i, str):
+			return self._pointers[self._charToInt(i)]
+		else:
+			raise TypeError("Node indices must be int or char")
+
+	def __setitem__(self, i, value):
+		if isinstance(i, int):
+			self._pointers[i] = value
+		elif isinstance(i, str):
+			self._pointers[self._charToInt(i)] = value
+		else:
+			raise TypeError("Node indices must be int or char")
+
+	# Calculates an index from a corresponding char (e.g. 'a' = 0)
+	@staticmethod
+	def _charToInt(letter):
+		return ord(letter.lower())-97
+
+	# Two nodes are equivalent (can be merged) if they agree on word and point to the same
+	# (already minimized) children. Children are compared by identity.
+	def _signature(self):
+		return (self.word, tuple(map(id, self._pointers)))
+
+# (Helper for listToDawg)
+# Merge the unchecked nodes (deepest first) down to depth with equivalent registered nodes.
+# (DawgNode * int * DawgNode) list * (signature : DawgNode) dict * int -> None
+def _minimize(unchecked, register, depth):
+	while len(unchecked) > depth:
+		parent, i, child = unchecked.pop()
+		signature = child._signature()
+		if signature in register:
+			parent[i] = register[signature]
+		else:
+			register[signature] = child
+
+# Creates a minimized DAWG containing every word in a given word list. Returns its root.
+# str list -> DawgNode
+def listToDawg(wordList):
+	root = DawgNode()
+	register = {}
+	unchecked = [] 		# Path of the previous word which hasn't been minimized yet: (parent, index, child)
+	previous = ""
+	for word in sorted(set(map(str.lower, wordList))):
+		# Length of prefix shared with the previous word
+		common = 0
+		for a, b in zip(word, previous):
+			if a != b:
+				break
+			common += 1
+		# Everything below the shared prefix is final (input is sorted)
+		_minimize(unchecked, register, common)
+		node = unchecked[-1][2] if unchecked else root
+		for char in word[common:]:
+			child = DawgNode()
+			i = DawgNode._charToInt(char)
+			node[i] = child
+			unchecked.append((node, i, child))
+			node = child
+		node.word = True
+		previous = word
+	_minimize(unchecked, register, 0)
+	return root
+
+# Recursively converts a DAWG into a list of words.
+# DawgNode -> str list
+def dawgToList(root, prefix=""):
+	strings = []
+	if root.word:
+		strings.append(prefix)
+	for i, node in enumerate(root):
+		if node:
+			strings += dawgToList(node, prefix+chr(97+i))
+	return strings
+
+# Counts the number of distinct nodes in the DAWG (shared nodes are counted once)
+# DawgNode -> int
+def nodesInDawg(root):
+	seen = {id(root)}
+	stack = [root]
+	while stack:
+		for node in stack.pop():
+			if node and id(node) not in seen:
+				seen.add(id(node))
+				stack.append(node)
+	return len(seen)
+
+# Counts the number of distinct prefixes in a word list + 1 (for the root): the number of
+# nodes in the equivalent trie (= nodesInTrie(listToTrie(wordList))), without building it.
+# str list -> int
+def nodesBeforeMinimization(wordList):
+	prefixes = set()
+	for word in map(str.lower, wordList):
+		for x in range(1, len(word)+1):
+			prefixes.add(word[:x])
+	return len(prefixes)+1
+
+# Node count before minimization (the trie) and after (the DAWG)
+# str list * DawgNode -> int * int
+def dawgStats(wordList, root):
+	return (nodesBeforeMinimization(wordList), nodesInDawg(root))
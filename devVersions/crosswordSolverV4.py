@@ -0,0 +1,82 @@
+#---------------------------------------------------------------------------#
+
+# Let's the file see the files in the parent folder
+import sys
+sys.path.append('..')
+
+#---------------------------------------------------------------------------#
+
+from wordClass import *
+from readyWordClassList import readyWordList
+
+#---------------------------------------------------------------------------#
+
+# Set whether you want just 1 solution (1 = 1 solution, 0 = all solutions (could be thousands))
+oneSolution = 1
+
+#---------------------------------------------------------------------------#
+
+# wordList is the list of words remaining to be matched 
+# index is the PatternIndex of the word list (see patternIndex)
+# returns a list of solutions to the wordList 
+# if none exists, returns []
+def solveHelper(wordList, index):
+	
+	# Base case: Success. No more words to match
+	if not wordList:
+		return [[]]
+	
+	# Recursive case
+	else:
+		# Check whether solution is possible (every remaining word can still be completed)
+		for word in wordList:
+			if word.string() not in index:
+				return []
+		# Solution possible
+		word = wordList.pop() # currentWord. Next word to be filled in
+		solutions = match(word, wordList, index)
+		# Return wordlist to original state
+		wordList.append(word)
+		return solutions
+
+# word is the word to be matched against: class word
+# wordList is the remaining set of words to match 
+# index is the PatternIndex (to pass onwards)
+# Candidates come straight from the index: one AND per letter already set in word
+# Solution lists contain what the current word is 
+def match(word, wordList, index):
+	solutions = []
+	for candidate in index.candidates(word.string()):
+		# Modify word values appropriately
+		word.setChars([Constants.defaultEmptyChar]+list(candidate))
+		# Propagate changes to other connected nodes
+		word.propagate()
+		# Find solutions to remainder of wordList
+		newSolutions = solveHelper(wordList, index)
+		# Undo changes to downstream words
+		word.undoPropagate()
+		word.clear()
+		if newSolutions:
+			for x in newSolutions:
+				x.append(candidate)
+			solutions += newSolutions
+			if oneSolution:
+				break
+	return solutions
+
+#---------------------------------------------------------------------------#
+
+# Logic: 
+# 1) Set ranks and initialize modify and notModify characteristics
+# 2) Convert list to stack
+# 3) Pass wordstack and pattern index to solve 
+
+# solve4(wordList, iW) => list containing a list of all solution lists e.g. [["hi", "die"], ["hi", "bye"]]. Failure returns an empty list
+# iW = infoWrapper
+def solve4(wordList, iW):
+	readyWordList(wordList) # set ranks and such in situ
+	wordList.reverse() # convert to stack
+	solutions = solveHelper(wordList, iW._patternIndex) 
+	return solutions
+
+#---------------------------------------------------------------------------#
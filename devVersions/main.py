@@ -12,6 +12,7 @@ from wordClass import Word
 from crosswordSolverV1 import solve1
 from crosswordSolverV2 import solve2
 from crosswordSolverV3 import solve3
+from crosswordSolverV4 import solve4
 
 #---------------------------------------------------------------------------#
 
@@ -89,6 +90,11 @@ def correctnessTest():
 	solutions32 = solve3(wordList2, iW)
 	solutions33 = solve3(wordList3, iW)
 
+	print("Checkpoint 5")
+	solutions41 = solve4(wordList1, iW)
+	solutions42 = solve4(wordList2, iW)
+	solutions43 = solve4(wordList3, iW)
+
 	print()
 	
 	print("Solutions 11:", solutions11)
@@ -103,6 +109,10 @@ def correctnessTest():
 	print("Solutions 32:", solutions32)
 	print("Solutions 33:", solutions33)
 
+	print("Solutions 41:", solutions41)
+	print("Solutions 42:", solutions42)
+	print("Solutions 43:", solutions43)
+
 
 def main():
 	pass
@@ -9,7 +9,9 @@ from tkinter import *
 import string
 from constants import Constants
 from grid import populateWithIth, gridToWordClassList, wordClassListToGrid
-from crosswordSolver import solve
+from crosswordSolver import countSolutions, SolveStats, SolutionCursor
+from solverSession import SolverSession
+from devVersions.readyWordClassList import extractIds
 from time import sleep
 
 # FIXME
@@ -558,10 +560,9 @@ class BottomBar(Frame):
 	def _goto(self):
 		try:
 			i = int(self.gotoSolution.get())
-			if 1 <= i <= self.totalSolutions:
-				self.currentSolution = i-1
-				self._update_text()
-				self.master.goto(self.currentSolution)
+			# Total None: not counted yet
+			if 1 <= i and (self.totalSolutions is None or i <= self.totalSolutions):
+				self.master.goto(i-1)
 		except:
 			pass
 
@@ -571,7 +572,8 @@ class BottomBar(Frame):
 			p = '_'
 			self.text.set(f"Solution 	{p:6} / {p:6}")
 		else:
-			self.text.set(f"Solution 	{self.currentSolution+1:6}	/ {self.totalSolutions:6}")
+			total = '?' if self.totalSolutions is None else self.totalSolutions
+			self.text.set(f"Solution 	{self.currentSolution+1:6}	/ {total:6}")
 
 	def _init_appearance(self):
 
@@ -584,6 +586,7 @@ class BottomBar(Frame):
 	# Called by outside functions. If provided with an argument
 	# then set new totalSolutions + currentSolution = 1, otherwise 
 	# default to 0 + interpret as grid having been cleared. 
+	# newTotal None: there are solutions, not counted yet
 	def reset(self, newTotal=0):
 		# No solutions
 		if newTotal == 0:
@@ -607,15 +610,17 @@ class BottomBar(Frame):
 			self.label['state'] = 'normal'
 
 	def prev(self):
-		self.currentSolution = (self.currentSolution-1)%self.totalSolutions
-		self._update_text()
 		self.master.prev()
 
 	def next(self):
-		self.currentSolution = (self.currentSolution+1)%self.totalSolutions
-		self._update_text()
 		self.master.next()
 
+	# Called by the application once it has drawn a solution (total None: not counted yet)
+	def setPosition(self, current, total):
+		self.currentSolution = current
+		self.totalSolutions = total
+		self._update_text()
+
 	def get(self):
 		return self.currentSolution
 
@@ -627,8 +632,13 @@ class Application(Tk):
 
 		# Variable to indicate whether a solve is in progress
 		self.solving = False
-		self.solutions = ([], []) 	# (listOfWordIds, list of solutions)
+		self.wordList = [] 			# Words of the grid solved
+		self.wordIds = [] 			# listOfWordIds
+		self.total = 0 				# Number of solutions (None: not counted yet)
 		self.index = 0 				# Solutions currently drawn
+		self.session = None 		# Words and last fill of the previous solve (kept by clear)
+		self.drawn = None 			# Board as last drawn with a solution (None: not since clear)
+		self.cursor = None 			# SolutionCursor over the solutions drawn by prev/next/goto
 
 		# Set screen size + title + make adjustable
 		self.geometry(f"{self.winfo_screenwidth()}x{self.winfo_screenheight()}")
@@ -683,49 +693,104 @@ class Application(Tk):
 
 	# Called by mainarea.solve
 	def solve(self):
+		# Only the letters the user gave: those of the solution drawn last aren't constraints
 		currentBoard = self.mainarea.getRepresentation()
+		if self.session is not None:
+			currentBoard = self.session.given(currentBoard, self.drawn)
 		self.mainarea.setNumbers()
 		self.mainarea.drawNumbers()
 		self.mainarea.disable()
 		self.update()
 		printGrid(currentBoard)
-		self.solutions = solve(gridToWordClassList(currentBoard))
-		self.bottombar.reset(len(self.solutions[1]))
-		newBoard = wordClassListToGrid(currentBoard, self.solutions[1][0], self.solutions[0])
-		self.mainarea.redraw(newBoard)
+		# Repair the previous fill if only letters changed since the last solve: it is
+		# solution 0, and the only search an edit costs. The others are searched for when
+		# paged to, and counted when the total is needed (see _count).
+		if self.session is None:
+			self.session = SolverSession(currentBoard, maxSeconds=Constants.maxSolveSeconds)
+		fill = self.session.update(currentBoard)
+		self.wordList = self.session.wordList
+		self.wordIds = extractIds(self.wordList)
+		self.index = 0
+		self._resetCursor(fill)
+		if fill is None:
+			stats = self.session.stats
+			if stats.status != "complete":
+				print(f"Solve stopped ({stats.status}) after {stats.nodes} nodes, {stats.seconds:.1f}s")
+			self.total = 0
+			self.bottombar.reset(0)
+			return
+		self.total = None
+		self.bottombar.reset(None)
+		self._draw()
 
 	# Called by mainarea.clear
 	def clear(self):
 		self.mainarea.clear()
 		self.bottombar.reset()
-		self.solutions = []
+		self.wordList, self.wordIds, self.total = [], [], 0
+		self.drawn = None
+		self._resetCursor()
 
 	######################################################################
 	# Functions with which to display solutions
 	######################################################################
+
+	# Draw board (a solution filled in), remembering it to tell the user's letters from it
+	def _redraw(self, board):
+		self.mainarea.redraw(board)
+		self.drawn = self.mainarea.getRepresentation()
+
+	# Start paging through the solutions of the words solved (closing the previous search),
+	# from first (the fill already found, if any)
+	def _resetCursor(self, first=None):
+		if self.cursor is not None:
+			self.cursor.close()
+		self.cursor = SolutionCursor(self.wordList, maxSeconds=Constants.maxSolveSeconds, first=first)
+
+	# Number of solutions, counted the first time it is needed. None if that runs out of time.
+	def _count(self):
+		if self.total is None:
+			stats = SolveStats()
+			self.total = countSolutions(self.wordList, stats=stats, maxSeconds=Constants.maxSolveSeconds)
+			if self.total is None:
+				print(f"Count stopped ({stats.status}) after {stats.nodes} nodes, {stats.seconds:.1f}s")
+		return self.total
+
+	# Draw solution number index, and make it the session's fill (what a later solve
+	# repairs). Returns whether it was found.
+	def _draw(self, index=0):
+		solution = self.cursor.get(index)
+		if solution is None:
+			stats = self.cursor.stats
+			print(f"Solution {index+1} not found ({stats.status}) after {stats.nodes} nodes, {stats.seconds:.1f}s")
+			return False
+		currentBoard = self.mainarea.getRepresentation()
+		newBoard = wordClassListToGrid(currentBoard, solution, self.wordIds)
+		self._redraw(newBoard)
+		self.session.fill = list(solution)
+		self.index = index
+		self.bottombar.setPosition(self.index, self.total)
+		return True
 	
 	# Called by bottombar.prev
 	def prev(self):
-		currentBoard = self.mainarea.getRepresentation()
-		self.index -= 1
-		self.index %= len(self.solutions[1])
-		newBoard = wordClassListToGrid(currentBoard, self.solutions[1][self.index], self.solutions[0])
-		self.mainarea.redraw(newBoard)
+		if self.index > 0:
+			self._draw(self.index-1)
+		elif self._count():
+			self._draw(self.total-1)
 	
-	# Called by bottombar.next
+	# Called by bottombar.next (after the last solution: back to the first)
 	def next(self):
-		currentBoard = self.mainarea.getRepresentation()
-		self.index += 1
-		self.index %= len(self.solutions[1])
-		newBoard = wordClassListToGrid(currentBoard, self.solutions[1][self.index], self.solutions[0])
-		self.mainarea.redraw(newBoard)
+		if self.total is not None and self.index+1 >= self.total:
+			self._draw(0)
+		elif not self._draw(self.index+1) and self.cursor.stats.status == "complete":
+			# Went past the last one: now they are counted
+			self.total = self.index+1
+			self._draw(0)
 
 	# Called by bottombar.goto
 	def goto(self, index):
-		currentBoard = self.mainarea.getRepresentation()
-		self.index = index
-		newBoard = wordClassListToGrid(currentBoard, self.solutions[1][self.index], self.solutions[0])
-		self.mainarea.redraw(newBoard)
+		self._draw(index)
 
 app = Application()
 
@@ -4,6 +4,8 @@ Helpers:
 Random functions that don't really fit in anywhere else. 
 """
 
+from collections import OrderedDict
+
 # Not used
 # Returns a list of the number of words of each length
 # str list -> (int : int) dict
@@ -25,3 +27,217 @@ def fileToWordList(fileRoute):
 	words = map(lambda x: x.lower(), words)
 	words = list(set(words))
 	return words
+
+# Accepts a fileName/filePath of a word list whose lines may give a score after the word
+# (e.g. "crossword 42.5") and returns the scores given. Words without one are left out
+# (see Constants.defaultWordScore); a word given twice keeps its highest score.
+# ENSURES: words are cleaned as in fileToWordList (all lowercase)
+# str -> (str : float) dict
+def fileToWordScores(fileRoute):
+	scores = {}
+	fp = open(fileRoute)
+	for line in fp:
+		fields = line.split()
+		if len(fields) < 2 or not fields[0].isalpha():
+			continue
+		try:
+			score = float(fields[1])
+		except ValueError:
+			continue
+		word = fields[0].lower()
+		scores[word] = max(score, scores.get(word, score))
+	fp.close()
+	return scores
+
+
+# Bitsets: Python ints used as sets of small non negative ints (bit i set <=> i in set)
+
+# Number of elements in a bitset (int.bit_count where there is one, Python 3.10+)
+# int -> int
+if hasattr(int, "bit_count"):
+	def popCount(bits):
+		return bits.bit_count()
+else:
+	def popCount(bits):
+		return bin(bits).count("1")
+
+# Elements of a bitset, ascending
+# int -> int iterator
+def bitsToIds(bits):
+	while bits:
+		low = bits & -bits
+		yield low.bit_length()-1
+		bits ^= low
+
+# Bitset containing the given ids. Built through a byte buffer: much faster than
+# or-ing in one bit at a time on large sets.
+# int iterable -> int
+def idsToBits(ids):
+	buffer = bytearray()
+	for i in ids:
+		byte = i >> 3
+		if byte >= len(buffer):
+			buffer.extend(bytes(byte+1-len(buffer)))
+		buffer[byte] |= 1 << (i & 7)
+	return int.from_bytes(buffer, "little")
+
+# Term i (from 0) of the Luby sequence: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+# int -> int
+def luby(i):
+	i += 1
+	while True:
+		k = i.bit_length()
+		if i == (1 << k)-1:
+			return 1 << (k-1)
+		i -= (1 << (k-1))-1
+
+
+# Bounded mapping which evicts the least recently used entry once full.
+# Counts hits and misses of get.
+class LRUCache:
+
+	def __init__(self, maxSize=4096):
+		self.maxSize = maxSize
+		self._entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __contains__(self, key):
+		return key in self._entries
+
+	# Returns default (and counts a miss) if key isn't cached
+	def get(self, key, default=None):
+		entries = self._entries
+		if key in entries:
+			entries.move_to_end(key)
+			self.hits += 1
+			return entries[key]
+		self.misses += 1
+		return default
+
+	def put(self, key, value):
+		entries = self._entries
+		entries[key] = value
+		entries.move_to_end(key)
+		if len(entries) > self.maxSize:
+			entries.popitem(last=False)
+			self.evictions += 1
+
+	def clear(self):
+		self._entries.clear()
+
+	# (hits, misses, evictions)
+	def stats(self):
+		return (self.hits, self.misses, self.evictions)
+
+# Same as LRUCache, but evicts the oldest entry (reading an entry doesn't refresh it)
+class FIFOCache(LRUCache):
+
+	def get(self, key, default=None):
+		entries = self._entries
+		if key in entries:
+			self.hits += 1
+			return entries[key]
+		self.misses += 1
+		return default
+
+
+# Re-iterable view of an iterator: items are pulled from it only when first needed, and
+# kept for the next passes
+class LazyList:
+
+	def __init__(self, iterable):
+		self._iterator = iter(iterable)
+		self._items = []
+		self._done = False
+
+	def __iter__(self):
+		items = self._items
+		i = 0
+		while True:
+			if i < len(items):
+				yield items[i]
+				i += 1
+			elif self._done:
+				return
+			else:
+				try:
+					items.append(next(self._iterator))
+				except StopIteration:
+					self._done = True
+
+	# Whether there is at least one item (pulls at most one)
+	def __bool__(self):
+		for item in self:
+			return True
+		return False
+
+# Re-iterable view of the iterators a factory makes: like LazyList, items are pulled only
+# when first needed and kept for the next passes, but only up to limit of them. Once there
+# are more, none are kept: the pass which found out finishes on the same iterator, and
+# every later pass starts over with a new one from factory, so memory stays bounded.
+# Made for one pass at a time.
+class ReplayList:
+
+	# factory : -> iterator, limit : int
+	def __init__(self, factory, limit):
+		self._factory = factory
+		self._limit = limit
+		self._iterator = None 	# Iterator the kept items come from
+		self._items = [] 		# Items kept, None once there were more than limit
+		self._done = False
+
+	def __iter__(self):
+		items = self._items
+		if items is None:
+			iterator = self._factory()
+			try:
+				yield from iterator
+			finally:
+				if hasattr(iterator, "close"):
+					iterator.close()
+			return
+		if self._iterator is None:
+			self._iterator = self._factory()
+		i = 0
+		while True:
+			if i < len(items):
+				yield items[i]
+				i += 1
+			elif self._done:
+				return
+			else:
+				try:
+					item = next(self._iterator)
+				except StopIteration:
+					self._done = True
+					continue
+				if len(items) < self._limit:
+					items.append(item)
+					continue
+				# One too many: stop keeping them
+				self._items = None
+				iterator, self._iterator = self._iterator, None
+				try:
+					yield item
+					yield from iterator
+				finally:
+					if hasattr(iterator, "close"):
+						iterator.close()
+				return
+
+	# Whether there is at least one item (pulls at most one)
+	def __bool__(self):
+		for item in self:
+			return True
+		return False
+
+	# Stop the iterator the items are kept from, if any
+	def close(self):
+		if self._iterator is not None and hasattr(self._iterator, "close"):
+			self._iterator.close()
+		self._iterator = None
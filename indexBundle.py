@@ -0,0 +1,290 @@
+"""
+Index bundle:
+
+Compiles everything the solver needs from a word list (per-length word arrays,
+per-length compact tries, word scores) into one versioned binary file, and loads it
+back with mmap. Loading creates no per-word Python objects: the tries and word arrays
+are memoryviews onto the mapped file, so a cold start costs milliseconds. Pattern
+statistics (avDict) aren't stored: they are estimated from the words when first used
+(see preprocessWordList.estimateAvDict).
+
+The bundle records a SHA-256 of the word list file it was compiled from.
+loadInfoWrapper recompiles automatically when the word list has changed (or the
+bundle is missing, or was written by another version).
+
+File layout:
+- magic (8 bytes), version (uint32), header size (uint32)
+- header: JSON (source hash, byte order, word counts, table of sections)
+- sections: raw array data, each aligned to 8 bytes. Per word length: the words, the
+  compact trie's arrays, and (if the word list gives any) the word scores, as doubles
+  indexed by word id (NaN for words without one)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from math import nan
+import sys
+import tempfile
+from bisect import bisect_right
+from helpers import fileToWordList, fileToWordScores
+from compactTrie import CompactTrie, BUFFERS
+from patternIndex import PatternIndex
+from patternCounter import PatternCounter
+from preprocessWordList import infoWrapper
+
+#---------------------------------------------------------------------------#
+
+MAGIC = b"XWORDIDX"
+VERSION = 4
+# magic * version * header size
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 8
+
+#---------------------------------------------------------------------------#
+
+# Hex SHA-256 of a file's contents
+# str -> str
+def fileHash(fileRoute):
+	digest = hashlib.sha256()
+	with open(fileRoute, "rb") as fp:
+		for block in iter(lambda: fp.read(1 << 16), b""):
+			digest.update(block)
+	return digest.hexdigest()
+
+# Default bundle location for a word list: next to it, with an .idx extension
+# str -> str
+def bundleNameFor(dictName):
+	return os.path.splitext(dictName)[0]+".idx"
+
+#---------------------------------------------------------------------------#
+
+# Write the bundle for a word list file. Returns the bundle's file name.
+# str * str -> str
+def compileBundle(dictName, bundleName=None):
+	bundleName = bundleName or bundleNameFor(dictName)
+	wordList = sorted(fileToWordList(dictName), key=lambda w: (len(w), w))
+	scores = fileToWordScores(dictName)
+	# Section name -> bytes
+	sections = {}
+	counts = {}
+	for length in sorted(set(map(len, wordList))):
+		words = [w for w in wordList if len(w) == length]
+		counts[length] = len(words)
+		sections[f"words.{length}"] = "".join(words).encode("ascii")
+		# Inserted in block order, so word id == position in the word block
+		trie = CompactTrie(words)
+		for name, buffer in trie.buffers().items():
+			data = buffer if isinstance(buffer, (bytes, bytearray)) else buffer.tobytes()
+			sections[f"trie.{length}.{name}"] = data
+		if any(w in scores for w in words):
+			sections[f"scores.{length}"] = array("d", [scores.get(w, nan) for w in words]).tobytes()
+	# Lay out sections
+	table = {}
+	offset = 0
+	for name, data in sections.items():
+		table[name] = [offset, len(data)]
+		offset += len(data)+(-len(data))%_ALIGN
+	header = {
+		"source": fileHash(dictName),
+		"byteorder": sys.byteorder,
+		"counts": {str(k) : v for k, v in counts.items()},
+		"sections": table,
+	}
+	headerBytes = json.dumps(header).encode("utf-8")
+	headerBytes += b" "*((-(len(headerBytes)+_PREAMBLE.size))%_ALIGN)
+	# Write to a temporary file of our own first, so readers never see a half written
+	# bundle and processes compiling the same bundle don't write over each other's
+	fd, tempName = tempfile.mkstemp(dir=os.path.dirname(bundleName) or ".", suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as fp:
+			fp.write(_PREAMBLE.pack(MAGIC, VERSION, len(headerBytes)))
+			fp.write(headerBytes)
+			for name, data in sections.items():
+				fp.write(data)
+				fp.write(b"\0"*((-len(data))%_ALIGN))
+		os.replace(tempName, bundleName)
+	except BaseException:
+		if os.path.exists(tempName):
+			os.remove(tempName)
+		raise
+	return bundleName
+
+#---------------------------------------------------------------------------#
+
+# Fixed width words stored back to back (one block per word length). Behaves like a
+# read only list of str; words are decoded on access.
+class WordBlock:
+
+	def __init__(self, buffer, width):
+		self._buffer = buffer
+		self._width = width
+
+	def __len__(self):
+		return len(self._buffer)//self._width
+
+	def __getitem__(self, i):
+		if i < 0:
+			i += len(self)
+		if not 0 <= i < len(self):
+			raise IndexError("word index out of range")
+		width = self._width
+		return str(self._buffer[i*width:(i+1)*width], "ascii")
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+# Several WordBlocks seen as one list (e.g. every word, sorted by length)
+class WordBlocks:
+
+	def __init__(self, blocks):
+		self._blocks = blocks
+		self._starts = []
+		total = 0
+		for block in blocks:
+			self._starts.append(total)
+			total += len(block)
+		self._length = total
+
+	def __len__(self):
+		return self._length
+
+	def __getitem__(self, i):
+		if i < 0:
+			i += self._length
+		if not 0 <= i < self._length:
+			raise IndexError("word index out of range")
+		b = bisect_right(self._starts, i)-1
+		return self._blocks[b][i-self._starts[b]]
+
+	def __iter__(self):
+		for block in self._blocks:
+			yield from block
+
+#---------------------------------------------------------------------------#
+
+# A memory mapped bundle
+class IndexBundle:
+
+	# Raises ValueError (or struct.error) if the file isn't a readable bundle, having
+	# closed whatever it had opened
+	def __init__(self, bundleName):
+		self._file = open(bundleName, "rb")
+		try:
+			# Empty files can't be mapped (ValueError)
+			self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+			magic, version, headerSize = _PREAMBLE.unpack_from(self._map, 0)
+			if magic != MAGIC:
+				raise ValueError(f"{bundleName} is not an index bundle")
+			self.version = version
+			start = _PREAMBLE.size
+			# Bad JSON or text raises ValueError
+			self._header = json.loads(bytes(self._map[start:start+headerSize]))
+			self._dataStart = start+headerSize
+			self._memory = memoryview(self._map)
+		except BaseException:
+			self.close()
+			raise
+
+	# Safe to call on a partly opened bundle, and more than once
+	def close(self):
+		if hasattr(self, "_memory"):
+			self._memory.release()
+		if hasattr(self, "_map"):
+			self._map.close()
+		self._file.close()
+
+	# Hash of the word list the bundle was compiled from
+	def source(self):
+		return self._header["source"]
+
+	# Whether the bundle can be used as is for a word list file with the given hash
+	# str -> bool
+	def current(self, sourceHash):
+		return (self.version == VERSION and self._header["byteorder"] == sys.byteorder
+				and self.source() == sourceHash)
+
+	# Raw bytes of a section (memoryview, no copy)
+	# str -> memoryview
+	def section(self, name):
+		offset, size = self._header["sections"][name]
+		start = self._dataStart+offset
+		return self._memory[start:start+size]
+
+	# Word lengths present, ascending
+	# -> int list
+	def lengths(self):
+		return sorted(map(int, self._header["counts"]))
+
+	# int -> WordBlock
+	def words(self, length):
+		return WordBlock(self.section(f"words.{length}"), length)
+
+	# Compact trie of the words of one length
+	# int -> CompactTrie
+	def trie(self, length):
+		buffers = {}
+		for name in BUFFERS:
+			view = self.section(f"trie.{length}.{name}")
+			if name not in ("letters", "terminal"):
+				view = view.cast("i")
+			buffers[name] = view
+		return CompactTrie.fromBuffers(buffers, self._header["counts"][str(length)])
+
+	# Scores the word list gives the words of one length, by word id (NaN for words
+	# without one), None if it gives none of them (see preprocessWordList.scoresById)
+	# int -> float sequence option
+	def scores(self, length):
+		if f"scores.{length}" not in self._header["sections"]:
+			return None
+		return self.section(f"scores.{length}").cast("d")
+
+#---------------------------------------------------------------------------#
+
+# Build an infoWrapper on top of a bundle (nothing is copied out of the mapped file)
+# IndexBundle -> infoWrapper
+def bundleToInfoWrapper(bundle):
+	iW = infoWrapper.__new__(infoWrapper)
+	lengths = bundle.lengths()
+	iW._bundle = bundle
+	iW._wordList = WordBlocks([bundle.words(l) for l in lengths])
+	iW._tries = [None]*(max(lengths, default=0)+1)
+	for l in lengths:
+		iW._tries[l] = bundle.trie(l).root()
+	iW._patternIndex = PatternIndex.fromLengths({l : bundle.words(l) for l in lengths})
+	iW._patternDict = PatternCounter(iW._patternIndex)
+	iW._scores = {}
+	for l in lengths:
+		scores = bundle.scores(l)
+		if scores is not None:
+			iW._scores[l] = scores
+	return iW
+
+# Open the bundle for a word list, compiling it first if it is missing or stale.
+# Filename -> infoWrapper
+def loadInfoWrapper(dictName, bundleName=None):
+	bundleName = bundleName or bundleNameFor(dictName)
+	sourceHash = fileHash(dictName)
+	if os.path.exists(bundleName):
+		try:
+			bundle = IndexBundle(bundleName)
+		except (ValueError, struct.error):
+			bundle = None
+		if bundle and bundle.current(sourceHash):
+			return bundleToInfoWrapper(bundle)
+		if bundle:
+			bundle.close()
+	compileBundle(dictName, bundleName)
+	return bundleToInfoWrapper(IndexBundle(bundleName))
+
+#---------------------------------------------------------------------------#
+
+# Compile the bundles of the word lists given on the command line
+# python3 indexBundle.py wordLists/dict5k.txt ...
+if __name__ == "__main__":
+	for dictName in sys.argv[1:]:
+		print(compileBundle(dictName))
@@ -0,0 +1,170 @@
+"""
+Matrix index:
+
+Optional numpy engine behind the PatternIndex interface. Each length's words are one
+uint8 matrix (a row per word, a column per position), so matching a pattern is a single
+vectorized comparison of the columns of its fixed positions, instead of a trie walk or a
+chain of bitset ANDs in Python. The (position, letter) masks propagation revises domains
+with (masks, and the crossing tables built from them) are packed from comparisons of
+the matrix's columns too, so the bitset tables of PatternIndex are never built. The
+letters still possible on each square of a pattern come from a bincount of the matching
+rows (letterSets): the crossing tables pair the letters two squares' sets share.
+
+Needs numpy: MatrixIndex raises ImportError without it (AVAILABLE says whether it is
+installed). Ids, candidate order and results are the same as PatternIndex's, so the
+solver can use either.
+
+iW = matrixInfoWrapper(createInfoWrapper(dictName)) => infoWrapper whose pattern index is a MatrixIndex
+index.letterSets("c-t") => allowed letters per position, e.g. ["c", "aou", "t"]
+
+Per-length matrices are built on first use.
+"""
+
+import copy
+from patternIndex import PatternIndex, ALPHABET, blank
+from patternCounter import PatternCounter
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+# Whether numpy is installed (MatrixIndex can be used)
+AVAILABLE = np is not None
+
+#---------------------------------------------------------------------------#
+
+class MatrixIndex(PatternIndex):
+
+	# wordList : str list
+	def __init__(self, wordList=()):
+		if np is None:
+			raise ImportError("MatrixIndex needs numpy")
+		PatternIndex.__init__(self, wordList)
+		self._matrices = {} 	# length -> uint8 matrix (a row per word, in id order)
+		self._masks = {} 		# length -> masks[pos][letter] = bitset (see masks)
+
+	# Build (or fetch) the matrix of one word length. None if there are no such words.
+	# int -> numpy array option
+	def _matrix(self, length):
+		matrix = self._matrices.get(length)
+		if matrix is None and length in self._words:
+			words = self._words[length]
+			letters = "".join(words).encode("latin-1")
+			matrix = self._matrices[length] = np.frombuffer(letters, dtype=np.uint8).reshape(len(words), length)
+		return matrix
+
+	# Rows of the words matching a pattern (boolean array), None if there are no words of
+	# its length
+	# str -> numpy array option
+	def _rows(self, pattern):
+		matrix = self._matrix(len(pattern))
+		if matrix is None:
+			return None
+		positions, letters = [], []
+		for pos, char in enumerate(pattern):
+			if blank(char):
+				continue
+			if not 0 <= ord(char)-97 < ALPHABET:
+				return np.zeros(len(matrix), dtype=bool)
+			positions.append(pos)
+			letters.append(ord(char))
+		if not positions:
+			return np.ones(len(matrix), dtype=bool)
+		return (matrix[:, positions] == np.array(letters, dtype=np.uint8)).all(axis=1)
+
+	# Bitset of the rows set in a boolean array
+	# numpy array -> int
+	@staticmethod
+	def _bits(rows):
+		return int.from_bytes(np.packbits(rows, bitorder="little").tobytes(), "little")
+
+	# Bitset of the words with a given letter at a given position (0 indexed)
+	# int * int * str -> int
+	def mask(self, length, pos, char):
+		masks = self.masks(length)
+		if masks is None or not 0 <= ord(char)-97 < ALPHABET:
+			return 0
+		return masks[pos][ord(char)-97]
+
+	# Bitsets of the words of a length by position and letter (see PatternIndex.masks),
+	# packed from the matrix's columns
+	# int -> int list list option
+	def masks(self, length):
+		masks = self._masks.get(length)
+		if masks is None:
+			matrix = self._matrix(length)
+			if matrix is None:
+				return None
+			masks = self._masks[length] = [[self._bits(matrix[:, pos] == 97+letter) for letter in range(ALPHABET)]
+										   for pos in range(length)]
+		return masks
+
+	# Letter support table of a square shared by words of two lengths (see
+	# PatternIndex.crossingTable): the letters both sides can have there are those of
+	# their letterSets, and each is paired with its masks
+	# int * int * int * int -> (int * int) tuple
+	def crossingTable(self, length, pos, otherLength, otherPos):
+		key = (length, pos, otherLength, otherPos)
+		table = self._crossings.get(key)
+		if table is None:
+			letters = set(self.letterSets("-"*length)[pos]) & set(self.letterSets("-"*otherLength)[otherPos])
+			table = self._crossings[key] = tuple((self.masks(otherLength)[otherPos][ord(char)-97], self.masks(length)[pos][ord(char)-97])
+												 for char in sorted(letters))
+		return table
+
+	# Bitset of every word of a length
+	# int -> int
+	def allIds(self, length):
+		return (1 << len(self._words[length]))-1 if length in self._words else 0
+
+	# Bitset of the ids of the words matching a pattern
+	# str -> int
+	def candidateIds(self, pattern):
+		rows = self._rows(pattern)
+		return 0 if rows is None else self._bits(rows)
+
+	# Words matching a pattern, in id order
+	# str -> str list
+	def candidates(self, pattern):
+		rows = self._rows(pattern)
+		if rows is None:
+			return []
+		words = self._words[len(pattern)]
+		return [words[i] for i in np.flatnonzero(rows).tolist()]
+
+	# Number of words matching a pattern
+	# str -> int
+	def count(self, pattern):
+		rows = self._rows(pattern)
+		return 0 if rows is None else int(np.count_nonzero(rows))
+
+	def __contains__(self, pattern):
+		rows = self._rows(pattern)
+		return rows is not None and bool(rows.any())
+
+	# Letters the words matching a pattern have at each position (a letter given by the
+	# pattern is the only one at its position, if anything matches)
+	# str -> str list
+	def letterSets(self, pattern):
+		rows = self._rows(pattern)
+		if rows is None:
+			return [""]*len(pattern)
+		matching = self._matrix(len(pattern))[rows]
+		sets = []
+		for pos in range(len(pattern)):
+			counts = np.bincount(matching[:, pos], minlength=97+ALPHABET)[97:97+ALPHABET]
+			sets.append("".join(chr(97+i) for i in np.flatnonzero(counts).tolist()))
+		return sets
+
+#---------------------------------------------------------------------------#
+
+# Copy of iW (an infoWrapper, built from a word list or an index bundle) whose pattern
+# index and pattern counts use a MatrixIndex over the same words
+# infoWrapper -> infoWrapper
+def matrixInfoWrapper(iW):
+	index = iW._patternIndex
+	matrixIW = copy.copy(iW)
+	matrixIW._patternIndex = MatrixIndex.fromLengths({length : index.words(length) for length in index.lengths()})
+	matrixIW._patternDict = PatternCounter(matrixIW._patternIndex)
+	return matrixIW
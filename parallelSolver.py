@@ -0,0 +1,131 @@
+"""
+Parallel solver:
+
+Solves a grid on several cores. The search is split at its first one or two words:
+every way of filling them (after propagation) is an independent subtree, and the
+subtrees are fanned out to a multiprocessing pool. Each worker loads the dictionary's
+index bundle once (see indexBundle) and solves the subtrees it is sent with solveGen.
+
+Solutions are streamed back while the subtrees are searched, in batches of a few through
+a bounded queue: a worker whose batches aren't being taken waits, so neither the workers
+nor the caller ever hold more than a few batches, however many solutions a subtree has.
+They come in no particular order. Once limit solutions have arrived (e.g. limit=1: first
+solution mode), the other workers are stopped.
+
+parallelSolveGen(grid, dictName, processes, depth, limit, order, consistency, stats, distinct, batch) => generator of solutions
+parallelSolve(grid, dictName, processes, depth, limit, order, consistency, distinct) => list of solutions
+
+A solution is a str list in the same order as gridToWordClassList(grid).
+"""
+
+import multiprocessing
+import queue
+import crosswordSolver
+from grid import gridToWordClassList
+from indexBundle import loadInfoWrapper
+from crosswordSolver import Search, SolveStats, place, solveGen
+
+#---------------------------------------------------------------------------#
+
+# Worker state, set up once per process by _initWorker
+_iW = None
+_grid = None
+_options = None
+_results = None 	# Queue the solutions are sent back through
+_batch = None
+
+def _initWorker(dictName, grid, options, results, batch):
+	global _iW, _grid, _options, _results, _batch
+	_iW = loadInfoWrapper(dictName)
+	_grid = grid
+	_options = options
+	_results = results
+	_batch = batch
+
+# Solve the subtree in which the words of prefix are filled in, sending its solutions
+# back as ("solutions", str list list) batches of up to _batch, then ("done", nodes explored)
+# (int * str) list * int option -> None
+def _solveSubtree(prefix, limit):
+	wordList = gridToWordClassList(_grid)
+	for i, word in prefix:
+		place(wordList[i], word)
+	stats = SolveStats()
+	batch = []
+	for solution in solveGen(wordList, _iW, limit=limit, stats=stats, **_options):
+		batch.append(solution)
+		if len(batch) == _batch:
+			_results.put(("solutions", batch))
+			batch = []
+	if batch:
+		_results.put(("solutions", batch))
+	_results.put(("done", stats.nodes))
+
+# (Pool.imap_unordered passes a single argument)
+def _solveTask(task):
+	return _solveSubtree(*task)
+
+#---------------------------------------------------------------------------#
+
+# Subtrees of the search of grid: the partial fills of its first depth words
+# char list list * infoWrapper * int * (str : any) dict -> (int * str) list list
+def splitSearch(grid, iW, depth=1, options={}):
+	search = Search(gridToWordClassList(grid), iW._patternIndex, options.get("order", "dynamic"),
+					consistency=options.get("consistency", "ac3"), distinct=options.get("distinct", True))
+	return list(search.prefixes(depth))
+
+# Logic:
+# 1) Split the search into the subtrees below its first depth words (in this process)
+# 2) Solve the subtrees in a pool of processes (each stops after limit solutions), which
+#    send their solutions back in batches through a bounded queue
+# 3) Generate solutions as batches arrive, until every subtree is done, stopping the pool
+#    after limit of them
+
+# processes: pool size (None: one per core), depth: 1 or 2 words placed before splitting
+# (more subtrees balance better between workers), stats: SolveStats to fill in,
+# distinct: no word used twice (see crosswordSolver.Search), batch: solutions sent back
+# at a time
+# char list list * str * int option * int * int option * str * str option * SolveStats * bool * int -> str list generator
+def parallelSolveGen(grid, dictName=None, processes=None, depth=1, limit=None, order="dynamic", consistency="ac3", stats=None,
+					 distinct=True, batch=64):
+	dictName = dictName or crosswordSolver.dictName
+	stats = stats or SolveStats()
+	options = {"order" : order, "consistency" : consistency, "distinct" : distinct}
+	# Compiles the bundle if needed, before the workers all try to
+	iW = loadInfoWrapper(dictName)
+	tasks = [(prefix, limit) for prefix in splitSearch(grid, iW, depth, options)]
+	if not tasks or limit == 0:
+		return
+	processes = processes or multiprocessing.cpu_count()
+	results = multiprocessing.Queue(2*processes)
+	pool = multiprocessing.Pool(processes, _initWorker, (dictName, grid, options, results, batch))
+	found = done = 0
+	try:
+		running = pool.map_async(_solveTask, tasks)
+		while done < len(tasks):
+			try:
+				kind, value = results.get(timeout=0.1)
+			except queue.Empty:
+				# A worker failed: raise its error here
+				if running.ready() and not running.successful():
+					running.get()
+				continue
+			if kind == "done":
+				done += 1
+				stats.nodes += value
+				continue
+			for solution in value:
+				found += 1
+				stats.solutions += 1
+				yield solution
+				if found == limit:
+					return
+	finally:
+		# Also stops the workers still searching (or waiting to send) when the caller has enough
+		pool.terminate()
+		pool.join()
+		results.close()
+		results.cancel_join_thread()
+
+# grid * str * int option * int * int option * str * str option * bool -> str list list
+def parallelSolve(grid, dictName=None, processes=None, depth=1, limit=None, order="dynamic", consistency="ac3", distinct=True):
+	return list(parallelSolveGen(grid, dictName, processes, depth, limit, order, consistency, distinct=distinct))
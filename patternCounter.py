@@ -0,0 +1,88 @@
+"""
+Pattern counter:
+
+Lazy replacement for the exhaustive patternDict (preprocessWordList.listToPatternDict1/2),
+which expands every word into all 2^len of its patterns (32,768 strings for a
+15 letter word). Counts are computed on demand from a PatternIndex and the hot ones
+are kept in a bounded LRU cache.
+
+Behaves like the patternDict it replaces:
+- pattern in counter / counter[pattern] (KeyError if nothing matches)
+- counter.items() lists every (pattern, count) lazily, so patternDictTofreqDict
+  still works without the whole table ever existing in memory
+
+Blanks may be written as "-" (patternDict style) or Constants.defaultEmptyChar
+(Word.string() style).
+"""
+
+from constants import Constants
+from helpers import LRUCache
+
+class PatternCounter:
+
+	# index : PatternIndex, cacheSize : max number of patterns whose counts are kept
+	def __init__(self, index, cacheSize=1 << 16):
+		self._index = index
+		self._cache = LRUCache(cacheSize)
+
+	# Canonical form of a pattern (cache key): blanks written as Constants.defaultPatternChar
+	# str -> str
+	@staticmethod
+	def _key(pattern):
+		return pattern.replace(Constants.defaultEmptyChar, Constants.defaultPatternChar)
+
+	# Number of words matching a pattern (0 if none)
+	# str -> int
+	def count(self, pattern):
+		key = self._key(pattern)
+		count = self._cache.get(key)
+		if count is None:
+			count = self._index.count(key)
+			self._cache.put(key, count)
+		return count
+
+	def __contains__(self, pattern):
+		return self.count(pattern) > 0
+
+	def __getitem__(self, pattern):
+		count = self.count(pattern)
+		if not count:
+			raise KeyError(pattern)
+		return count
+
+	def get(self, pattern, default=None):
+		return self.count(pattern) or default
+
+	# (hits, misses, evictions) of the cache
+	def cacheStats(self):
+		return self._cache.stats()
+
+	# (Helper for items)
+	# Patterns (with counts) of the words in group from position pos onwards, prefix being
+	# the pattern decided so far.
+	def _itemsHelper(self, group, pos, length, prefix):
+		if pos == length:
+			yield ("".join(prefix), len(group))
+			return
+		# Position left blank
+		prefix.append(Constants.defaultPatternChar)
+		yield from self._itemsHelper(group, pos+1, length, prefix)
+		prefix.pop()
+		# Position set: one pattern per letter occurring there
+		letters = {}
+		for word in group:
+			letters.setdefault(word[pos], []).append(word)
+		for letter, subgroup in letters.items():
+			prefix.append(letter)
+			yield from self._itemsHelper(subgroup, pos+1, length, prefix)
+			prefix.pop()
+
+	# Every (pattern, count) with count > 0, generated lazily (same pairs as
+	# listToPatternDict2(wordList).items())
+	def items(self):
+		for length in self._index.lengths():
+			yield from self._itemsHelper(list(self._index.words(length)), 0, length, [])
+
+	def __iter__(self):
+		for pattern, count in self.items():
+			yield pattern
@@ -0,0 +1,156 @@
+"""
+Pattern index:
+
+Answers "which words match this pattern" (e.g. "a--b-") without walking a trie.
+For every word length, words are given ids (their position in that length's list),
+and for every (position, letter) the index stores the bitset (Python int) of the ids of
+the words having that letter at that position. A pattern query ANDs together the
+bitsets of its fixed positions only, so blanks cost nothing.
+
+Per-length tables are built on first use.
+"""
+
+import itertools
+from constants import Constants
+from helpers import popCount, bitsToIds, idsToBits
+
+#---------------------------------------------------------------------------#
+
+# Number of letters (a-z)
+ALPHABET = 26
+
+# Whether a pattern character is a blank
+# str -> bool
+def blank(char):
+	return char == Constants.defaultPatternChar or char == Constants.defaultEmptyChar
+
+#---------------------------------------------------------------------------#
+
+class PatternIndex:
+
+	# wordList : str list
+	def __init__(self, wordList=()):
+		words = sorted(set(wordList), key=lambda w: (len(w), w))
+		self._words = {length : list(group) for length, group in itertools.groupby(words, len)}
+		self._tables = {}		# length -> (masks, all) masks[pos][letter] = bitset, all = every id
+		self._ids = {} 			# length -> (word : id) dict, built on first use
+		self._crossings = {} 	# (length, pos, other length, other pos) -> crossing table
+
+	# Index over words already split by length (e.g. the word blocks of an index bundle)
+	# Ids are the positions in each sequence.
+	# (int : str sequence) dict -> PatternIndex
+	@classmethod
+	def fromLengths(cls, wordsByLength):
+		index = cls()
+		index._words = dict(wordsByLength)
+		return index
+
+	# Build (or fetch) the table of one word length. None if there are no such words.
+	# int -> (int list list * int) option
+	def _table(self, length):
+		table = self._tables.get(length)
+		if table is None and length in self._words:
+			positions = [[[] for letter in range(ALPHABET)] for pos in range(length)]
+			for i, word in enumerate(self._words[length]):
+				for pos, char in enumerate(word):
+					positions[pos][ord(char)-97].append(i)
+			masks = [[idsToBits(ids) for ids in letters] for letters in positions]
+			table = self._tables[length] = (masks, (1 << len(self._words[length]))-1)
+		return table
+
+	# Word lengths present
+	# -> int list
+	def lengths(self):
+		return sorted(self._words)
+
+	# Words of one length (position = id)
+	# int -> str sequence
+	def words(self, length):
+		return self._words.get(length, [])
+
+	# Word with a given id
+	# int * int -> str
+	def word(self, length, i):
+		return self._words[length][i]
+
+	# Bitset of the words with a given letter at a given position (0 indexed)
+	# int * int * str -> int
+	def mask(self, length, pos, char):
+		table = self._table(length)
+		i = ord(char)-97
+		if table is None or not 0 <= i < ALPHABET:
+			return 0
+		return table[0][pos][i]
+
+	# Id of a word (its position in words(len(word))), None if it isn't indexed
+	# str -> int option
+	def wordId(self, word):
+		ids = self._ids.get(len(word))
+		if ids is None:
+			ids = self._ids[len(word)] = {other : i for i, other in enumerate(self.words(len(word)))}
+		return ids.get(word)
+
+	# Bitsets of the words of a length by position and letter: masks(length)[pos][letter]
+	# (letter 0 = 'a'), None if there are no such words
+	# int -> int list list option
+	def masks(self, length):
+		table = self._table(length)
+		return table[0] if table else None
+
+	# Letter support table of a square shared by words of length (at pos) and of
+	# otherLength (at otherPos): a (mask of otherLength at otherPos, mask of length at pos)
+	# pair per letter words of both lengths have there. The words of length some word of a
+	# bitset others supports are the union of the second masks of the pairs whose first
+	# mask meets others. Kept for the life of the index (every grid's crossings of these
+	# lengths and positions use the same table).
+	# int * int * int * int -> (int * int) tuple
+	def crossingTable(self, length, pos, otherLength, otherPos):
+		key = (length, pos, otherLength, otherPos)
+		table = self._crossings.get(key)
+		if table is None:
+			masks, otherMasks = self.masks(length), self.masks(otherLength)
+			table = ()
+			if masks and otherMasks:
+				table = tuple((otherMasks[otherPos][letter], masks[pos][letter]) for letter in range(ALPHABET)
+							  if otherMasks[otherPos][letter] and masks[pos][letter])
+			self._crossings[key] = table
+		return table
+
+	# Bitset of every word of a length
+	# int -> int
+	def allIds(self, length):
+		table = self._table(length)
+		return table[1] if table else 0
+
+	# Bitset of the ids of the words matching a pattern
+	# str -> int
+	def candidateIds(self, pattern):
+		table = self._table(len(pattern))
+		if table is None:
+			return 0
+		masks, bits = table
+		for pos, char in enumerate(pattern):
+			if blank(char):
+				continue
+			i = ord(char)-97
+			if not 0 <= i < ALPHABET:
+				return 0
+			bits &= masks[pos][i]
+			if not bits:
+				return 0
+		return bits
+
+	# Words matching a pattern, in id order
+	# str -> str list
+	def candidates(self, pattern):
+		words = self.words(len(pattern))
+		return [words[i] for i in bitsToIds(self.candidateIds(pattern))]
+
+	# Number of words matching a pattern
+	# str -> int
+	def count(self, pattern):
+		return popCount(self.candidateIds(pattern))
+
+	# Whether any word matches a pattern (drop in for "pattern in patternDict")
+	def __contains__(self, pattern):
+		return self.candidateIds(pattern) != 0
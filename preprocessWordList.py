@@ -1,8 +1,12 @@
 import itertools
-from helpers import fileToWordList
+import random
+from array import array
+from operator import itemgetter
+from math import comb, log, nan
+from helpers import fileToWordList, fileToWordScores
 import os
 import time
-from crosswordSolver import readyWordList
+from devVersions.readyWordClassList import readyWordList
 from constants import Constants
 
 #---------------------------------------------------------------------------#
@@ -22,7 +26,7 @@ def extractAllPatterns(word, length):
 	l = list(word)
 	# Create options list
 	for x in range(length):
-		l[x] = [l[x], '-']
+		l[x] = [l[x], Constants.defaultPatternChar]
 	# Create patterns
 	patterns = list(itertools.product(*l))
 	# Simplify to strings
@@ -86,7 +90,7 @@ def longestWord(wordList):
 def numSet(pattern):
 	count = 0
 	for x in pattern:
-			if x!= Constants.defaultEmptyChar:
+			if x != Constants.defaultEmptyChar and x != Constants.defaultPatternChar:
 					count += 1
 	return count
 
@@ -95,14 +99,86 @@ def numSet(pattern):
 # len with #set chars which have #options occurs 5 times
 def patternDictTofreqDict(patternDict):
 	freqDict = {}
-	# Collate results 
-	for x in patternDict:
-		if (len(x), numSet(x), patternDict[x]) not in freqDict:
-				freqDict[(len(x), numSet(x), patternDict[x])] = 1
+	# Collate results (items() so that lazy stand ins like PatternCounter work too)
+	for x, num in patternDict.items():
+		if (len(x), numSet(x), num) not in freqDict:
+				freqDict[(len(x), numSet(x), num)] = 1
 		else:
-				freqDict[(len(x), numSet(x), patternDict[x])] += 1
+				freqDict[(len(x), numSet(x), num)] += 1
 	return freqDict
 
+# (Helper for listToFreqDict)
+# words: words of one length sharing the letters chosen so far, pos: next position to
+# decide (left blank or set). A single word matches exactly one pattern for each way of
+# choosing the remaining positions, so it is counted without expanding them. Likewise a
+# position where every word of the group has the same letter doesn't split the group:
+# it is only counted (free) and accounted for with binomial coefficients at the end.
+def freqDictHelper(words, pos, length, numSet, freqDict, free=0):
+	if len(words) == 1:
+		rest = length-pos+free
+		for k in range(rest+1):
+			key = (length, numSet+k, 1)
+			freqDict[key] = freqDict.get(key, 0)+comb(rest, k)
+	elif pos == length:
+		for k in range(free+1):
+			key = (length, numSet+k, len(words))
+			freqDict[key] = freqDict.get(key, 0)+comb(free, k)
+	else:
+		# Group the words by their letter at pos
+		groups = {}
+		for word in words:
+			groups.setdefault(word[pos], []).append(word)
+		if len(groups) == 1:
+			freqDictHelper(words, pos+1, length, numSet, freqDict, free+1)
+			return
+		# Position left blank
+		freqDictHelper(words, pos+1, length, numSet, freqDict, free)
+		# Position set: one pattern per letter occurring there
+		for group in groups.values():
+			freqDictHelper(group, pos+1, length, numSet+1, freqDict, free)
+
+# Same result as patternDictTofreqDict(listToPatternDict2(wordList)), without
+# generating the 2^len patterns of every word.
+# REQUIRES: no duplicates in wordList
+# str list -> freqDict
+def listToFreqDict(wordList):
+	freqDict = {}
+	for length, words in itertools.groupby(sorted(wordList, key=len), len):
+		freqDictHelper(list(words), 0, length, 0, freqDict)
+	return freqDict
+
+# (Helper for estimateAvDict)
+# Number of distinct patterns the words have with exactly the given positions set
+# str list * int tuple -> int
+def countProjections(words, positions):
+	if not positions:
+		return 1 if words else 0
+	return len(set(map(itemgetter(*positions), words)))
+
+# avDict (see summDictToavDict) without listing every pattern. For (len, set), the
+# options of the patterns add up to n*C(len, set): each of the n words matches C(len, set)
+# of them. The patterns themselves are counted exactly for up to samples choices of the
+# positions set (all of them when there are no more), and the other choices are assumed
+# to have as many. Exact when every choice is counted; the sampled choices are the same
+# on every run.
+# (int : str sequence) dict * int -> avDict
+def estimateAvDict(wordsByLength, samples=16):
+	avDict = {}
+	rng = random.Random(0)
+	for length in sorted(wordsByLength):
+		words = list(wordsByLength[length])
+		if not words:
+			continue
+		for numSet in range(length+1):
+			choices = comb(length, numSet)
+			if choices <= samples:
+				chosen = list(itertools.combinations(range(length), numSet))
+			else:
+				chosen = [tuple(sorted(rng.sample(range(length), numSet))) for i in range(samples)]
+			patterns = sum(countProjections(words, positions) for positions in chosen)*choices/len(chosen)
+			avDict[(length, numSet)] = int(len(words)*choices/patterns)
+	return avDict
+
 # summDict[(len, set)] = (total number of options, total frequency)
 def freqDictTosummDict(freqDict):
 	summDict = {}
@@ -157,27 +233,131 @@ def determineOrder(wordList, avDict):
 			optimalPerm = words
 	return optimalPerm
 
+# Scalable alternatives to determineOrder, with the same cost model as ranking (each word
+# multiplies the rating by avDict[(length, letters set)], then the rating is raised to
+# the power 1.2). Costs are kept as logarithms, so orders of any length don't overflow,
+# and letters given in the grid count as set. Words don't need to be clear and are never
+# modified.
+
+_BIAS = 1.2
+
+# log of the average number of options (-inf if there are none: nothing can follow)
+# avDict * int * int -> float
+def logOptions(avDict, length, numSet):
+	options = avDict.get((length, numSet), 0)
+	return log(options) if options > 0 else float("-inf")
+
+# log(ranking(wordList)), up to rounding
+# word class list * avDict -> float
+def orderCost(wordList, avDict):
+	numSet = {id(word) : sum(map(word.set, range(1, word.length()+1))) for word in wordList}
+	cost = 0.0
+	for word in wordList:
+		cost = _BIAS*(cost+logOptions(avDict, word.length(), numSet[id(word)]))
+		for x in range(1, word.length()+1):
+			other = word._pointers[x]
+			if other and not word.set(x) and id(other) in numSet:
+				numSet[id(other)] += 1
+	return cost
+
+# Order wordList by beam search on orderCost: partial orders are extended one word at a
+# time, keeping the width cheapest (at most one per set of words chosen). width=1 is
+# greedy. O(n^2 * width) table lookups: milliseconds for a 15x15 grid.
+# word class list * avDict * int -> word class list
+def beamOrder(wordList, avDict, width=8):
+	n = len(wordList)
+	index = {id(word) : i for i, word in enumerate(wordList)}
+	given = [] 		# Letters set in each word to begin with
+	crossers = [] 	# Words sharing a blank square with each word
+	for word in wordList:
+		given.append(sum(map(word.set, range(1, word.length()+1))))
+		crossers.append([index[id(other)] for x, other in enumerate(word._pointers)
+						 if other and not word.set(x) and id(other) in index])
+	logs = [[logOptions(avDict, word.length(), s) for s in range(word.length()+1)] for word in wordList]
+	# (cost, order as indices, bitmask of the indices chosen, letters set per word)
+	beam = [(0.0, [], 0, given)]
+	for step in range(n):
+		extensions = []
+		for b, (cost, order, chosen, numSet) in enumerate(beam):
+			for i in range(n):
+				if not chosen >> i & 1:
+					extensions.append((_BIAS*(cost+logs[i][numSet[i]]), b, i))
+		extensions.sort(key=lambda extension: extension[0])
+		nextBeam, seen = [], set()
+		for cost, b, i in extensions:
+			chosen = beam[b][2] | 1 << i
+			if chosen in seen:
+				continue
+			seen.add(chosen)
+			numSet = list(beam[b][3])
+			for j in crossers[i]:
+				numSet[j] += 1
+			nextBeam.append((cost, beam[b][1]+[i], chosen, numSet))
+			if len(nextBeam) == width:
+				break
+		beam = nextBeam
+	return [wordList[i] for i in beam[0][1]] if beam else []
+
+# Greedy order: the cheapest next word each time
+# word class list * avDict -> word class list
+def greedyOrder(wordList, avDict):
+	return beamOrder(wordList, avDict, 1)
+
 #---------------------------------------------------------------------------#
 
 from trie import listToTrie
+from compactTrie import listToCompactTrie
+from patternIndex import PatternIndex
+from patternCounter import PatternCounter
+
+# Word scores by length and word id (see PatternIndex.wordId): scores[length][id], NaN for
+# the words without one. Words the index doesn't have are left out.
+# PatternIndex * (str : float) dict -> (int : float array) dict
+def scoresById(index, scores):
+	tables = {}
+	for word, score in scores.items():
+		i = index.wordId(word)
+		if i is None:
+			continue
+		table = tables.get(len(word))
+		if table is None:
+			table = tables[len(word)] = array("d", [nan])*len(index.words(len(word)))
+		table[i] = score
+	return tables
 
 # Store various analysis parameters of a word list in one neat structure
 # E.g. pattern dict, average frequency dict, tries of different lengths
 class infoWrapper:
 	# word list : string list
-	def __init__(self, wordList):
+	# compact : bool, build array-backed compact tries (see compactTrie) instead of Node tries
+	# scores : (str : float) dict, word scores given by the word list (see bestFill)
+	def __init__(self, wordList, compact=False, scores=None):
 		# sort by length
 		wordList.sort(key=len)
 		self._wordList = wordList
-		self._patternDict = listToPatternDict2(wordList)
-		self._avDict = summDictToavDict(freqDictTosummDict(patternDictTofreqDict(self._patternDict)))
-		self._tries = [None] + [listToTrie(words) for key, words in itertools.groupby(wordList, len)]
+		self._patternIndex = PatternIndex(wordList)
+		# Counts computed on demand (drop in for listToPatternDict2(wordList))
+		self._patternDict = PatternCounter(self._patternIndex)
+		toTrie = listToCompactTrie if compact else listToTrie
+		self._tries = [None] + [toTrie(words) for key, words in itertools.groupby(wordList, len)]
+		# By length and id (see scoresById)
+		self._scores = scoresById(self._patternIndex, scores or {})
+
+	# avDict of the word list (see estimateAvDict), built the first time it is used: only
+	# word orders chosen up front (beamOrder) need it
+	@property
+	def _avDict(self):
+		avDict = getattr(self, "_avDictCache", None)
+		if avDict is None:
+			index = self._patternIndex
+			avDict = self._avDictCache = estimateAvDict({length : index.words(length) for length in index.lengths()})
+		return avDict
 
 # Filename -> InfoWrapper
-def createInfoWrapper(dictName):
+def createInfoWrapper(dictName, compact=False):
 	# load word list
 	dictionary = fileToWordList(dictName)
-	return infoWrapper(dictionary)
+	return infoWrapper(dictionary, compact, fileToWordScores(dictName))
 
 #---------------------------------------------------------------------------#
 
@@ -0,0 +1,207 @@
+"""
+Propagation:
+
+Keeps a domain (set of candidate words) for every word of a crossword and prunes it
+as soon as a word is placed, instead of waiting for the search to reach the crossing
+words.
+
+A domain is a bitset (Python int) of word ids, over the words of its length in the
+PatternIndex. Revising a domain against a crossing one is a few big-int ANDs with the
+index's (position, letter) masks: the letters the crossing domain still has on the
+shared square select the masks the domain is kept to. Copying a domain (for the trail)
+is free, and its size is a popcount.
+
+The (letter, masks) pairs of every crossing are looked up once, when the domains are
+set up, from the index's crossing tables (PatternIndex.crossingTable): they only depend
+on the two words' lengths and positions, so they are built once per dictionary and
+shared by every later solve.
+
+- forward checking: placing a word removes from each crossing word's domain the
+  candidates that disagree on the shared letter
+- arc consistency (AC-3): whenever a domain shrinks, the words crossing it are revised
+  in turn (a candidate survives only if some candidate of each crossing word agrees
+  with it on the shared letter), until nothing changes
+
+- all different (distinct=True): placing a word also removes it from the domains of the
+  other words of the same length, so no word is used twice
+
+A domain becoming empty means the current partial fill cannot be completed. Domains
+are replaced, never modified in place, and every replacement is recorded on a trail,
+so undo(mark) restores the state at mark on backtrack.
+
+Every domain also carries an explanation: the set of search levels (as a bitmask)
+whose assignments removed candidates from it, directly or through a chain of
+revisions. When a domain empties, its explanation is the conflict set the solver
+backjumps with.
+"""
+
+from collections import deque
+from helpers import bitsToIds, popCount
+
+class Domains:
+
+	# wordList : wordClass list, index : PatternIndex, stats : SolveStats (prunes counted),
+	# distinct : no two words filled in with the same candidate, excluded : (int : int) dict,
+	# bitset of the ids of the words no word of a length may take (left out from the start)
+	def __init__(self, wordList, index, stats=None, distinct=False, excluded=None):
+		self._words = wordList
+		self._index = index
+		self._stats = stats
+		self._domains = {} 		# id(word) -> bitset of candidate ids
+		self._conflicts = {} 	# id(word) -> bitmask of the levels which pruned the domain
+		self._arcs = {} 		# id(word) -> (x, other word, y) list: word[x] is other[y] (0 indexed)
+		self._trail = [] 		# (id(word), previous domain, previous conflicts)
+		self.wiped = None 		# Last word whose domain became empty
+		self._same = {} 		# id(word) -> the other words of its length (distinct only)
+		self._masks = {} 		# length -> index.masks(length)
+		self._tables = {} 		# (id(word), x) -> crossing table of word's square x (see PatternIndex.crossingTable)
+		self._listed = {} 		# id(word) -> (domain, candidate list) last listed by domain
+		excluded = excluded or {}
+		for word in wordList:
+			self._domains[id(word)] = index.candidateIds(word.string()) & ~excluded.get(word.length(), 0)
+			self._conflicts[id(word)] = 0
+			self._masks[word.length()] = index.masks(word.length())
+		for word in wordList:
+			arcs = []
+			for x in range(1, word.length()+1):
+				# Words outside wordList are never filled in here
+				if word._pointers[x] and id(word._pointers[x]) in self._domains:
+					other, y = word._pointers[x], word._indices[x]
+					arcs.append((x-1, other, y-1))
+					self._tables[(id(word), x-1)] = index.crossingTable(word.length(), x-1, other.length(), y-1)
+			self._arcs[id(word)] = arcs
+			self._same[id(word)] = [other for other in wordList if distinct and other is not word and other.length() == word.length()]
+
+	# Current domain of a word, as its candidates in id order (never modified in place:
+	# safe to iterate while searching)
+	# wordClass -> str list
+	def domain(self, word):
+		bits = self._domains[id(word)]
+		listed = self._listed.get(id(word))
+		if listed is None or listed[0] != bits:
+			words = self._index.words(word.length())
+			listed = self._listed[id(word)] = (bits, [words[i] for i in bitsToIds(bits)])
+		return listed[1]
+
+	# Current domain of a word, as a bitset of ids (0 if it is empty)
+	# wordClass -> int
+	def bits(self, word):
+		return self._domains[id(word)]
+
+	# Number of candidates left to word
+	# wordClass -> int
+	def size(self, word):
+		return popCount(self._domains[id(word)])
+
+	# Levels (bitmask, bit i = the word assigned at depth i) responsible for the candidates
+	# missing from word's domain
+	# wordClass -> int
+	def conflicts(self, word):
+		return self._conflicts[id(word)]
+
+	# (domain is a subset of word's current one)
+	def _set(self, word, domain, conflicts):
+		key = id(word)
+		if self._stats:
+			self._stats.prunes += popCount(self._domains[key] & ~domain)
+		self._trail.append((key, self._domains[key], self._conflicts[key]))
+		self._domains[key] = domain
+		self._conflicts[key] = conflicts
+
+	# Position on the trail to undo back to
+	# -> int
+	def mark(self):
+		return len(self._trail)
+
+	# Restore every domain changed since mark
+	# int -> None
+	def undo(self, mark):
+		trail, domains, conflicts = self._trail, self._domains, self._conflicts
+		while len(trail) > mark:
+			key, domain, conflict = trail.pop()
+			domains[key] = domain
+			conflicts[key] = conflict
+
+	# Remove the candidates of word whose letter x no candidate of other has at y
+	# (blaming level, and whatever pruned other). Returns whether the domain changed.
+	# wordClass * int * wordClass * int * int -> bool
+	def _revise(self, word, x, other, y, level):
+		domains = self._domains
+		others = domains[id(other)]
+		# Words with, at x, a letter some candidate of other has at y
+		if others & (others-1) == 0:
+			# A single candidate (other was just placed): its letter is the only one
+			letter = self._index.word(other.length(), others.bit_length()-1)[y]
+			support = self._masks[word.length()][x][ord(letter)-97]
+		else:
+			support = 0
+			for otherMask, mask in self._tables[(id(word), x)]:
+				if others & otherMask:
+					support |= mask
+		domain = domains[id(word)]
+		kept = domain & support
+		if kept == domain:
+			return False
+		self._set(word, kept, self._conflicts[id(word)] | self._conflicts[id(other)] | level)
+		if not kept:
+			self.wiped = word
+		return True
+
+	# AC-3 over the arcs in queue ((word, x, other, y) = revise word against other).
+	# Returns False as soon as a domain empties.
+	# (wordClass * int * wordClass * int) iterable * int -> bool
+	def _propagate(self, arcs, level=0):
+		queue = deque(arcs)
+		queued = {(id(word), x) for word, x, other, y in queue}
+		while queue:
+			word, x, other, y = queue.popleft()
+			queued.discard((id(word), x))
+			if self._revise(word, x, other, y, level):
+				if not self._domains[id(word)]:
+					return False
+				# Words crossing word (other than other) must be revised against it
+				for x2, neighbour, y2 in self._arcs[id(word)]:
+					if neighbour is not other and (id(neighbour), y2) not in queued:
+						queue.append((neighbour, y2, word, x2))
+						queued.add((id(neighbour), y2))
+		return True
+
+	# Make every domain arc consistent before searching. False if some domain empties.
+	# -> bool
+	def establish(self):
+		if any(not self._domains[id(word)] for word in self._words):
+			return False
+		arcs = []
+		for word in self._words:
+			for x, other, y in self._arcs[id(word)]:
+				arcs.append((word, x, other, y))
+		return self._propagate(arcs)
+
+	# Reduce word's domain to candidate and prune the other domains: only the crossing
+	# words (full=False, forward checking) or to a fixpoint (full=True, AC-3). depth is
+	# the search level of the assignment (see conflicts). With distinct, candidate is
+	# also removed from the domains of the words of the same length (whose crossing words
+	# are then revised in turn).
+	# Returns False if some domain empties (the caller should undo to its mark; wiped is
+	# the word left without candidates).
+	# wordClass * str * bool * int -> bool
+	def assign(self, word, candidate, full=True, depth=0):
+		level = 1 << depth
+		bit = 1 << self._index.wordId(candidate)
+		self._set(word, bit, level)
+		arcs = [(other, y, word, x) for x, other, y in self._arcs[id(word)]]
+		for same in self._same[id(word)]:
+			domain = self._domains[id(same)]
+			if domain & bit:
+				kept = domain & ~bit
+				self._set(same, kept, self._conflicts[id(same)] | level)
+				if not kept:
+					self.wiped = same
+					return False
+				arcs.extend((other, y, same, x) for x, other, y in self._arcs[id(same)])
+		if full:
+			return self._propagate(arcs, level)
+		for other, y, word, x in arcs:
+			if self._revise(other, y, word, x, level) and not self._domains[id(other)]:
+				return False
+		return True
@@ -0,0 +1,177 @@
+"""
+Solver session:
+
+Keeps a grid's words and the last fill found between solves, so that solving again after
+a few letters were changed doesn't start from scratch. The words touching a changed
+square (and the fill of every other word) are kept; only the words through changed
+squares, and the words crossing them, are filled in again, with the rest of the fill
+left as it was. When that region can't be refilled it is widened (radius: crossings of
+crossings, ...), and only then is the whole grid searched again.
+
+- a letter removed: the last fill still fits, nothing is searched
+- a letter which agrees with the last fill: nothing is searched either
+- a blocked square toggled (or the grid resized): the words change, so the session
+  starts over with a full search
+
+session = SolverSession(grid, iW)
+session.solve() => fill (str list, in session.wordList order) or None
+session.update(grid) => fill of the edited grid
+session.setCell(row, col, char) => fill after changing one square
+session.given(board, drawn) => the letters of board the user gave, board being drawn
+	(a fill drawn on the grid, e.g. by the GUI) and then edited
+
+A fill drawn on the grid isn't part of it: only the letters the user gave (see given) are
+passed to update, otherwise every drawn letter would be taken as a new constraint.
+
+session.repair says how the last fill was found: "kept", "local" or "full".
+"""
+
+from constants import Constants
+from grid import gridToWordClassList, startPositionsDict
+from crosswordSolver import solveGen, defaultInfoWrapper, SolveStats
+
+#---------------------------------------------------------------------------#
+
+class SolverSession:
+
+	# grid : char list list (letters given, blank and blocked squares), iW : infoWrapper
+	# maxRadius : how far a local repair may spread before a full search
+	# options : any other solveGen arguments, by name (e.g. maxSeconds)
+	def __init__(self, grid, iW=None, maxRadius=2, **options):
+		self._iW = iW or defaultInfoWrapper()
+		self._maxRadius = maxRadius
+		self._options = options
+		self.stats = SolveStats() 	# Of the last search
+		self.repair = None 		# How the last fill was found
+		self._reset(grid)
+
+	# Start over on grid: new words, no fill
+	def _reset(self, grid):
+		self.grid = [list(row) for row in grid]
+		self.wordList = gridToWordClassList(self.grid)
+		self.fill = None
+		self._position = {id(word) : i for i, word in enumerate(self.wordList)}
+		# (row, col) -> (word, x) list: the letters of the words on each square
+		self._cells = {}
+		starts = startPositionsDict(self.grid)
+		for word in self.wordList:
+			row, col = starts[word._id]
+			across = word._id.dir == "Across"
+			for x in range(1, word.length()+1):
+				self._cells.setdefault((row, col), []).append((word, x))
+				col, row = (col+1, row) if across else (col, row+1)
+
+	# Fill the whole grid from scratch
+	# -> str list option
+	def solve(self):
+		self.stats = SolveStats()
+		self.fill = next(solveGen(self.wordList, self._iW, limit=1, stats=self.stats, **self._options), None)
+		self.repair = "full"
+		return self.fill
+
+	# Change square (row, col) to char (a letter, Constants.defaultEmptyChar or
+	# Constants.defaultBlockedChar) and fill the grid again
+	# int * int * char -> str list option
+	def setCell(self, row, col, char):
+		grid = [list(line) for line in self.grid]
+		grid[row][col] = char
+		return self.update(grid)
+
+	# Letters of board given by the user: board is drawn (a grid with a fill drawn on it,
+	# None if nothing was) after the user edited it. A square still showing the letter
+	# drawn there is blank again, unless the user had given it in the session's grid.
+	# char list list * char list list option -> char list list
+	def given(self, board, drawn):
+		grid = [list(row) for row in board]
+		if drawn is None or len(drawn) != len(board) or len(self.grid) != len(board):
+			return grid
+		for row, line in enumerate(grid):
+			if len(drawn[row]) != len(line) or len(self.grid[row]) != len(line):
+				continue
+			for col, char in enumerate(line):
+				if char.isalpha() and char == drawn[row][col] and not self.grid[row][col].isalpha():
+					line[col] = Constants.defaultEmptyChar
+		return grid
+
+	# Logic:
+	# 1) A blocked square changed: start over with a full search
+	# 2) Write the changed letters into the words. The last fill still fits if every
+	#    letter now given agrees with it
+	# 3) Otherwise refill the words through the changed squares, and those within radius
+	#    crossings of them, keeping the rest of the fill; widen until it works
+	# 4) Search the whole grid if no region up to maxRadius can be refilled
+
+	# Fill grid, an edit of the session's grid
+	# char list list -> str list option
+	def update(self, grid):
+		blocked = lambda rows: [[char == Constants.defaultBlockedChar for char in row] for row in rows]
+		if blocked(grid) != blocked(self.grid):
+			self._reset(grid)
+			return self.solve()
+		changed = [(row, col) for row, line in enumerate(grid) for col, char in enumerate(line)
+				   if char != self.grid[row][col]]
+		self.grid = [list(row) for row in grid]
+		for row, col in changed:
+			char = grid[row][col].lower() if grid[row][col].isalpha() else Constants.defaultEmptyChar
+			for word, x in self._cells.get((row, col), []):
+				word.setChar(x, char)
+		if self.fill is None:
+			return self.solve()
+		if all(self._agrees(word) for word in self.wordList):
+			self.repair = "kept"
+			return self.fill
+		region = {id(word) : word for cell in changed for word, x in self._cells.get(cell, [])}
+		for radius in range(self._maxRadius+1):
+			if radius:
+				region.update({id(other) : other for word in list(region.values())
+							   for other in word._pointers if other})
+			if len(region) == len(self.wordList):
+				break
+			if self._refill(list(region.values())):
+				self.repair = "local"
+				return self.fill
+		return self.solve()
+
+	# Whether the letters given in word agree with its word in the fill
+	# wordClass -> bool
+	def _agrees(self, word):
+		filled = self.fill[self._position[id(word)]]
+		return all(char == Constants.defaultEmptyChar or char == filled[x-1] for x, char in enumerate(word._chars[1:], 1))
+
+	# Search for words of region (in wordList order) which fit with the fill of every
+	# other word (and, unless options say distinct=False, differ from them), and put them
+	# in the fill. Returns whether there were some.
+	# wordClass list -> bool
+	def _refill(self, region):
+		region.sort(key=lambda word: self._position[id(word)])
+		inside = {id(word) for word in region}
+		saved = [list(word._chars) for word in self.wordList]
+		try:
+			# The words outside the region are fixed: their letters are given to the region
+			for word in self.wordList:
+				if id(word) in inside:
+					continue
+				filled = self.fill[self._position[id(word)]]
+				for x in range(1, word.length()+1):
+					word.setChar(x, filled[x-1])
+					other = word._pointers[x]
+					if other and id(other) in inside:
+						other.setChar(word._indices[x], filled[x-1])
+			# The words kept around the region are ruled out of it up front (see Search)
+			taken = set()
+			if self._options.get("distinct", True):
+				taken = {self.fill[i] for i, word in enumerate(self.wordList) if id(word) not in inside}
+			self.stats = SolveStats()
+			fills = solveGen(region, self._iW, stats=self.stats, exclude=taken, **self._options)
+			words = next(fills, None)
+			fills.close()
+		finally:
+			for word, chars in zip(self.wordList, saved):
+				word.setChars(chars)
+		if words is None:
+			return False
+		fill = list(self.fill)
+		for word, filled in zip(region, words):
+			fill[self._position[id(word)]] = filled
+		self.fill = fill
+		return True
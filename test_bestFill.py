@@ -0,0 +1,92 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from helpers import fileToWordScores
+from preprocessWordList import createInfoWrapper
+from indexBundle import loadInfoWrapper
+from grid import gridToWordClassList
+from crosswordSolver import solveGen, SolveStats
+from bestFill import bestFills
+
+class TestBestFill(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.iW = createInfoWrapper("wordLists/dict1k.txt")
+        # The word list is sorted by frequency: score common words higher
+        with open("wordLists/dict1k.txt") as fp:
+            words = fp.read().split()
+        cls.scores = {word : len(words)-i for i, word in enumerate(words)}
+        cls.grids = [[list(row) for row in rows] for rows in [["   ", " # ", "   "], ["  # ", "    ", "    ", " #  "],
+                                                             ["a  ", " # ", "  e"]]]
+
+    # Scores of every fill, best first (by enumerating them)
+    def ranked(self, wordList, distinct=True):
+        return sorted((sum(self.scores[word] for word in fill) for fill in solveGen(wordList, self.iW, distinct=distinct)),
+                      reverse=True)
+
+    # The k best scores, whatever the propagation, and fills which score them
+    def test_bestFills(self):
+        for grid in self.grids:
+            wordList = gridToWordClassList(grid)
+            for distinct in [True, False]:
+                ranked = self.ranked(wordList, distinct)
+                fills = set(map(tuple, solveGen(wordList, self.iW, distinct=distinct)))
+                for consistency in [None, "forward", "ac3"]:
+                    for k in [1, 3]:
+                        best = bestFills(wordList, self.iW, k, self.scores, consistency=consistency, distinct=distinct)
+                        self.assertEqual([score for score, fill in best], ranked[:k])
+                        for score, fill in best:
+                            self.assertIn(tuple(fill), fills)
+                            self.assertEqual(sum(self.scores[word] for word in fill), score)
+            self.assertEqual([w.string() for w in wordList], [w.string() for w in gridToWordClassList(grid)])
+
+    # The bound cuts off most of the search: fewer nodes than enumerating every fill
+    def test_bound(self):
+        wordList = gridToWordClassList(self.grids[1])
+        enumerating, best = SolveStats(), SolveStats()
+        list(solveGen(wordList, self.iW, stats=enumerating))
+        bestFills(wordList, self.iW, 1, self.scores, stats=best)
+        self.assertGreater(best.bounded, 0)
+        self.assertLess(best.nodes, enumerating.nodes)
+
+    # Asking for more fills than there are returns them all; none when there are none
+    def test_fewFills(self):
+        wordList = gridToWordClassList(self.grids[2])
+        ranked = self.ranked(wordList)
+        self.assertEqual([score for score, fill in bestFills(wordList, self.iW, len(ranked)+5, self.scores)], ranked)
+        self.assertEqual(bestFills(gridToWordClassList([['q', 'q', 'q'], [' ', ' ', ' ']]), self.iW, 3, self.scores), [])
+
+    # The budget stops the search with the best fills found so far
+    def test_budget(self):
+        stats = SolveStats()
+        wordList = gridToWordClassList(self.grids[1])
+        best = bestFills(wordList, self.iW, 3, self.scores, consistency=None, stats=stats, maxNodes=100)
+        self.assertEqual(stats.status, "nodes")
+        self.assertLessEqual(len(best), 3)
+
+    # Scores come from an optional second column of the word list, through the index bundle too
+    def test_wordListScores(self):
+        directory = tempfile.mkdtemp()
+        try:
+            dictName = os.path.join(directory, "scored.txt")
+            with open(dictName, "w") as fp:
+                fp.write("Cat 3\ncar 5\ncab\nart 2.5\nrat -\ncat 4\nat 1\n")
+            self.assertEqual(fileToWordScores(dictName), {"cat" : 4, "car" : 5, "art" : 2.5, "at" : 1})
+            for iW in [createInfoWrapper(dictName), loadInfoWrapper(dictName)]:
+                # By length and word id, NaN for words without a score
+                byId = {length : [None if math.isnan(score) else score for score in table] for length, table in iW._scores.items()}
+                self.assertEqual(byId, {2 : [1], 3 : [2.5, None, 5, 4, None]})
+                self.assertEqual(sorted(iW._wordList), ["art", "at", "cab", "car", "cat", "rat"])
+                best = bestFills(gridToWordClassList([[' ', ' ', ' ']]), iW, 2)
+                self.assertEqual(best, [(5, ["car"]), (4, ["cat"])])
+                # A scores dict given instead of the word list's
+                best = bestFills(gridToWordClassList([[' ', ' ', ' ']]), iW, 2, {"rat" : 7, "dog" : 9})
+                self.assertEqual(best, [(7, ["rat"]), (0, ["art"])])
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from preprocessWordList import createInfoWrapper
+from grid import gridToWordClassList
+from crosswordSolver import solveGen
+from cellState import CellState
+
+class TestCellState(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.iW = createInfoWrapper("wordLists/dict1k.txt")
+        cls.hole = [[' ', ' ', ' '], [' ', '#', ' '], [' ', ' ', ' ']]
+        cls.given = [['a', ' ', ' '], [' ', '#', ' '], [' ', ' ', 'e']]
+
+    # One cell per white square: crossing words share the offset of their square
+    def test_sharedCells(self):
+        wordList = gridToWordClassList(self.hole)
+        state = CellState(wordList)
+        self.assertEqual(len(state.cells), 8)
+        for word in wordList:
+            for x, other in enumerate(word._pointers):
+                if other:
+                    self.assertEqual(state.slot(word)[x-1], state.slot(other)[word._indices[x]-1])
+        # Only words in the list share squares
+        self.assertEqual(len(CellState(wordList[:1]).cells), 3)
+
+    # Patterns start out as the Words' letters
+    def test_pattern(self):
+        wordList = gridToWordClassList(self.given)
+        state = CellState(wordList)
+        self.assertEqual([state.pattern(w) for w in wordList], [w.string() for w in wordList])
+        self.assertEqual(state.letter(wordList[0], 1), 'a')
+        self.assertTrue(state.blank(wordList[0], 2))
+
+    # Placing writes each blank square once (crossing words see it), unplace blanks them
+    # again, and the Words are never touched
+    def test_placeUnplace(self):
+        wordList = gridToWordClassList(self.given)
+        before = [w.string() for w in wordList]
+        state = CellState(wordList)
+        trail = []
+        state.place(wordList[0], "age", trail)
+        mark = len(trail)
+        self.assertEqual(mark, 2)
+        state.place(wordList[3], "toe", trail)
+        self.assertEqual(len(trail), 4)
+        self.assertEqual([state.pattern(w) for w in wordList], ["age", "a t", "e e", "toe"])
+        state.unplace(trail, mark)
+        self.assertEqual([state.pattern(w) for w in wordList], ["age", "a  ", "e e", "  e"])
+        state.unplace(trail)
+        self.assertEqual([state.pattern(w) for w in wordList], before)
+        self.assertEqual([w.string() for w in wordList], before)
+
+    # The Words are left as given while solutions are generated, not only once it is done
+    def test_wordsUntouched(self):
+        wordList = gridToWordClassList(self.given)
+        before = [w.string() for w in wordList]
+        for solution in solveGen(wordList, self.iW, limit=5):
+            self.assertEqual([w.string() for w in wordList], before)
+
+if __name__ == "__main__":
+    unittest.main()
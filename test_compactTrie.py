@@ -0,0 +1,77 @@
+import unittest
+from timeit import timeit
+from helpers import fileToWordList
+from trie import listToTrie, trieToList, wordInTrie, nodesInTrie
+from compactTrie import CompactTrie, listToCompactTrie
+
+class TestCompactTrie(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wordList = fileToWordList("wordLists/dict5k.txt")
+        cls.root = listToCompactTrie(cls.wordList)
+        cls.nodeRoot = listToTrie(cls.wordList)
+
+    # Same words, same shape as the equivalent Node trie
+    def test_listToCompactTrieCorrectness(self):
+        self.assertEqual(set(trieToList(self.root)), set(self.wordList))
+        self.assertEqual(nodesInTrie(self.root), nodesInTrie(self.nodeRoot))
+        self.assertEqual(self.root.trie().nodeCount(), nodesInTrie(self.nodeRoot))
+        self.assertEqual(self.root.maxLength(), self.nodeRoot.maxLength())
+        self.assertEqual(len(self.root.trie()), len(self.wordList))
+
+    # Node API used by the solvers: indexing, iteration, whichWord, maxLength
+    def test_nodeApi(self):
+        trie = CompactTrie(["cat", "car", "cart"])
+        root = trie.root()
+        self.assertIsNone(root['b'])
+        self.assertIs(root['c'], root[2])
+        self.assertEqual(root['c']['a']['r'].whichWord(), "car")
+        self.assertTrue(root['c']['a']['r'].word)
+        self.assertFalse(root['c']['a'].word)
+        self.assertEqual(root['c']['a'].maxLength(), 4)
+        self.assertEqual(root['c']['a']['t'].maxLength(), 3)
+        self.assertEqual([n.whichWord() for n in root['c']['a'] if n], ["car", "cat"])
+        self.assertRaises(TypeError, lambda: root[1.0])
+
+    def test_wordInTrie(self):
+        for word in self.wordList:
+            self.assertTrue(wordInTrie(word, self.root))
+            self.assertIn(word, self.root.trie())
+        self.assertFalse(wordInTrie("zzzzzzzzzzzzzzzzz", self.root))
+        self.assertNotIn("zzzzzzzzzzzzzzzzz", self.root.trie())
+
+    # Characters outside a-z never read a neighbouring node's children
+    def test_outOfRange(self):
+        trie = CompactTrie(["a", "ba"])
+        for word in ["a{", "a`", "{", "b{"]:
+            self.assertNotIn(word, trie)
+            self.assertEqual(trie.find(word), -1)
+            self.assertEqual(trie.countMatches(word), 0)
+            self.assertRaises(IndexError, wordInTrie, word, trie.root())
+        self.assertRaises(IndexError, wordInTrie, "a{", listToTrie(["a", "ba"]))
+        self.assertRaises(IndexError, lambda: trie.root()[26])
+        self.assertRaises(IndexError, lambda: trie.root()[-1])
+        self.assertEqual(trie.countMatches("-a"), 1)
+
+    # Word ids are dense and stable
+    def test_wordIds(self):
+        trie = CompactTrie()
+        self.assertEqual(trie.insert("ab"), 0)
+        self.assertEqual(trie.insert("b"), 1)
+        self.assertEqual(trie.insert("ab"), 0)
+        self.assertEqual(trie.root()['a']['b'].wordId(), 0)
+        self.assertEqual(trie.root()['a'].wordId(), -1)
+
+    # Must be smaller and faster to build than the Node trie
+    def test_performance(self):
+        words = self.wordList
+        namespace = {'listToTrie' : listToTrie, 'listToCompactTrie' : listToCompactTrie, 'words' : words}
+        nodeTime = timeit("listToTrie(words)", number=5, globals=namespace)
+        compactTime = timeit("listToCompactTrie(words)", number=5, globals=namespace)
+        self.assertLess(compactTime, nodeTime)
+        # A Node costs well over 26 pointers' worth of memory by itself
+        self.assertLess(self.root.trie().sizeInBytes(), nodesInTrie(self.nodeRoot)*26*8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,400 @@
+import unittest
+from unittest import mock
+from helpers import fileToWordList
+import itertools
+import time
+from preprocessWordList import createInfoWrapper, beamOrder, greedyOrder, orderCost
+from grid import gridToWordClassList, wordClassListToGrid
+from crosswordSolver import solveGen, solve, restartSolve, countSolutions, components, place, unplace, SolveStats, CancelToken, SolutionCursor, Budget
+from propagation import Domains
+
+class TestCrosswordSolver(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.iW = createInfoWrapper("wordLists/dict1k.txt")
+        cls.words = set(fileToWordList("wordLists/dict1k.txt"))
+        # 3x3 with a hole in the middle, 2x3, and a grid with letters given
+        cls.hole = [[' ', ' ', ' '], [' ', '#', ' '], [' ', ' ', ' ']]
+        cls.small = [[' ', ' ', ' '], [' ', ' ', ' ']]
+        cls.given = [['a', ' ', ' '], [' ', '#', ' '], [' ', ' ', 'e']]
+
+    # Every slot of the filled grid is a dictionary word, and given letters are kept
+    def assertValid(self, grid, wordList, solution):
+        filled = wordClassListToGrid(grid, solution, [w._id for w in wordList])
+        for row, line in enumerate(grid):
+            for col, char in enumerate(line):
+                if char.isalpha():
+                    self.assertEqual(filled[row][col], char)
+        for word in gridToWordClassList(filled):
+            self.assertIn(word.string(), self.words)
+
+    def test_solutionsValid(self):
+        for grid in [self.hole, self.small, self.given]:
+            wordList = gridToWordClassList(grid)
+            solutions = list(solveGen(wordList, self.iW, limit=200))
+            self.assertTrue(solutions)
+            for solution in solutions:
+                self.assertValid(grid, wordList, solution)
+
+    # limit/offset select a window of the full enumeration
+    def test_limitOffset(self):
+        wordList = gridToWordClassList(self.hole)
+        everything = list(solveGen(wordList, self.iW))
+        self.assertGreater(len(everything), 20)
+        self.assertEqual(len(set(map(tuple, everything))), len(everything))
+        self.assertEqual(list(solveGen(wordList, self.iW, limit=5)), everything[:5])
+        self.assertEqual(list(solveGen(wordList, self.iW, limit=5, offset=7)), everything[7:12])
+        self.assertEqual(list(solveGen(wordList, self.iW, offset=len(everything))), [])
+        ids, solutions = solve(wordList, self.iW, limit=3)
+        self.assertEqual(ids, [w._id for w in wordList])
+        self.assertEqual(solutions, everything[:3])
+
+    # Stopping early leaves the words exactly as they were
+    def test_earlyExit(self):
+        wordList = gridToWordClassList(self.given)
+        before = [list(w._chars) for w in wordList]
+        generator = solveGen(wordList, self.iW)
+        next(generator)
+        generator.close()
+        self.assertEqual([w._chars for w in wordList], before)
+        list(solveGen(wordList, self.iW))
+        self.assertEqual([w._chars for w in wordList], before)
+
+    # Dynamic ordering finds the same solutions, exploring fewer nodes
+    def test_dynamicOrdering(self):
+        for grid in [self.hole, self.small, self.given]:
+            wordList = gridToWordClassList(grid)
+            static, dynamic = SolveStats(), SolveStats()
+            staticSolutions = list(solveGen(wordList, self.iW, order="static", stats=static, consistency=None))
+            dynamicSolutions = list(solveGen(wordList, self.iW, order="dynamic", stats=dynamic, consistency=None))
+            self.assertEqual(sorted(staticSolutions), sorted(dynamicSolutions))
+            self.assertEqual(dynamic.solutions, len(dynamicSolutions))
+            self.assertLessEqual(dynamic.nodes, static.nodes)
+        open4x4 = [[' ']*4 for row in range(4)]
+        static, dynamic = SolveStats(), SolveStats()
+        list(solveGen(gridToWordClassList(open4x4), self.iW, limit=1, order="static", stats=static, consistency=None))
+        list(solveGen(gridToWordClassList(open4x4), self.iW, limit=1, order="dynamic", stats=dynamic, consistency=None))
+        self.assertLess(dynamic.nodes*10, static.nodes)
+
+    # Beam orders are permutations, as cheap as the best order when the beam is wide enough,
+    # fast on a full size grid, and solving in them finds the same solutions
+    def test_slotOrdering(self):
+        avDict = self.iW._avDict
+        for grid in [self.hole, self.small, self.given]:
+            wordList = gridToWordClassList(grid)
+            best = min(orderCost(list(order), avDict) for order in itertools.permutations(wordList))
+            for width in [1, 8]:
+                order = beamOrder(wordList, avDict, width)
+                self.assertEqual(sorted(map(id, order)), sorted(map(id, wordList)))
+            self.assertAlmostEqual(orderCost(beamOrder(wordList, avDict, 24), avDict), best)
+            self.assertLessEqual(orderCost(beamOrder(wordList, avDict), avDict), orderCost(greedyOrder(wordList, avDict), avDict)+1e-9)
+            expected = sorted(solveGen(wordList, self.iW, order="static"))
+            for order in ["greedy", "beam"]:
+                self.assertEqual(sorted(solveGen(wordList, self.iW, order=order)), expected)
+        rows = ["    #     #    ", "    #     #    ", "    #     #    ", "   #    #      ", "###   #   #    ",
+                "      #    #   ", "    #    #     ", "   #       #   ", "     #    #    ", "   #    #      ",
+                "    #   #   ###", "      #    #   ", "    #     #    ", "    #     #    ", "    #     #    "]
+        wordList = gridToWordClassList([list(row) for row in rows])
+        self.assertEqual(len(wordList), 78)
+        start = time.perf_counter()
+        order = beamOrder(wordList, avDict)
+        self.assertLess(time.perf_counter()-start, 1)
+        self.assertEqual(len(set(map(id, order))), 78)
+        self.assertLessEqual(orderCost(order, avDict), orderCost(wordList, avDict))
+
+    # Placing records each letter written on one trail; unplacing to a mark blanks exactly
+    # those written since. A search's trail never holds more than one fill's letters.
+    def test_trail(self):
+        wordList = gridToWordClassList(self.given)
+        before = [w.string() for w in wordList]
+        trail = []
+        place(wordList[0], "age", trail)
+        mark = len(trail)
+        self.assertEqual(mark, 3)  # Two letters of 1 across, one of them shared with 2 down
+        place(wordList[3], "toe", trail)
+        self.assertEqual([w.string() for w in wordList], ["age", "a t", "e e", "toe"])
+        unplace(trail, mark)
+        self.assertEqual([w.string() for w in wordList], ["age", "a  ", "e e", "  e"])
+        unplace(trail)
+        self.assertEqual([w.string() for w in wordList], before)
+        stats = SolveStats()
+        list(solveGen(gridToWordClassList(self.hole), self.iW, stats=stats, consistency=None))
+        self.assertGreater(stats.cellWrites, stats.nodes)
+        self.assertLessEqual(stats.trailPeak, 2*8)
+
+    # Paging through solutions searches for each once, in order; going back doesn't search
+    def test_solutionCursor(self):
+        wordList = gridToWordClassList(self.hole)
+        expected = list(solveGen(wordList, self.iW))
+        cursor = SolutionCursor(wordList, self.iW, maxSeconds=0.5)
+        self.assertEqual(cursor.get(0), expected[0])
+        self.assertEqual(cursor.get(5), expected[5])
+        nodes = cursor.stats.nodes
+        self.assertEqual([cursor.get(i) for i in range(5, -1, -1)], expected[5::-1])
+        self.assertEqual(cursor.stats.nodes, nodes)
+        # The open search has run out of time since: a new one picks up where it stopped
+        time.sleep(0.6)
+        self.assertEqual(cursor.get(6), expected[6])
+        self.assertIsNone(cursor.get(len(expected)))
+        self.assertEqual(cursor.stats.status, "complete")
+        cursor.close()
+        # Only a window of solutions is kept: going back further searches again from there
+        cursor = SolutionCursor(wordList, self.iW, window=4)
+        self.assertEqual(cursor.get(len(expected)-1), expected[-1])
+        self.assertLessEqual(len(cursor._kept), 4)
+        self.assertEqual(cursor.get(len(expected)-3), expected[-3])
+        self.assertEqual([cursor.get(i) for i in [1, 0, 2, 5, 3]], [expected[i] for i in [1, 0, 2, 5, 3]])
+        self.assertLessEqual(len(cursor._kept), 4)
+        self.assertEqual(cursor.get(len(expected)-3), expected[-3])
+        cursor.close()
+        self.assertIsNone(SolutionCursor(gridToWordClassList([['q', 'q', 'q'], [' ', ' ', ' ']]), self.iW).get(0))
+
+    # A solution already known is solution 0, without a search; the others follow, without it
+    def test_solutionCursorFirst(self):
+        wordList = gridToWordClassList(self.hole)
+        expected = list(solveGen(wordList, self.iW))
+        for k in [0, 3, len(expected)-1]:
+            order = [expected[k]]+expected[:k]+expected[k+1:]
+            cursor = SolutionCursor(wordList, self.iW, first=expected[k])
+            self.assertEqual(cursor.get(0), expected[k])
+            self.assertIsNone(cursor.stats)
+            self.assertEqual([cursor.get(i) for i in range(len(order))], order)
+            self.assertIsNone(cursor.get(len(order)))
+            # Jumps, with a small window: before first is passed, and after
+            for jumps in [[len(order)-1, 1, 5, 2], [6, 2, 1, len(order)-2, 4]]:
+                cursor = SolutionCursor(wordList, self.iW, window=2, first=expected[k])
+                self.assertEqual([cursor.get(i) for i in jumps], [order[i] for i in jumps])
+
+    # Propagation never loses solutions, and prunes the search
+    def test_consistency(self):
+        corners = [list(row) for row in ["#   #", "     ", "     ", "     ", "#   #"]]
+        for grid in [self.hole, self.small, self.given, corners]:
+            wordList = gridToWordClassList(grid)
+            results = {}
+            for consistency in [None, "forward", "ac3"]:
+                stats = SolveStats()
+                results[consistency] = (sorted(solveGen(wordList, self.iW, stats=stats, consistency=consistency)), stats)
+            self.assertEqual(results[None][0], results["forward"][0])
+            self.assertEqual(results[None][0], results["ac3"][0])
+            self.assertLessEqual(results["forward"][1].nodes, results[None][1].nodes)
+            self.assertLessEqual(results["ac3"][1].nodes, results["forward"][1].nodes)
+        self.assertGreater(results["ac3"][1].prunes, 0)
+
+    # Backjumping finds the same solutions, skipping levels which had no part in a failure
+    def test_backjumping(self):
+        grid7x7 = [list(row) for row in ["   #   ", "   #   ", "       ", "## # ##", "       ", "   #   ", "   #   "]]
+        for consistency in [None, "forward", "ac3"]:
+            for grid in [self.hole, self.given, grid7x7]:
+                wordList = gridToWordClassList(grid)
+                plain, jumping = SolveStats(), SolveStats()
+                plainSolutions = list(solveGen(wordList, self.iW, stats=plain, consistency=consistency, backjump=False))
+                jumpingSolutions = list(solveGen(wordList, self.iW, stats=jumping, consistency=consistency, backjump=True))
+                self.assertEqual(plainSolutions, jumpingSolutions)
+                self.assertLessEqual(jumping.nodes, plain.nodes)
+                self.assertEqual(plain.skipped, 0)
+            if consistency is None:
+                self.assertLess(jumping.nodes, plain.nodes)
+                self.assertGreater(jumping.skipped, 0)
+                self.assertGreater(jumping.backjumps, 0)
+
+    # Subproblems already proven unsolvable are cut off, whatever the cache size or eviction
+    def test_nogoods(self):
+        grid7x7 = [list(row) for row in ["   #   ", "   #   ", "       ", "## # ##", "       ", "   #   ", "   #   "]]
+        wordList = gridToWordClassList(grid7x7)
+        plain = SolveStats()
+        expected = list(solveGen(wordList, self.iW, stats=plain, consistency="forward", nogoods=0, distinct=False))
+        self.assertEqual((plain.nogoodHits, plain.nogoodMisses), (0, 0))
+        for nogoods, eviction in [(1 << 14, "lru"), (8, "lru"), (8, "fifo")]:
+            stats = SolveStats()
+            solutions = list(solveGen(wordList, self.iW, stats=stats, consistency="forward", nogoods=nogoods, eviction=eviction, distinct=False))
+            self.assertEqual(solutions, expected)
+            self.assertLessEqual(stats.nodes, plain.nodes)
+            self.assertGreater(stats.nogoodMisses, 0)
+            if nogoods == 8:
+                self.assertGreater(stats.nogoodEvictions, 0)
+            else:
+                self.assertGreater(stats.nogoodHits, 0)
+                self.assertLess(stats.nodes, plain.nodes)
+
+    # No word is used twice: the same solutions as filtering the fills with repeats out,
+    # whatever the propagation, found in fewer nodes
+    def test_distinct(self):
+        corners = [list(row) for row in ["#   ", "    ", "    ", "   #"]]
+        for grid in [self.hole, self.small, self.given, corners]:
+            wordList = gridToWordClassList(grid)
+            repeats = list(solveGen(wordList, self.iW, distinct=False))
+            expected = sorted(solution for solution in repeats if len(set(solution)) == len(solution))
+            for consistency in [None, "forward", "ac3"]:
+                for nogoods in [0, 1 << 14]:
+                    solutions = list(solveGen(wordList, self.iW, consistency=consistency, nogoods=nogoods))
+                    self.assertEqual(sorted(solutions), expected)
+                self.assertEqual(countSolutions(wordList, self.iW, consistency=consistency), len(expected))
+        self.assertGreater(len(repeats), len(expected))
+        plain, distinct = SolveStats(), SolveStats()
+        list(solveGen(gridToWordClassList(corners), self.iW, stats=plain, distinct=False))
+        list(solveGen(gridToWordClassList(corners), self.iW, stats=distinct))
+        self.assertLess(distinct.nodes, plain.nodes)
+
+    # Excluded words are never used: the same solutions as filtering them out afterwards,
+    # with less search (they are pruned like any other word)
+    def test_exclude(self):
+        corners = [list(row) for row in ["#   ", "    ", "    ", "   #"]]
+        wordList = gridToWordClassList(corners)
+        solutions = list(solveGen(wordList, self.iW))
+        exclude = {solution[0] for solution in solutions[:20]} | {solution[2] for solution in solutions[:20]}
+        expected = [solution for solution in solutions if exclude.isdisjoint(solution)]
+        self.assertGreater(len(solutions), len(expected))
+        for consistency in [None, "forward", "ac3"]:
+            for order in ["dynamic", "static"]:
+                excluding = list(solveGen(wordList, self.iW, order=order, consistency=consistency, exclude=exclude))
+                self.assertEqual(sorted(excluding), sorted(expected))
+        filtered, excluded = SolveStats(), SolveStats()
+        list(solveGen(wordList, self.iW, consistency=None, stats=filtered))
+        list(solveGen(wordList, self.iW, consistency=None, stats=excluded, exclude=exclude))
+        self.assertLess(excluded.nodes, filtered.nodes)
+
+    # Regions sharing no words are solved separately, and their solutions combined (with
+    # repeats allowed: otherwise words of the same length link regions)
+    def test_components(self):
+        split = [list(row) for row in ["  #   ", "  #   "]]
+        left, right = [[' ']*2]*2, [[' ']*3]*2
+        wordList = gridToWordClassList(split)
+        groups = components(wordList)
+        self.assertEqual(len(components(wordList, distinct=True)), 1)
+        self.assertEqual(sorted(map(len, groups)), [4, 5])
+        self.assertEqual(sorted(map(id, sum(groups, []))), sorted(map(id, wordList)))
+        for group in groups:
+            for word in group:
+                self.assertTrue(all(other in group for other in word._pointers if other))
+        solutions = list(solveGen(wordList, self.iW, distinct=False))
+        for solution in solutions[::17]:
+            self.assertValid(split, wordList, solution)
+        self.assertEqual(len(set(map(tuple, solutions))), len(solutions))
+        leftCount = countSolutions(gridToWordClassList(left), self.iW, distinct=False)
+        rightCount = countSolutions(gridToWordClassList(right), self.iW, distinct=False)
+        self.assertEqual(len(solutions), leftCount*rightCount)
+        self.assertEqual(countSolutions(wordList, self.iW, distinct=False), leftCount*rightCount)
+        self.assertEqual(list(solveGen(wordList, self.iW, limit=4, offset=40, distinct=False)), solutions[40:44])
+        # Regions with more solutions than are kept are searched again for each pass instead
+        for cacheSolutions in [0, 5, rightCount]:
+            stats = SolveStats()
+            self.assertEqual(list(solveGen(wordList, self.iW, distinct=False, cacheSolutions=cacheSolutions, stats=stats)), solutions)
+            self.assertEqual(stats.status, "complete")
+        self.assertEqual(list(solveGen(wordList, self.iW, limit=4, offset=40, distinct=False, cacheSolutions=5)), solutions[40:44])
+        # One region without solutions: nothing to combine
+        blocked = [list(row) for row in ["qq#   ", "  #   "]]
+        self.assertEqual(list(solveGen(gridToWordClassList(blocked), self.iW)), [])
+        self.assertEqual(countSolutions(gridToWordClassList(blocked), self.iW), 0)
+
+    # Counting agrees with enumerating, whatever the propagation or memo size
+    def test_countSolutions(self):
+        open4x4 = [[' ']*4 for row in range(4)]
+        for grid in [self.hole, self.small, self.given, open4x4]:
+            wordList = gridToWordClassList(grid)
+            before = [list(w._chars) for w in wordList]
+            expected = len(list(solveGen(wordList, self.iW)))
+            for consistency in [None, "forward", "ac3"]:
+                self.assertEqual(countSolutions(wordList, self.iW, consistency=consistency), expected)
+            stats = SolveStats()
+            self.assertEqual(countSolutions(wordList, self.iW, nogoods=4, stats=stats), expected)
+            self.assertEqual(countSolutions(wordList, self.iW, nogoods=0), expected)
+            self.assertEqual([w._chars for w in wordList], before)
+        stats = SolveStats()
+        countSolutions(gridToWordClassList(open4x4), self.iW, consistency=None, stats=stats, distinct=False)
+        self.assertGreater(stats.memoHits, 0)
+        self.assertEqual(stats.solutions, 0)
+
+    # Budgets stop the search cleanly, keeping the fullest fill reached
+    def test_budget(self):
+        open5x5 = [[' ']*5 for row in range(5)]
+        wordList = gridToWordClassList(open5x5)
+        before = [list(w._chars) for w in wordList]
+        stats = SolveStats()
+        self.assertEqual(list(solveGen(wordList, self.iW, stats=stats, consistency=None, maxNodes=100)), [])
+        self.assertEqual((stats.status, stats.nodes), ("nodes", 100))
+        self.assertGreater(stats.filled, 1)
+        self.assertEqual(sum(word is not None for word in stats.best), stats.filled)
+        for word, filled in zip(wordList, stats.best):
+            if filled is not None:
+                self.assertEqual(len(filled), word.length())
+                self.assertIn(filled, self.words)
+        self.assertEqual([w._chars for w in wordList], before)
+        cancel = CancelToken()
+        cancel.cancel()
+        for options in [{"maxSeconds" : 0}, {"cancel" : cancel}]:
+            stats = SolveStats()
+            list(solveGen(wordList, self.iW, stats=stats, consistency=None, **options))
+            self.assertEqual(stats.status, "time" if "maxSeconds" in options else "cancelled")
+            self.assertLessEqual(stats.nodes, 64)
+        stats = SolveStats()
+        self.assertIsNone(countSolutions(wordList, self.iW, consistency=None, stats=stats, maxNodes=50))
+        self.assertEqual(stats.status, "nodes")
+        # Enough budget: same as without
+        stats = SolveStats()
+        solutions = list(solveGen(gridToWordClassList(self.hole), self.iW, stats=stats, maxSeconds=60, maxNodes=10**6))
+        self.assertEqual(solutions, list(solveGen(gridToWordClassList(self.hole), self.iW)))
+        self.assertEqual(stats.status, "complete")
+        self.assertEqual(stats.best, solutions[0])
+
+    # Candidates ruled out by propagation count towards the checks too: a search placing
+    # nothing still stops
+    def test_budgetRejected(self):
+        def reject(domains, word, candidate, full=True, depth=0):
+            domains.wiped = word
+            return False
+        cancel = CancelToken()
+        cancel.cancel()
+        wordList = gridToWordClassList([[' ']*5 for row in range(5)])
+        for count in [False, True]:
+            stats = SolveStats()
+            with mock.patch.object(Domains, "assign", reject):
+                if count:
+                    self.assertIsNone(countSolutions(wordList, self.iW, stats=stats, cancel=cancel))
+                else:
+                    self.assertEqual(list(solveGen(wordList, self.iW, stats=stats, cancel=cancel)), [])
+            self.assertEqual((stats.status, stats.nodes), ("cancelled", 0))
+            self.assertGreater(stats.tried, 0)
+
+    # Checks come further apart while candidates are quick, and closer as they get slower;
+    # never past maxNodes
+    def test_budgetStride(self):
+        budget = Budget(maxSeconds=60, interval=0.01)
+        for i in range(20):
+            stride = budget.nextCheck(0, 0)
+        self.assertEqual(stride, Budget.MAX_STRIDE)
+        time.sleep(0.05)
+        self.assertLess(budget.nextCheck(0, 0), Budget.MAX_STRIDE//2)
+        self.assertEqual(Budget(maxNodes=10).nextCheck(5, 8), 7)
+
+    # Random orderings find the same solutions, in an order fixed by the seed
+    def test_seed(self):
+        wordList = gridToWordClassList(self.hole)
+        expected = list(solveGen(wordList, self.iW))
+        shuffled = list(solveGen(wordList, self.iW, seed=3))
+        self.assertEqual(sorted(shuffled), sorted(expected))
+        self.assertNotEqual(shuffled, expected)
+        self.assertEqual(list(solveGen(wordList, self.iW, seed=3)), shuffled)
+
+    def test_restartSolve(self):
+        open5x5 = [[' ']*5 for row in range(5)]
+        for schedule in ["luby", "geometric"]:
+            stats = SolveStats()
+            solution = restartSolve(gridToWordClassList(self.hole), self.iW, schedule=schedule, unit=1, stats=stats, consistency=None)
+            self.assertValid(self.hole, gridToWordClassList(self.hole), solution)
+            self.assertGreater(stats.restarts, 0)
+            self.assertEqual((stats.status, stats.solutions), ("complete", 1))
+        # No solution: restarts until a search runs to the end
+        stats = SolveStats()
+        self.assertIsNone(restartSolve(gridToWordClassList(open5x5), self.iW, unit=8, stats=stats))
+        self.assertEqual(stats.status, "complete")
+        stats = SolveStats()
+        self.assertIsNone(restartSolve(gridToWordClassList(open5x5), self.iW, unit=1, maxRestarts=3, stats=stats, consistency=None))
+        self.assertEqual((stats.status, stats.restarts), ("nodes", 3))
+
+    def test_noSolution(self):
+        grid = [['q', 'q', ' '], [' ', ' ', ' ']]
+        self.assertEqual(list(solveGen(gridToWordClassList(grid), self.iW)), [])
+
+if __name__ == "__main__":
+    unittest.main()
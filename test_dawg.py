@@ -0,0 +1,40 @@
+import unittest
+from helpers import fileToWordList
+from trie import listToTrie, nodesInTrie
+from dawg import listToDawg, dawgToList, nodesInDawg, dawgStats
+
+class TestDawg(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wordList = fileToWordList("wordLists/dict5k.txt")
+        cls.root = listToDawg(cls.wordList)
+
+    # Lossless, and nothing but the words
+    def test_listToDawgCorrectness(self):
+        self.assertEqual(sorted(dawgToList(self.root)), sorted(self.wordList))
+        for word in self.wordList:
+            node = self.root
+            for char in word:
+                node = node[char]
+            self.assertTrue(node.word)
+        self.assertIsNone(self.root['q'])
+
+    # Shared suffixes: everything after "w"/"t" is stored once, as are the word ends
+    def test_sharedSuffix(self):
+        words = ["walking", "talking", "walked", "talked"]
+        root = listToDawg(words)
+        self.assertIs(root['w'], root['t'])
+        self.assertIs(root['w']['a']['l']['k']['i']['n']['g'], root['w']['a']['l']['k']['e']['d'])
+        self.assertEqual(dawgStats(words, root), (19, 9))
+
+    # Before minimization = trie node count, after = far fewer nodes
+    def test_dawgStats(self):
+        before, after = dawgStats(self.wordList, self.root)
+        self.assertEqual(before, nodesInTrie(listToTrie(self.wordList)))
+        # Walking the DAWG as a tree visits every node of the equivalent trie
+        self.assertEqual(before, nodesInTrie(self.root))
+        self.assertLess(after*2, before)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import struct
+import unittest
+from unittest import mock
+from trie import trieToList, wordInTrie
+from preprocessWordList import createInfoWrapper
+from indexBundle import compileBundle, loadInfoWrapper, IndexBundle, fileHash, MAGIC, VERSION
+
+class TestIndexBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.dictName = os.path.join(self.dir, "dict1k.txt")
+        shutil.copy("wordLists/dict1k.txt", self.dictName)
+        self.bundleName = os.path.join(self.dir, "dict1k.idx")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    # Bundle reproduces what createInfoWrapper builds from scratch
+    def test_roundTrip(self):
+        expected = createInfoWrapper(self.dictName)
+        iW = loadInfoWrapper(self.dictName)
+        self.assertTrue(os.path.exists(self.bundleName))
+        self.assertEqual(sorted(iW._wordList), sorted(expected._wordList))
+        self.assertEqual(len(iW._wordList), len(expected._wordList))
+        for length in range(1, len(expected._tries)):
+            self.assertEqual(sorted(trieToList(iW._tries[length])), sorted(trieToList(expected._tries[length])))
+        for word in expected._wordList:
+            self.assertTrue(wordInTrie(word, iW._tries[len(word)]))
+        self.assertEqual(iW._avDict, expected._avDict)
+        for pattern in ["a--", "-e--", "and", "zzz", "--"]:
+            self.assertEqual(pattern in iW._patternDict, pattern in expected._patternDict)
+            if pattern in expected._patternDict:
+                self.assertEqual(iW._patternDict[pattern], expected._patternDict[pattern])
+        # Solver patterns use the empty char for blanks
+        self.assertIn("a d", iW._patternDict)
+        # No scores in the word list: no score sections
+        self.assertEqual(iW._scores, expected._scores)
+        self.assertEqual(iW._scores, {})
+
+    # Stale bundles (word list changed) are rebuilt, current ones are reused
+    def test_staleBundle(self):
+        compileBundle(self.dictName)
+        modified = os.path.getmtime(self.bundleName)
+        loadInfoWrapper(self.dictName)
+        self.assertEqual(os.path.getmtime(self.bundleName), modified)
+        with open(self.dictName, "a") as fp:
+            fp.write("\nxylophonic\n")
+        iW = loadInfoWrapper(self.dictName)
+        self.assertTrue(wordInTrie("xylophonic", iW._tries[10]))
+        bundle = IndexBundle(self.bundleName)
+        self.assertEqual(bundle.source(), fileHash(self.dictName))
+        bundle.close()
+
+    def test_notABundle(self):
+        with open(self.bundleName, "wb") as fp:
+            fp.write(b"garbage garbage garbage")
+        self.assertRaises(ValueError, IndexBundle, self.bundleName)
+        iW = loadInfoWrapper(self.dictName)
+        self.assertTrue(wordInTrie("and", iW._tries[3]))
+
+    # Files which aren't bundles (empty, bad header) raise ValueError with nothing left
+    # open, and are then recompiled over
+    def test_brokenBundleClosed(self):
+        header = b"{not json"
+        for contents in [b"", struct.pack("<8sII", MAGIC, VERSION, len(header))+header]:
+            with open(self.bundleName, "wb") as fp:
+                fp.write(contents)
+            opened = []
+            def recordOpen(*args, **kwargs):
+                opened.append(open(*args, **kwargs))
+                return opened[-1]
+            with mock.patch("indexBundle.open", side_effect=recordOpen, create=True):
+                self.assertRaises(ValueError, IndexBundle, self.bundleName)
+            self.assertEqual(len(opened), 1)
+            self.assertTrue(opened[0].closed)
+            iW = loadInfoWrapper(self.dictName)
+            self.assertTrue(wordInTrie("and", iW._tries[3]))
+
+    # Compiling writes through a temporary file of its own, which doesn't outlive it
+    def test_temporaryFile(self):
+        with mock.patch("indexBundle.tempfile.mkstemp", wraps=tempfile.mkstemp) as mkstemp:
+            compileBundle(self.dictName)
+        self.assertEqual(mkstemp.call_args.kwargs["dir"], self.dir)
+        self.assertEqual(sorted(os.listdir(self.dir)), ["dict1k.idx", "dict1k.txt"])
+        with mock.patch("indexBundle.os.replace", side_effect=OSError):
+            self.assertRaises(OSError, compileBundle, self.dictName)
+        self.assertEqual(sorted(os.listdir(self.dir)), ["dict1k.idx", "dict1k.txt"])
+
+if __name__ == "__main__":
+    unittest.main()
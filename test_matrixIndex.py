@@ -0,0 +1,57 @@
+import unittest
+from helpers import fileToWordList
+from patternIndex import PatternIndex
+from preprocessWordList import createInfoWrapper
+from grid import gridToWordClassList
+from crosswordSolver import solveGen
+from matrixIndex import MatrixIndex, matrixInfoWrapper, AVAILABLE
+
+@unittest.skipUnless(AVAILABLE, "numpy is not installed")
+class TestMatrixIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wordList = fileToWordList("wordLists/dict5k.txt")
+        cls.bitsets = PatternIndex(cls.wordList)
+        cls.index = MatrixIndex(cls.wordList)
+
+    # Same answers as the bitset index, ids included
+    def test_sameAsPatternIndex(self):
+        for pattern in ["a--b-", "--e--", "s---", "-----------", "t h ", "------------------------", "q", "-x-", "A--"]:
+            self.assertEqual(self.index.candidateIds(pattern), self.bitsets.candidateIds(pattern))
+            self.assertEqual(self.index.candidates(pattern), self.bitsets.candidates(pattern))
+            self.assertEqual(self.index.count(pattern), self.bitsets.count(pattern))
+            self.assertEqual(pattern in self.index, pattern in self.bitsets)
+        self.assertEqual(self.index.mask(4, 1, 'o'), self.bitsets.mask(4, 1, 'o'))
+        self.assertEqual(self.index.allIds(5), self.bitsets.allIds(5))
+
+    # Propagation's masks and crossing tables come from the matrices (the bitset tables
+    # are never built), and are the same as the bitset index's
+    def test_masks(self):
+        index = MatrixIndex(self.wordList)
+        for length in [3, 5, 8]:
+            self.assertEqual(index.masks(length), self.bitsets.masks(length))
+        for key in [(5, 2, 7, 4), (4, 0, 4, 3), (3, 1, 6, 5)]:
+            self.assertEqual(index.crossingTable(*key), self.bitsets.crossingTable(*key))
+        self.assertIsNone(index.masks(40))
+        self.assertEqual(index._tables, {})
+
+    def test_letterSets(self):
+        index = MatrixIndex(["cat", "cot", "cut", "car", "dog"])
+        self.assertEqual(index.letterSets("c-t"), ["c", "aou", "t"])
+        self.assertEqual(index.letterSets("---"), ["cd", "aou", "grt"])
+        self.assertEqual(index.letterSets("x--"), ["", "", ""])
+        self.assertEqual(index.letterSets("----"), ["", "", "", ""])
+
+    # The solver finds the same solutions, in the same order, through either index
+    def test_solve(self):
+        iW = createInfoWrapper("wordLists/dict1k.txt")
+        matrixIW = matrixInfoWrapper(iW)
+        grid = [list(row) for row in ["    ", "    ", "    ", "    "]]
+        for consistency in [None, "ac3"]:
+            expected = list(solveGen(gridToWordClassList(grid), iW, consistency=consistency, distinct=False))
+            self.assertEqual(list(solveGen(gridToWordClassList(grid), matrixIW, consistency=consistency, distinct=False)), expected)
+        self.assertEqual(matrixIW._patternIndex._tables, {})
+
+if __name__ == "__main__":
+    unittest.main()
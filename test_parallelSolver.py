@@ -0,0 +1,62 @@
+import unittest
+from preprocessWordList import createInfoWrapper
+from grid import gridToWordClassList
+from crosswordSolver import solveGen, SolveStats
+from parallelSolver import parallelSolveGen, parallelSolve, splitSearch
+
+class TestParallelSolver(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dictName = "wordLists/dict1k.txt"
+        cls.iW = createInfoWrapper(cls.dictName)
+        cls.hole = [[' ', ' ', ' '], [' ', '#', ' '], [' ', ' ', ' ']]
+        cls.given = [['a', ' ', ' '], [' ', '#', ' '], [' ', ' ', 'e']]
+
+    # Subtrees partition the search: each solution extends exactly one of them
+    def test_splitSearch(self):
+        solutions = list(solveGen(gridToWordClassList(self.hole), self.iW))
+        for depth in [1, 2]:
+            prefixes = splitSearch(self.hole, self.iW, depth)
+            self.assertTrue(all(len(prefix) == depth for prefix in prefixes))
+            for solution in solutions:
+                matching = [p for p in prefixes if all(solution[i] == word for i, word in p)]
+                self.assertEqual(len(matching), 1)
+
+    # Same solutions as solving in one process (in any order)
+    def test_parallelSolve(self):
+        for grid in [self.hole, self.given]:
+            expected = sorted(solveGen(gridToWordClassList(grid), self.iW))
+            for depth in [1, 2]:
+                stats = SolveStats()
+                solutions = list(parallelSolveGen(grid, self.dictName, processes=2, depth=depth, stats=stats))
+                self.assertEqual(sorted(solutions), expected)
+                self.assertEqual(stats.solutions, len(expected))
+                self.assertGreater(stats.nodes, 0)
+            # Repeats allowed
+            repeats = sorted(solveGen(gridToWordClassList(grid), self.iW, distinct=False))
+            self.assertEqual(sorted(parallelSolve(grid, self.dictName, processes=2, distinct=False)), repeats)
+
+    # First solution mode stops as soon as one arrives
+    def test_limit(self):
+        expected = list(map(tuple, solveGen(gridToWordClassList(self.hole), self.iW)))
+        first = parallelSolve(self.hole, self.dictName, processes=2, limit=1)
+        self.assertEqual(len(first), 1)
+        self.assertIn(tuple(first[0]), expected)
+        self.assertEqual(len(parallelSolve(self.hole, self.dictName, processes=2, limit=5)), 5)
+        self.assertEqual(parallelSolve([['q', 'q', ' '], [' ', ' ', ' ']], self.dictName, processes=2), [])
+
+    # Solutions stream back in batches while subtrees are still being searched
+    def test_streaming(self):
+        grid = [list(row) for row in ["    ", "    ", "    ", "    "]]
+        expected = sorted(solveGen(gridToWordClassList(grid), self.iW, distinct=False))
+        full = SolveStats()
+        self.assertEqual(sorted(parallelSolveGen(grid, self.dictName, processes=2, distinct=False, batch=3, stats=full)), expected)
+        partial = SolveStats()
+        solutions = parallelSolveGen(grid, self.dictName, processes=1, distinct=False, batch=1, stats=partial)
+        self.assertIn(next(solutions), expected)
+        self.assertLess(partial.nodes, full.nodes)
+        solutions.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from helpers import fileToWordList, LRUCache, FIFOCache, ReplayList
+from patternIndex import PatternIndex
+from patternCounter import PatternCounter
+from math import comb
+from preprocessWordList import listToPatternDict2, patternDictTofreqDict, listToFreqDict, freqDictTosummDict, summDictToavDict, estimateAvDict, createInfoWrapper
+
+class TestPatternCounter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wordList = fileToWordList("wordLists/dict1k.txt")
+        cls.patternDict = listToPatternDict2(cls.wordList)
+        cls.counter = PatternCounter(PatternIndex(cls.wordList))
+
+    # Same answers as the exhaustive patternDict
+    def test_dropIn(self):
+        for pattern in list(self.patternDict)[::97]:
+            self.assertIn(pattern, self.counter)
+            self.assertEqual(self.counter[pattern], self.patternDict[pattern])
+        self.assertNotIn("zzz", self.counter)
+        self.assertRaises(KeyError, lambda: self.counter["zzz"])
+        self.assertEqual(self.counter.get("zzz", 0), 0)
+        # Word.string() style blanks
+        self.assertEqual(self.counter["a d"], self.patternDict["a-d"])
+
+    # items() lists exactly the patternDict, so freqDict statistics are unchanged
+    def test_items(self):
+        self.assertEqual(dict(self.counter.items()), self.patternDict)
+        expected = patternDictTofreqDict(self.patternDict)
+        self.assertEqual(patternDictTofreqDict(self.counter), expected)
+        self.assertEqual(listToFreqDict(self.wordList), expected)
+
+    # The estimated avDict is exact wherever every choice of positions is counted, and
+    # close elsewhere; infoWrappers only build it when it is used
+    def test_estimateAvDict(self):
+        expected = summDictToavDict(freqDictTosummDict(listToFreqDict(self.wordList)))
+        byLength = {}
+        for word in self.wordList:
+            byLength.setdefault(len(word), []).append(word)
+        estimated = estimateAvDict(byLength)
+        self.assertEqual(estimated.keys(), expected.keys())
+        for (length, numSet), options in expected.items():
+            if comb(length, numSet) <= 16:
+                self.assertEqual(estimated[(length, numSet)], options)
+            else:
+                self.assertLessEqual(abs(estimated[(length, numSet)]-options), max(1, options/4))
+        self.assertEqual(estimateAvDict(byLength, samples=1 << 20), expected)
+        iW = createInfoWrapper("wordLists/dict1k.txt")
+        self.assertNotIn("_avDictCache", vars(iW))
+        self.assertEqual(iW._avDict, estimateAvDict(byLength))
+        self.assertIs(iW._avDict, iW._avDict)
+
+    # Hot patterns are answered from the cache, which stays within its bound
+    def test_cache(self):
+        counter = PatternCounter(PatternIndex(self.wordList), cacheSize=2)
+        counter.count("a--")
+        counter.count("a  ")
+        self.assertEqual(counter.cacheStats(), (1, 1, 0))
+        counter.count("-e-")
+        counter.count("--e")
+        self.assertEqual(counter.cacheStats(), (1, 3, 1))
+        counter.count("a--")
+        self.assertEqual(counter.cacheStats(), (1, 4, 2))
+
+    def test_lruCache(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), (1, 1, 1))
+
+    def test_fifoCache(self):
+        cache = FIFOCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        self.assertEqual(cache.stats(), (1, 0, 1))
+
+    # Up to limit items are kept for the next passes; past that, every pass starts over
+    def test_replayList(self):
+        made = []
+        def factory(n):
+            made.append(n)
+            return iter(range(n))
+        few = ReplayList(lambda: factory(3), 3)
+        self.assertTrue(few)
+        self.assertEqual([list(few), list(few)], [[0, 1, 2]]*2)
+        self.assertEqual(made, [3])
+        many = ReplayList(lambda: factory(5), 3)
+        self.assertEqual([list(many), list(many), list(many)], [[0, 1, 2, 3, 4]]*3)
+        self.assertIsNone(many._items)
+        self.assertEqual(made, [3, 5, 5, 5])
+        self.assertFalse(ReplayList(lambda: iter([]), 3))
+
+if __name__ == "__main__":
+    unittest.main()
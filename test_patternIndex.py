@@ -0,0 +1,64 @@
+import re
+import unittest
+from helpers import fileToWordList, popCount, bitsToIds, idsToBits
+from patternIndex import PatternIndex
+
+class TestPatternIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wordList = fileToWordList("wordLists/dict5k.txt")
+        cls.index = PatternIndex(cls.wordList)
+
+    # Brute force matching of a pattern against the word list
+    def matching(self, pattern):
+        regex = re.compile("^"+re.sub("[- ]", ".", pattern)+"$")
+        return sorted(w for w in self.wordList if regex.match(w))
+
+    def test_candidates(self):
+        for pattern in ["a--b-", "--e--", "s---", "-----------", "t h ", "------------------------", "q", "-x-"]:
+            expected = self.matching(pattern)
+            self.assertEqual(sorted(self.index.candidates(pattern)), expected)
+            self.assertEqual(self.index.count(pattern), len(expected))
+            self.assertEqual(pattern in self.index, bool(expected))
+
+    # Ids are positions in words(length), masks select by (position, letter)
+    def test_ids(self):
+        index = PatternIndex(["cat", "car", "bat", "be"])
+        words = index.words(3)
+        self.assertEqual(list(words), ["bat", "car", "cat"])
+        self.assertEqual(index.allIds(3), 0b111)
+        self.assertEqual([words[i] for i in bitsToIds(index.mask(3, 2, 't'))], ["bat", "cat"])
+        self.assertEqual(index.candidateIds("-a-"), 0b111)
+        self.assertEqual(index.candidateIds("zz"), 0)
+        self.assertEqual(index.count("----"), 0)
+        self.assertEqual(index.candidates("b-"), ["be"])
+        self.assertEqual([index.wordId(word) for word in ["bat", "car", "cat", "be", "dog"]], [0, 1, 2, 0, None])
+        self.assertEqual(index.masks(3)[2][ord('t')-97], index.mask(3, 2, 't'))
+        self.assertIsNone(index.masks(4))
+
+    # Crossing tables pair the masks of each letter two squares can share, and are built once
+    def test_crossingTable(self):
+        index = PatternIndex(["cat", "car", "bat", "be", "ax"])
+        table = index.crossingTable(3, 0, 2, 0)
+        self.assertEqual(table, ((index.mask(2, 0, 'b'), index.mask(3, 0, 'b')),))
+        self.assertIs(index.crossingTable(3, 0, 2, 0), table)
+        self.assertEqual(index.crossingTable(3, 1, 2, 1), ())
+        self.assertEqual(index.crossingTable(3, 0, 7, 0), ())
+        for length, pos, otherLength, otherPos in [(5, 2, 7, 4), (4, 0, 4, 3), (3, 1, 6, 5)]:
+            supported = 0
+            for otherMask, mask in self.index.crossingTable(length, pos, otherLength, otherPos):
+                supported |= mask
+            letters = {word[otherPos] for word in self.index.words(otherLength)}
+            expected = [i for i, word in enumerate(self.index.words(length)) if word[pos] in letters]
+            self.assertEqual(list(bitsToIds(supported)), expected)
+
+    def test_bitsetHelpers(self):
+        ids = [0, 3, 7, 8, 64, 1000]
+        bits = idsToBits(ids)
+        self.assertEqual(list(bitsToIds(bits)), ids)
+        self.assertEqual(popCount(bits), len(ids))
+        self.assertEqual(idsToBits([]), 0)
+
+if __name__ == "__main__":
+    unittest.main()
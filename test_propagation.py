@@ -0,0 +1,74 @@
+import unittest
+from helpers import fileToWordList
+from patternIndex import PatternIndex
+from grid import gridToWordClassList
+from crosswordSolver import SolveStats
+from propagation import Domains
+
+class TestDomains(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wordList = fileToWordList("wordLists/dict5k.txt")
+        cls.index = PatternIndex(cls.wordList)
+        cls.grid = [list(row) for row in ["#   #", "     ", "     ", "     ", "#   #"]]
+
+    # Brute force: the words of a domain which agree with some word of the other on their square
+    def revised(self, domain, x, others, y):
+        letters = {candidate[y] for candidate in others}
+        return [candidate for candidate in domain if candidate[x] in letters]
+
+    # Domains start out as the words matching each pattern: bitsets of ids, listed in id order
+    def test_initial(self):
+        wordList = gridToWordClassList([list(row) for row in ["s   ", "    ", "  e "]])
+        domains = Domains(wordList, self.index)
+        for word in wordList:
+            self.assertEqual(domains.domain(word), self.index.candidates(word.string()))
+            self.assertEqual(domains.bits(word), self.index.candidateIds(word.string()))
+            self.assertEqual(domains.size(word), len(domains.domain(word)))
+
+    # Forward checking keeps exactly the crossing candidates which agree with the word
+    # placed, counts what it pruned, and undo restores every domain
+    def test_assign(self):
+        wordList = gridToWordClassList(self.grid)
+        stats = SolveStats()
+        domains = Domains(wordList, self.index, stats)
+        before = {id(word) : domains.domain(word) for word in wordList}
+        word = wordList[0]
+        mark = domains.mark()
+        self.assertTrue(domains.assign(word, before[id(word)][0], full=False))
+        self.assertEqual(domains.domain(word), before[id(word)][:1])
+        pruned = len(before[id(word)])-1
+        for x, other in enumerate(word._pointers):
+            if other:
+                expected = self.revised(before[id(other)], word._indices[x]-1, [before[id(word)][0]], x-1)
+                self.assertEqual(domains.domain(other), expected)
+                pruned += len(before[id(other)])-len(expected)
+        self.assertEqual(stats.prunes, pruned)
+        domains.undo(mark)
+        self.assertEqual({id(word) : domains.domain(word) for word in wordList}, before)
+
+    # Arc consistency: every candidate left agrees with some candidate of each crossing word
+    def test_establish(self):
+        wordList = gridToWordClassList(self.grid)
+        domains = Domains(wordList, self.index)
+        self.assertTrue(domains.establish())
+        for word in wordList:
+            for x, other in enumerate(word._pointers):
+                if other:
+                    domain = domains.domain(word)
+                    self.assertEqual(self.revised(domain, x-1, domains.domain(other), word._indices[x]-1), domain)
+
+    # With distinct, a word placed leaves the domains of the other words of its length
+    def test_distinct(self):
+        wordList = gridToWordClassList(self.grid)
+        domains = Domains(wordList, self.index, distinct=True)
+        word = wordList[1]
+        candidate = domains.domain(word)[0]
+        domains.assign(word, candidate, full=False)
+        for other in wordList:
+            if other is not word and other.length() == word.length():
+                self.assertNotIn(candidate, domains.domain(other))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from helpers import fileToWordList
+from preprocessWordList import createInfoWrapper
+from grid import gridToWordClassList, wordClassListToGrid
+from crosswordSolver import solveGen
+from solverSession import SolverSession
+
+class TestSolverSession(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.iW = createInfoWrapper("wordLists/dict1k.txt")
+        cls.words = set(fileToWordList("wordLists/dict1k.txt"))
+        # (Only fills with repeated words: the sessions below allow them)
+        cls.grid = [list(row) for row in ["   #   ", "   #   ", "       ", "## # ##", "       ", "   #   ", "   #   "]]
+
+    # The fill is made of dictionary words, crossing words agree, and given letters are kept
+    def assertValid(self, session, fill):
+        self.assertIsNotNone(fill)
+        filled = wordClassListToGrid(session.grid, fill, [word._id for word in session.wordList])
+        for row, line in enumerate(session.grid):
+            for col, char in enumerate(line):
+                if char.isalpha():
+                    self.assertEqual(filled[row][col], char)
+        for word in gridToWordClassList(filled):
+            self.assertIn(word.string(), self.words)
+
+    def test_solve(self):
+        session = SolverSession(self.grid, self.iW, distinct=False)
+        self.assertValid(session, session.solve())
+        self.assertEqual(session.repair, "full")
+
+    # Letters which agree with the fill, or are removed, keep it as it is
+    def test_kept(self):
+        session = SolverSession(self.grid, self.iW, distinct=False)
+        fill = session.solve()
+        filled = wordClassListToGrid(session.grid, fill, [word._id for word in session.wordList])
+        self.assertEqual(session.setCell(2, 2, filled[2][2]), fill)
+        self.assertEqual(session.repair, "kept")
+        self.assertEqual(session.setCell(2, 2, ' '), fill)
+        self.assertEqual(session.repair, "kept")
+
+    # A letter which disagrees with the fill is repaired around it when it can be (the words
+    # far from it keep their fill), and the result is always a valid fill
+    def test_localRepair(self):
+        session = SolverSession(self.grid, self.iW, distinct=False)
+        fill = session.solve()
+        ids = [word._id for word in session.wordList]
+        solutions = [wordClassListToGrid(self.grid, solution, ids) for solution in solveGen(gridToWordClassList(self.grid), self.iW, distinct=False)]
+        filled = wordClassListToGrid(self.grid, fill, ids)
+        repaired = 0
+        for row, col in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+            for letter in {solution[row][col] for solution in solutions}-{filled[row][col]}:
+                session = SolverSession(self.grid, self.iW, distinct=False)
+                session.solve()
+                new = session.setCell(row, col, letter)
+                self.assertValid(session, new)
+                self.assertIn(session.repair, ["local", "full"])
+                if session.repair == "local":
+                    repaired += 1
+                    self.assertTrue(any(old == word for old, word in zip(fill, new)))
+        self.assertGreater(repaired, 0)
+
+    # The GUI flow: a fill drawn on the board and then edited is repaired from the user's
+    # letters only (the drawn ones aren't new constraints)
+    def test_drawnFill(self):
+        ids = None
+        repaired = 0
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            session = SolverSession(self.grid, self.iW, distinct=False)
+            fill = session.solve()
+            ids = [word._id for word in session.wordList]
+            drawn = wordClassListToGrid(session.grid, fill, ids)
+            if drawn[0][0] == letter:
+                continue
+            board = [list(row) for row in drawn]
+            board[0][0] = letter
+            given = session.given(board, drawn)
+            self.assertEqual(sum(char.isalpha() for row in given for char in row), 1)
+            new = session.update(given)
+            if new is not None:
+                self.assertValid(session, new)
+                self.assertEqual(wordClassListToGrid(session.grid, new, ids)[0][0], letter)
+            if session.repair == "local":
+                repaired += 1
+        self.assertGreater(repaired, 0)
+        # Letters the user gave before stay given, whatever was drawn over them
+        session = SolverSession(self.grid, self.iW, distinct=False)
+        letter = wordClassListToGrid(self.grid, session.solve(), ids)[2][2]
+        session.setCell(2, 2, letter)
+        drawn = wordClassListToGrid(session.grid, session.fill, ids)
+        self.assertEqual(session.given(drawn, drawn)[2][2], letter)
+        self.assertEqual(session.given(drawn, drawn)[0][0], ' ')
+
+    # A repaired fill doesn't reuse the words kept around the region
+    def test_distinct(self):
+        grid = [list(row) for row in ["  # ", "    ", "    ", " #  "]]
+        session = SolverSession(grid, self.iW)
+        ids = [word._id for word in session.wordList]
+        solutions = [wordClassListToGrid(grid, solution, ids) for solution in solveGen(gridToWordClassList(grid), self.iW)]
+        for row, col in [(0, 0), (1, 1), (2, 3)]:
+            for letter in {solution[row][col] for solution in solutions}:
+                session = SolverSession(grid, self.iW)
+                session.solve()
+                fill = session.setCell(row, col, letter)
+                self.assertValid(session, fill)
+                self.assertEqual(len(set(fill)), len(fill))
+                # The words kept are ruled out of the region's search: its first fill is used
+                if session.repair == "local":
+                    self.assertEqual(session.stats.solutions, 1)
+
+    # Toggling a blocked square changes the words: the session starts over
+    def test_structureChange(self):
+        session = SolverSession(self.grid, self.iW, distinct=False)
+        session.solve()
+        fill = session.setCell(3, 3, ' ')
+        self.assertEqual(session.repair, "full")
+        self.assertEqual(len(session.wordList), len(gridToWordClassList(session.grid)))
+        self.assertValid(session, fill)
+
+    # An edit which leaves no solution is found out (through the full search)
+    def test_noSolution(self):
+        session = SolverSession([[' ', ' ', ' '], [' ', '#', ' '], [' ', ' ', ' ']], self.iW)
+        session.solve()
+        self.assertIsNone(session.update([['q', 'q', 'q'], [' ', '#', ' '], [' ', ' ', ' ']]))
+        self.assertEqual(session.repair, "full")
+        self.assertEqual(session.stats.status, "complete")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import unittest
+import multiprocessing
+from multiprocessing.connection import Listener
+from preprocessWordList import createInfoWrapper
+from grid import gridToWordClassList
+from crosswordSolver import solveGen, SolveStats
+from workStealing import stealingSolveGen, stealingSolve, runWorker, authKey, AUTHKEY_VARIABLE
+
+class TestWorkStealing(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dictName = "wordLists/dict1k.txt"
+        cls.iW = createInfoWrapper(cls.dictName)
+        cls.hole = [[' ', ' ', ' '], [' ', '#', ' '], [' ', ' ', ' ']]
+        cls.given = [['a', ' ', ' '], [' ', '#', ' '], [' ', ' ', 'e']]
+        cls.expected = {}
+        for name in ["hole", "given"]:
+            cls.expected[name] = sorted(solveGen(gridToWordClassList(getattr(cls, name)), cls.iW))
+
+    # Stolen tasks together cover the search exactly once
+    def test_sameSolutions(self):
+        for name in ["hole", "given"]:
+            for consistency in [None, "ac3"]:
+                stats = SolveStats()
+                solutions = list(stealingSolveGen(getattr(self, name), self.dictName, processes=3, consistency=consistency,
+                                                  checkEvery=1, stats=stats))
+                self.assertEqual(sorted(solutions), self.expected[name])
+                self.assertEqual(stats.solutions, len(solutions))
+        self.assertGreater(stats.steals, 0)
+        repeats = sorted(solveGen(gridToWordClassList(self.hole), self.iW, distinct=False))
+        self.assertEqual(sorted(stealingSolve(self.hole, self.dictName, processes=2, distinct=False)), repeats)
+
+    def test_limit(self):
+        first = stealingSolve(self.hole, self.dictName, processes=2, limit=1)
+        self.assertEqual(len(first), 1)
+        self.assertIn(first[0], self.expected["hole"])
+        self.assertEqual(stealingSolve([['q', 'q', ' '], [' ', ' ', ' ']], self.dictName, processes=2), [])
+
+    # Workers on the other end of a socket get tasks like local ones
+    def test_remoteWorker(self):
+        key = os.urandom(32)
+        with Listener(("localhost", 0), authkey=key) as listener:
+            remote = multiprocessing.Process(target=runWorker, args=(listener.address, key), daemon=True)
+            remote.start()
+            stats = SolveStats()
+            solutions = list(stealingSolveGen(self.hole, self.dictName, processes=1, checkEvery=1,
+                                              listener=listener, remoteWorkers=1, stats=stats))
+            remote.join(5)
+        self.assertEqual(sorted(solutions), self.expected["hole"])
+        self.assertGreater(stats.steals, 0)
+
+    # There is no default key: one must be given, or set in the environment
+    def test_authKey(self):
+        saved = os.environ.pop(AUTHKEY_VARIABLE, None)
+        try:
+            self.assertRaises(ValueError, authKey)
+            self.assertRaises(ValueError, authKey, "")
+            self.assertEqual(authKey("secret"), b"secret")
+            os.environ[AUTHKEY_VARIABLE] = "from environment"
+            self.assertEqual(authKey(), b"from environment")
+            self.assertEqual(authKey(b"given"), b"given")
+        finally:
+            os.environ.pop(AUTHKEY_VARIABLE, None)
+            if saved is not None:
+                os.environ[AUTHKEY_VARIABLE] = saved
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,303 @@
+"""
+Work stealing:
+
+Parallel search which keeps every worker busy however unbalanced the search tree is
+(splitting it once up front, as parallelSolver does, can leave one worker with nearly
+all of the work). Whenever a worker runs out of work, a coordinator asks a busy worker
+to give up half of the candidates it has left to try for its shallowest word (the
+biggest piece of work it has), and hands them over as a new task.
+
+A task is a partial assignment: the letters of every word (Word._chars, as strings in
+gridToWordClassList order) at the point the work was split off, plus the word being
+filled there and the candidates to try for it. It holds no references, so it can be sent
+to a worker process on the same machine (multiprocessing pipe) or to one on another
+machine through a socket (multiprocessing.connection.Listener/Client):
+
+python3 workStealing.py host port [authkey] 	# Serve as a worker for a coordinator listening there
+
+Remote connections are authenticated with a secret key, which the coordinator's Listener
+and every remote worker must share: there is no default. Messages are pickles, so anyone
+who knows the key can run code on the coordinator and on the workers; use a long random
+key, and keep the listener off untrusted networks. The key is given on the command line
+or in the CROSSWORD_AUTHKEY environment variable (authKey reads either):
+
+listener = Listener((host, port), authkey=authKey())
+
+stealingSolveGen(grid, dictName, processes, limit, order, consistency, checkEvery, listener, remoteWorkers, stats, distinct) => generator of solutions
+
+Solutions come in no particular order; a solution is a str list in the same order as
+gridToWordClassList(grid).
+"""
+
+import multiprocessing
+import os
+import sys
+from collections import deque
+from multiprocessing.connection import Client, wait
+import crosswordSolver
+from constants import Constants
+from grid import gridToWordClassList
+from indexBundle import loadInfoWrapper
+from crosswordSolver import Search, SolveStats
+
+#---------------------------------------------------------------------------#
+
+# Environment variable holding the key remote workers authenticate with (see authKey)
+AUTHKEY_VARIABLE = "CROSSWORD_AUTHKEY"
+
+# Key to authenticate remote connections with: key if given, otherwise the value of the
+# AUTHKEY_VARIABLE environment variable. ValueError if neither gives a non empty key.
+# (str + bytes) option -> bytes
+def authKey(key=None):
+	if key is None:
+		key = os.environ.get(AUTHKEY_VARIABLE)
+	if isinstance(key, str):
+		key = key.encode()
+	if not key:
+		raise ValueError(f"No authentication key: pass one, or set {AUTHKEY_VARIABLE}")
+	return key
+
+# Raised inside a worker's search when the coordinator stops it
+class Stopped(Exception):
+	pass
+
+#---------------------------------------------------------------------------#
+
+# Search which, between candidates, answers the coordinator's requests: "steal" (give up
+# half of the candidates left for the shallowest word which has at least two) or "stop".
+# Nogoods are off: a subtree which gave candidates away wasn't searched to the end here.
+class StealableSearch(Search):
+
+	# conn : Connection to the coordinator, checkEvery : candidates tried between checks
+	def __init__(self, wordList, index, conn, order="dynamic", consistency="ac3", checkEvery=64, distinct=True):
+		Search.__init__(self, wordList, index, order, None, consistency, True, 0, distinct=distinct)
+		self._conn = conn
+		self._checkEvery = checkEvery
+		self._ticks = 0
+		self._open = [] 		# [word, candidates, next, end, level] per word being filled, shallowest first
+		self._donated = set() 	# Levels which gave candidates away
+
+	# Generate the solutions of a task's branch (position in wordList * candidates), or
+	# of the whole search if there is none
+	# ((int * str list) option) -> str list generator
+	def run(self, branch=None):
+		if branch is None:
+			yield from self.solutions()
+			return
+		position, candidates = branch
+		word = self._words[position]
+		domains = self._domains
+		if domains:
+			if not (domains.establish() if self._full else all(map(domains.bits, self._words))):
+				return
+			domain = set(domains.domain(word))
+			candidates = [candidate for candidate in candidates if candidate in domain]
+		unassigned = [other for other in self._words[::-1] if other is not word]
+		yield from self._match(word, candidates, unassigned, 0)
+
+	def _each(self, word, candidates, level):
+		record = [word, list(candidates), 0, 0, level]
+		record[3] = len(record[1])
+		self._open.append(record)
+		try:
+			while True:
+				self._ticks += 1
+				if self._ticks % self._checkEvery == 0:
+					self._poll()
+				if record[2] >= record[3]:
+					return
+				record[2] += 1
+				yield record[1][record[2]-1]
+		finally:
+			self._open.pop()
+
+	def _match(self, word, candidates, unassigned, level):
+		conflicts = yield from Search._match(self, word, candidates, unassigned, level)
+		# Only some of the candidates were tried here: every earlier level may matter
+		if level in self._donated:
+			self._donated.discard(level)
+			conflicts |= (1 << level)-1
+		return conflicts
+
+	# Answer the coordinator's messages, if any
+	def _poll(self):
+		conn = self._conn
+		while conn.poll():
+			message = conn.recv()
+			if message[0] == "stop":
+				raise Stopped()
+			if message[0] == "steal":
+				conn.send(self._split())
+
+	# Give up half of the remaining candidates of the shallowest word with at least two
+	# -> ("task", task) or ("none",)
+	def _split(self):
+		for record in self._open:
+			word, candidates, next, end, level = record
+			if end-next >= 2:
+				half = (end-next)//2
+				record[3] = end-half
+				self._donated.add(level)
+				return ("task", (self._stateAt(level), (self._rank[id(word)], candidates[end-half:end])))
+		return ("none",)
+
+	# Letters of every word before level was filled: those given in the grid, or written
+	# by a word filled at an earlier level
+	# int -> str list
+	def _stateAt(self, level):
+		levels = self._levels
+		earlier = lambda word: word is not None and levels.get(id(word), level) < level
+		state = []
+		for word in self._words:
+			kept = earlier(word)
+			chars = []
+			for x in range(1, word.length()+1):
+				if kept or word._chars[x] != Constants.defaultEmptyChar or earlier(word._pointers[x]):
+					chars.append(self._cells.letter(word, x))
+				else:
+					chars.append(Constants.defaultEmptyChar)
+			state.append("".join(chars))
+		return state
+
+#---------------------------------------------------------------------------#
+
+# Worker: set up by a ("setup", dictName, grid, options) message, then solves the tasks it
+# is sent, streaming back solutions, until told to stop.
+# Sends ("solution", str list), ("idle", nodes) once a task is finished, and answers
+# steal requests with ("task", task) or ("none",)
+# Connection -> None
+def work(conn):
+	kind, dictName, grid, options = conn.recv()
+	iW = loadInfoWrapper(dictName)
+	while True:
+		message = conn.recv()
+		if message[0] == "stop":
+			return
+		if message[0] == "steal":
+			conn.send(("none",))
+			continue
+		state, branch = message[1]
+		wordList = gridToWordClassList(grid)
+		for word, chars in zip(wordList, state):
+			word.setChars([Constants.defaultEmptyChar]+list(chars))
+		search = StealableSearch(wordList, iW._patternIndex, conn, **options)
+		try:
+			for solution in search.run(branch):
+				conn.send(("solution", list(solution)))
+		except Stopped:
+			return
+		conn.send(("idle", search.stats.nodes))
+
+# Serve as a worker for a coordinator listening at address (e.g. on another machine),
+# authenticating with authkey (the coordinator's Listener key, see authKey)
+# (str * int) * bytes -> None
+def runWorker(address, authkey):
+	conn = Client(address, authkey=authKey(authkey))
+	try:
+		work(conn)
+	finally:
+		conn.close()
+
+# Coordinator: hand out tasks, and have busy workers split theirs while some are idle.
+# Generates solutions as they arrive, until every task is done or limit is reached.
+# Connection list * task * int option * SolveStats -> str list generator
+def schedule(workers, task, limit, stats):
+	pending = deque([task])
+	idle = list(workers)
+	busy = []
+	asked = set() 		# Busy workers with a steal request in flight
+	found = 0
+	while pending or busy:
+		while idle and pending:
+			worker = idle.pop()
+			worker.send(("task", pending.popleft()))
+			busy.append(worker)
+		# One steal request in flight per idle worker
+		for victim in busy:
+			if len(asked) >= len(idle):
+				break
+			if victim not in asked:
+				victim.send(("steal",))
+				asked.add(victim)
+		for worker in wait(workers):
+			message = worker.recv()
+			if message[0] == "solution":
+				found += 1
+				stats.solutions += 1
+				yield message[1]
+				if found == limit:
+					return
+			elif message[0] == "idle":
+				stats.nodes += message[1]
+				busy.remove(worker)
+				idle.append(worker)
+			elif message[0] == "task":
+				stats.steals += 1
+				pending.append(message[1])
+				asked.discard(worker)
+			else:
+				asked.discard(worker)
+
+# Logic:
+# 1) Start processes local workers, and accept remoteWorkers connections on listener
+# 2) Start with one task: the whole grid
+# 3) Schedule (see schedule), then stop every worker
+
+# processes: local worker processes (None: one per core), checkEvery: candidates a worker
+# tries between looking for steal requests, listener: multiprocessing.connection.Listener
+# remote workers connect to (see runWorker; created with authkey=authKey()), stats: SolveStats to fill in, distinct: no
+# word used twice (see crosswordSolver.Search)
+# char list list * str * int option * int option * str * str option * int * Listener * int * SolveStats * bool
+#	-> str list generator
+def stealingSolveGen(grid, dictName=None, processes=None, limit=None, order="dynamic", consistency="ac3",
+					 checkEvery=64, listener=None, remoteWorkers=0, stats=None, distinct=True):
+	dictName = dictName or crosswordSolver.dictName
+	stats = stats or SolveStats()
+	if limit == 0:
+		return
+	# Compiles the bundle if needed, before the workers all try to
+	loadInfoWrapper(dictName)
+	setup = ("setup", dictName, grid, {"order" : order, "consistency" : consistency, "checkEvery" : checkEvery,
+									   "distinct" : distinct})
+	workers, local = [], []
+	try:
+		for i in range(os.cpu_count() if processes is None else processes):
+			conn, child = multiprocessing.Pipe()
+			process = multiprocessing.Process(target=work, args=(child,), daemon=True)
+			process.start()
+			child.close()
+			workers.append(conn)
+			local.append(process)
+		for i in range(remoteWorkers):
+			workers.append(listener.accept())
+		for worker in workers:
+			worker.send(setup)
+		task = ([word.string() for word in gridToWordClassList(grid)], None)
+		yield from schedule(workers, task, limit, stats)
+	finally:
+		for worker in workers:
+			try:
+				worker.send(("stop",))
+			except OSError:
+				pass
+		for process in local:
+			process.join(1)
+			if process.is_alive():
+				process.terminate()
+		for worker in workers:
+			worker.close()
+
+# grid * str * int option * int option * str * str option * bool -> str list list
+def stealingSolve(grid, dictName=None, processes=None, limit=None, order="dynamic", consistency="ac3", distinct=True):
+	return list(stealingSolveGen(grid, dictName, processes, limit, order, consistency, distinct=distinct))
+
+#---------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+	if len(sys.argv) not in (3, 4):
+		sys.exit(f"Usage: python3 workStealing.py host port [authkey] (or set {AUTHKEY_VARIABLE})")
+	try:
+		key = authKey(sys.argv[3] if len(sys.argv) == 4 else None)
+	except ValueError as error:
+		sys.exit(str(error))
+	runWorker((sys.argv[1], int(sys.argv[2])), key)